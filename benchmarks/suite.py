@@ -0,0 +1,311 @@
+"""
+Headless micro-benchmark suite of the functions drawing a frame: fitting slides to the window, showing a slide
+at several zoom levels, the overview grid, text and pen annotations and one frame of every slide transition,
+each for several window sizes, annotation counts or deck lengths.
+
+Every case reports the per-call latency percentiles and the Python memory allocated per call, measured with
+tracemalloc in a separate pass so tracing does not skew the timings. Pixel buffers are allocated by SDL and do
+not show up in the allocation figures. Results can be saved as JSON and compared with an earlier run.
+
+Usage: python benchmarks/suite.py [--filter TEXT] [--quick] [--output FILE] [--compare BASELINE [CURRENT]]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import fitz  # noqa: E402
+import pygame  # noqa: E402
+
+from pyslides.annotations import draw_annotations, render_text_in_box, text_layouts  # noqa: E402
+from pyslides.display import display_overview, display_slide  # noqa: E402
+from pyslides.overview import OverviewGrid  # noqa: E402
+from pyslides.pdf_processor import render_page_samples, samples_to_surface, scale_image_to_fit  # noqa: E402
+from pyslides.slide_cache import to_display_format  # noqa: E402
+from pyslides.state import AppState  # noqa: E402
+from pyslides.strokes import Stroke  # noqa: E402
+from pyslides.transitions import SlideTransition  # noqa: E402
+from pyslides.zoom_engine import ZoomEngine  # noqa: E402
+
+RESULTS_VERSION = 1
+WINDOW_SIZES = {"720p": (1280, 720), "1080p": (1920, 1080)}
+TRANSITIONS = ['pull', 'fade_out_slide_in', 'swipe_right', 'swipe_left', 'partial_sliding', 'fade_in']
+CASES = []  # (name, params, build) of every benchmark
+
+
+def benchmark(name, **param_values):
+    """
+    Registers a benchmark for every combination of the given parameter values. The decorated function is
+    called with the parameters and a Fixture, does the setup and returns the function to time, or a pair of
+    the function to time and a function run before every call, outside the timing.
+    """
+    def register(build):
+        combinations = [{}]
+        for param, values in param_values.items():
+            combinations = [dict(combination, **{param: value}) for combination in combinations for value in values]
+        for params in combinations:
+            CASES.append((name, params, build))
+        return build
+    return register
+
+
+def case_id(name, params):
+    """
+    Returns the id of a benchmark for the given parameters, e.g. display_slide[window=720p][zoom=2].
+    """
+    return name + "".join(f"[{param}={value}]" for param, value in params.items())
+
+
+class Fixture:
+    """
+    Shared setup of the benchmarks: generated decks, rendered slides and an application state per window size.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.decks = {}
+        self.slides = {}
+
+    def deck(self, pages):
+        """
+        Returns the path of a generated PDF deck with the given number of pages.
+        """
+        if pages not in self.decks:
+            path = os.path.join(self.directory, f"deck_{pages}.pdf")
+            with fitz.open() as pdf_document:
+                for page_num in range(pages):
+                    page = pdf_document.new_page(width=960, height=540)
+                    page.draw_rect(fitz.Rect(40, 40, 920, 120), color=(0.2, 0.3, 0.8), fill=(0.85, 0.9, 1))
+                    page.insert_text((60, 95), f"Slide {page_num + 1}", fontsize=36)
+                    for line in range(8):
+                        page.insert_text((60, 170 + 40 * line), "A line of body text on the slide " * 2,
+                                         fontsize=16)
+                pdf_document.save(path)
+            self.decks[pages] = path
+        return self.decks[pages]
+
+    def slide(self, window_size, page_num=0, pages=10):
+        """
+        Returns a page of a deck rendered for the window size, in the display format.
+        """
+        key = (window_size, page_num, pages)
+        if key not in self.slides:
+            with fitz.open(self.deck(pages)) as pdf_document:
+                width, height, channels, stride, data = render_page_samples(pdf_document.load_page(page_num),
+                                                                            window_size)
+            self.slides[key] = to_display_format(samples_to_surface(data, width, height, channels, stride))
+        return self.slides[key]
+
+    def state(self, window_size, pages=10):
+        """
+        Returns an application state showing the first slide of a deck in a window of the given size.
+        """
+        state = AppState()
+        state.window_size = window_size
+        state.screen = pygame.display.set_mode(window_size)
+        state.pdf_path = self.deck(pages)
+        state.zoom_engine = ZoomEngine(state.pdf_path)
+        state.overview = OverviewGrid(state.pdf_path)
+        images = [self.slide(window_size, page_num, pages) for page_num in range(min(pages, 3))]
+        return state, images
+
+
+@benchmark("scale_image_to_fit", window=["720p", "1080p"])
+def bench_scale_image_to_fit(fixture, window):
+    image = fixture.slide(WINDOW_SIZES["1080p"])
+    return lambda: scale_image_to_fit(image, WINDOW_SIZES[window])
+
+
+@benchmark("display_slide", window=["720p", "1080p"], zoom=[1, 2, 4])
+def bench_display_slide(fixture, window, zoom):
+    state, images = fixture.state(WINDOW_SIZES[window])
+    state.zoom_level = zoom
+    state.zoom_pos = (state.window_size[0] // 2, state.window_size[1] // 2)
+    state.zoom_engine.frame_budget = float('inf')  # Measure the steady state, with every tile rendered
+    display_slide(images, state)
+    return lambda: display_slide(images, state)
+
+
+@benchmark("display_overview", window=["720p", "1080p"], pages=[10, 100], scrolling=[False, True])
+def bench_display_overview(fixture, window, pages, scrolling):
+    state, images = fixture.state(WINDOW_SIZES[window], pages)
+    overview = state.overview
+    overview.load_atlas().render_missing(range(pages), frame_budget=float('inf'))
+    scroll_range = min(overview.max_scroll(state.window_size), 200)
+
+    def scroll():
+        overview.scroll = scroll_range - overview.scroll  # Every frame shows another part of the grid
+        state.focused_page = 1 - state.focused_page
+
+    return lambda: display_overview(images, state), scroll if scrolling else None
+
+
+@benchmark("render_text_in_box", words=[10, 100], cached=[True, False])
+def bench_render_text_in_box(fixture, words, cached):
+    state, _ = fixture.state(WINDOW_SIZES["720p"])
+    text = " ".join(f"word{i % 17}" for i in range(words))
+    rect = pygame.Rect(100, 100, 400, 600)
+    render_text_in_box(text, rect, state)
+    return lambda: render_text_in_box(text, rect, state), None if cached else text_layouts.reset
+
+
+@benchmark("draw_annotations", window=["720p", "1080p"], strokes=[10, 100, 1000], cached=[True, False])
+def bench_draw_annotations(fixture, window, strokes, cached):
+    """
+    Draws the annotations of a slide. Uncached, the slide's annotation layer is drawn from scratch, as after
+    switching between windowed and fullscreen mode.
+    """
+    state, images = fixture.state(WINDOW_SIZES[window])
+    state.pen_annotations = {0: [Stroke.from_points([((i % 40) / 40 + j / 200, (i // 40) / 25 + (j % 5) / 100)
+                                                     for j in range(20)]) for i in range(strokes)]}
+    state.text_annotations = {0: [((0.1, 0.1 + i / 20, 0.3, 0.04), f"note {i}") for i in range(10)]}
+    draw_annotations(images, state)
+    return lambda: draw_annotations(images, state), None if cached else state.annotation_layers.reset
+
+
+@benchmark("transition_frame", window=["720p", "1080p"], transition=TRANSITIONS)
+def bench_transition_frame(fixture, window, transition):
+    state, images = fixture.state(WINDOW_SIZES[window])
+    draw_frame = SlideTransition.frame_function(transition)
+    prev_image, next_image = images[0], images[1]
+    prev_image.set_alpha(SlideTransition.opaque_alpha)  # As the transition player starts every transition
+    next_image.set_alpha(SlideTransition.opaque_alpha)
+    return lambda: draw_frame(prev_image, next_image, state.window_size, state.screen, 0.5)
+
+
+def percentile(sorted_samples, fraction):
+    """
+    Returns the nearest-rank percentile of sorted samples.
+    """
+    return sorted_samples[min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))]
+
+
+def measure(call, before=None, min_calls=50, min_time=0.5, alloc_calls=20):
+    """
+    Times a function and measures the Python memory it allocates. Returns the statistics, times in
+    microseconds.
+    """
+    for _ in range(3):  # Warm up
+        if before:
+            before()
+        call()
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < min_calls or time.perf_counter() - started < min_time:
+        if before:
+            before()
+        start = time.perf_counter_ns()
+        call()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    samples.sort()
+
+    tracemalloc.start()
+    peak = blocks = 0
+    for _ in range(alloc_calls):
+        if before:
+            before()
+        baseline = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        traced = tracemalloc.get_traced_memory()[0]
+        call()
+        peak += tracemalloc.get_traced_memory()[1] - traced
+        blocks += sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename')
+                      if stat.count_diff > 0)
+    tracemalloc.stop()
+
+    return {"calls": len(samples), "mean_us": sum(samples) / len(samples), "p50_us": percentile(samples, 0.5),
+            "p90_us": percentile(samples, 0.9), "p99_us": percentile(samples, 0.99), "max_us": samples[-1],
+            "alloc_bytes": peak // alloc_calls, "alloc_blocks": blocks // alloc_calls}
+
+
+def run(case_filter="", quick=False):
+    """
+    Runs the benchmarks whose id contains the filter and returns the results.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        fixture = Fixture(directory)
+        print(f"{'benchmark':<66}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'alloc B':>10}{'blocks':>8}")
+        for name, params, build in CASES:
+            identifier = case_id(name, params)
+            if case_filter not in identifier:
+                continue
+            built = build(fixture, **params)
+            call, before = built if isinstance(built, tuple) else (built, None)
+            stats = measure(call, before, min_calls=10 if quick else 50, min_time=0.05 if quick else 0.5,
+                            alloc_calls=3 if quick else 20)
+            results[identifier] = dict(stats, name=name, params=params)
+            print(f"{identifier:<66}{stats['p50_us']:>10.1f}{stats['p90_us']:>10.1f}{stats['p99_us']:>10.1f}"
+                  f"{stats['alloc_bytes']:>10}{stats['alloc_blocks']:>8}")
+    pygame.display.quit()
+    return {"version": RESULTS_VERSION, "python": platform.python_version(), "pygame": pygame.version.ver,
+            "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+
+
+def compare(baseline, current, threshold):
+    """
+    Prints the change of the median latency of every benchmark in both runs and returns the ids of the
+    benchmarks that got slower by more than the threshold (a fraction).
+    """
+    regressions = []
+    print(f"\n{'benchmark':<66}{'base p50':>10}{'p50':>10}{'change':>9}")
+    for identifier, result in current["results"].items():
+        base = baseline["results"].get(identifier)
+        if base is None:
+            continue
+        change = result["p50_us"] / base["p50_us"] - 1 if base["p50_us"] else 0
+        flag = ""
+        if change > threshold:
+            regressions.append(identifier)
+            flag = "  slower"
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{identifier:<66}{base['p50_us']:>10.1f}{result['p50_us']:>10.1f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the functions drawing a frame")
+    parser.add_argument("--filter", default="", help="Only run the benchmarks whose id contains this text")
+    parser.add_argument("--quick", action="store_true", help="Fewer calls per benchmark, for a smoke test")
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    parser.add_argument("--compare", nargs='+', metavar="RESULTS",
+                        help="Compare with the results in BASELINE; given a second file CURRENT, compare the two "
+                             "saved runs without running the benchmarks")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative change of the median reported as slower or faster (default: 0.1)")
+    args = parser.parse_args()
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline and optionally a second results file")
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        current = run(args.filter, args.quick)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(current, f, indent=2)
+            print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        print(f"\n{len(regressions)} benchmark(s) slower by more than {args.threshold:.0%}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
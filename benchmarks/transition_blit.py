@@ -0,0 +1,69 @@
+"""
+Headless benchmark of the frame time of every slide transition, drawn with slides as they come from the renderer
+(packed 24-bit RGB) and with slides converted to the display format.
+
+Usage: python benchmarks/transition_blit.py [--frames N] [--size WxH]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import pygame  # noqa: E402
+
+from pyslides.slide_cache import to_display_format  # noqa: E402
+from pyslides.transitions import SlideTransition  # noqa: E402
+
+TRANSITIONS = ['pull', 'fade_out_slide_in', 'swipe_right', 'swipe_left', 'partial_sliding', 'fade_in']
+
+
+def make_slide(size, color):
+    """
+    Creates a slide in the packed RGB format the render service produces.
+    """
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    pygame.draw.line(surface, (255, 255, 255), (0, 0), size, 9)
+    return pygame.image.frombuffer(bytearray(pygame.image.tobytes(surface, 'RGB')), size, 'RGB')
+
+
+def frame_time(transition_type, prev_image, next_image, screen, frames):
+    """
+    Returns the mean time in milliseconds to draw one frame of a transition.
+    """
+    draw_frame = SlideTransition.frame_function(transition_type)
+    window_size = screen.get_size()
+    prev_image.set_alpha(SlideTransition.opaque_alpha)
+    next_image.set_alpha(SlideTransition.opaque_alpha)
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw_frame(prev_image, next_image, window_size, screen, frame / frames)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frame time of the slide transitions")
+    parser.add_argument("--frames", type=int, default=120, help="Frames drawn per transition (default: 120)")
+    parser.add_argument("--size", default="1280x720", help="Window size (default: 1280x720)")
+    args = parser.parse_args()
+    window_size = tuple(int(value) for value in args.size.split('x'))
+
+    pygame.display.init()
+    screen = pygame.display.set_mode(window_size)
+    slide_size = (window_size[0] * 9 // 10, window_size[1] * 9 // 10)
+    raw = make_slide(slide_size, (200, 40, 40)), make_slide(slide_size, (40, 40, 200))
+    converted = tuple(to_display_format(slide) for slide in raw)
+
+    print(f"{'transition':<20}{'raw ms':>10}{'converted ms':>15}{'speed-up':>10}")
+    for transition_type in TRANSITIONS:
+        raw_time = frame_time(transition_type, *raw, screen, args.frames)
+        converted_time = frame_time(transition_type, *converted, screen, args.frames)
+        print(f"{transition_type:<20}{raw_time:>10.2f}{converted_time:>15.2f}{raw_time / converted_time:>9.1f}x")
+    pygame.display.quit()
+
+
+if __name__ == '__main__':
+    main()
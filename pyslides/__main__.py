@@ -1,11 +1,23 @@
 import argparse
+import json
+import os
 import sys
 from pathlib import Path
 from pyslides.display import *
 from pyslides.event_handler import handle_keydown, handle_keyup, handle_mouse
-from pyslides.pdf_processor import *
-from pyslides.transitions import draw_partial_slide, scroll_slide
-from pyslides.config.transitions_config_reader import TransitionsConfig
+from pyslides.render_cache import RenderCache
+from pyslides.render_service import RenderService
+from pyslides.overview import OverviewGrid
+from pyslides.renderer import Renderer, post_slide_updated
+from pyslides.zoom_engine import ZoomEngine
+from pyslides.transitions import scroll_slide
+from pyslides.annotation_journal import AnnotationJournal
+from pyslides.config_watcher import ConfigWatcher, post_config_reloaded, report_config_error
+from pyslides.transition_plan import TransitionPlan
+from pyslides.page_transform import slide_transform
+from pyslides.replay import EventRecorder, EventReplayer, FrameStats, VirtualClock
+from pyslides.frame_profiler import profiler
+from pyslides.resource_stats import collect_stats
 from pyslides.state import AppState
 import time
 
@@ -18,14 +30,46 @@ def main():
     Main function that initializes the PDF viewer, handles user input, and manages the presentation loop.
     """
 
-    state = AppState()
-
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="PDF Viewer with Slide Transitions")
     parser.add_argument("pdf_file", help="PDF file name")
     parser.add_argument("--config_file", help="Transitions config file name")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of processes used to rasterize the PDF pages (default: number of CPU cores)")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="Keep the rendered slides in memory only instead of saving them to the render cache")
+    parser.add_argument("--cache-dir", default=constant.RENDER_CACHE_DIR,
+                        help=f"Folder of the persistent render cache (default: {constant.RENDER_CACHE_DIR})")
+    parser.add_argument("--cache-budget", type=int, default=constant.SLIDE_CACHE_BUDGET // (1024 * 1024),
+                        help="Memory budget in MB for decoded slides kept in memory "
+                             f"(default: {constant.SLIDE_CACHE_BUDGET // (1024 * 1024)})")
+    parser.add_argument("--continuous", action="store_true",
+                        help="Redraw the whole screen every frame instead of only when something changed")
+    parser.add_argument("--resizable", action="store_true",
+                        help="Open a resizable window; the slides are re-rendered for the new window size")
+    parser.add_argument("--record", metavar="FILE",
+                        help="Record the input of the presentation to FILE so it can be replayed later")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="Replay the input recorded in FILE headless on a virtual clock and report frame times")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print the memory, caches and annotations used by the presentation as JSON every second")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write the time spent in every phase of every frame to FILE, in the Chrome trace format")
     args = parser.parse_args()
 
+    if args.replay:
+        # Replays run without a window and never touch the saved annotations or follow config edits
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        clock = VirtualClock()
+        replayer = EventReplayer(args.replay, clock)
+        args.resizable = replayer.header["resizable"]
+    else:
+        clock = time.time
+
+    state = AppState()
+    if args.replay:
+        state.window_size = state.original_window_size = tuple(replayer.header["window_size"])
+
     # pdf file from the arguments
     pdf_file = args.pdf_file
 
@@ -33,10 +77,6 @@ def main():
     pdf_path = Path(pdf_file)  # relative to current directory
     pdf_path_abs = pdf_path.resolve()  # converts to absolute path
 
-    output_folder_name = f'{pdf_file.split(".")[0]}'
-    output_folder = f'pdf_images/{output_folder_name}'
-    os.makedirs(output_folder, exist_ok=True)
-
     # Check if the provided pdf file is valid
     if not os.path.exists(pdf_path_abs):
         print(f"Error: PDF file '{pdf_file}' does not exist.")
@@ -64,76 +104,150 @@ def main():
     # Restrict which event types should be placed on the event queue
     pygame.event.set_blocked(None)
     pygame.event.set_allowed(
-        [pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.KEYDOWN, pygame.KEYUP, pygame.QUIT])
+        [pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.KEYDOWN, pygame.KEYUP, pygame.QUIT,
+         constant.SLIDE_UPDATED_EVENT, constant.CONFIG_RELOADED_EVENT, pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE])
 
     pygame.event.clear()  # Clear the events queue
 
-    # Convert PDF to images and load them
-    # global image_paths
-    state.image_paths = convert_pdf_to_images(pdf_path_abs, output_folder, state.window_size)
-    images = [scale_image_to_fit(pygame.image.load(img_path), state.window_size) for img_path in state.image_paths]
+    state.pdf_path = pdf_path_abs
+
+    if args.resizable:
+        state.resizable = True
+        state.screen = pygame.display.set_mode(state.window_size, pygame.RESIZABLE)
+        pygame.event.set_allowed(pygame.VIDEORESIZE)
+    elif args.replay:
+        state.screen = pygame.display.set_mode(state.window_size)
+
+    # Slides are rendered in the background, current page first, so the presentation starts right away.
+    # Unless rendering in memory, finished decks are kept in the render cache and reused on the next start.
+    if not args.in_memory:
+        state.render_cache = RenderCache(pdf_path_abs, args.cache_dir)
+    state.render_service = RenderService(pdf_path_abs, state.window_size, args.workers, state.render_cache,
+                                         args.cache_budget * 1024 * 1024, on_update=post_slide_updated)
+    images = state.render_service.images
+
+    # Load slide transitions configuration for the specified PDF, compiled for every page and validated up front.
+    # Edits of the file are picked up while presenting; an invalid edit keeps the last good configuration.
+    page_count = len(images)
+    config_watcher = ConfigWatcher(config_path_abs, lambda path: TransitionPlan.load(path, page_count),
+                                   post_config_reloaded, report_config_error)
+    try:
+        state.transition_plan = TransitionPlan.load(config_path_abs, len(images))
+    except ValueError as error:  # An invalid configuration or JSON file
+        print(f"Error: {error}")
+        pygame.quit()
+        sys.exit(1)
+
+    state.render_service.start()
+    state.zoom_engine = ZoomEngine(pdf_path_abs)
+    state.overview = OverviewGrid(pdf_path_abs)
 
-    # Load slide transitions configuration for the specified PDF
-    # global slide_transitions
-    state.slide_transitions = TransitionsConfig.load_transitions_config(config_path_abs)
+    if args.replay:
+        # Frame times of a replay should not depend on how far the background rendering got
+        state.render_service.wait_until_rendered()
+        state.transition_player.clock = clock
+        frame_stats = FrameStats()
+    else:
+        config_watcher.start()
+        # Load annotations if available
+        state.annotation_journal = AnnotationJournal(pdf_file)
+        state.text_annotations, state.pen_annotations = state.annotation_journal.load(
+            lambda page: slide_transform(images, page, state.original_window_size))
+        state.annotation_journal.start()  # Edits are written in the background from now on
 
-    # Load annotations if available
-    state.text_annotations, state.pen_annotations = AnnotationsConfig.load_annotations_from_json(pdf_file)
+    recorder = None
+    if args.record:
+        recorder = EventRecorder(args.record, pdf_file, state.window_size, state.resizable, clock)
 
     running = True
     last_scroll_time = 0  # Track the last time we scrolled
-    initial_popup_start_time = time.time()  # Track the start time of the initial popup
+    initial_popup_start_time = clock()  # Track the start time of the initial popup
+    next_stats_time = initial_popup_start_time  # When the resource statistics are printed next with --stats
+
+    renderer = Renderer(images, state, continuous=args.continuous)
+    if args.trace:
+        profiler.start_trace(args.trace)
 
     while running:
-        current_time = time.time()  # Get the current time
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False  # Exit the main loop
-            elif event.type == pygame.KEYDOWN:
-                handle_keydown(event, images, pdf_file,
-                               state)  # Handle keydown events
-            elif event.type == pygame.KEYUP:
-                handle_keyup(event, state)  # Handle keyup events
-            elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP):
-                handle_mouse(event, images, state)  # Handle mouse events
-
-        if state.black_screen_mode:
-            state.screen.fill((0, 0, 0))  # Fill the screen with black if black screen mode is active
+        if args.replay:
+            # Take the next recorded iteration instead of waiting, with the time and mouse position it had
+            pygame.event.get()  # Only the recorded input counts
+            batch = replayer.next_batch()
+            if batch is None:
+                break  # The end of the recording
+            state.mouse_pos, events = batch
+            renderer.check_exposed(events)
         else:
-            if state.scrolling and current_time - last_scroll_time > 0.1:  # Scroll every 0.1 seconds
-                scroll_slide(images, state.scroll_direction, state)
-                last_scroll_time = current_time
-
-            if state.show_help:
-                display_help(state)  # Display the help screen
-            elif state.show_overview:
-                display_overview(images, state)  # Display the overview mode
-            elif state.end_of_presentation:
-                display_end_message(state)  # Display the end of the presentation message
-            else:
-                transition_config_current = TransitionsConfig.get_transition_config(state)
-                transition_type_current = transition_config_current["transition"]
-                if transition_type_current != constant.PARTIAL_SLIDE_TRANSITION:
-                    display_slide(images, state)  # Display the current slide
-                else:
-                    draw_partial_slide(images, state)  # Draw the partial slide transition
-
-            if state.spotlight_mode:
-                draw_spotlight(state)  # Draw the spotlight effect
-            elif state.highlight_mode:
-                draw_highlight(state)  # Draw the highlight effect
-
-            if not state.show_overview and state.zoom_level == 1 and not state.show_help:
-                draw_text_annotations(state)  # Draw the text annotations
-                draw_pen_annotations(state)  # Draw the pen annotations
-
-            if state.show_initial_help_popup and current_time - initial_popup_start_time < 3:  # Show for 3 seconds
-                display_initial_help_popup(state)  # Display the initial help popup
-            elif state.show_initial_help_popup and current_time - initial_popup_start_time >= 3:
-                state.show_initial_help_popup = False  # Hide the initial help popup
-
-        pygame.display.flip()  # Update the screen
-
+            # Sleep until there is input, a timer is due or a rendered slide comes in
+            deadlines = [initial_popup_start_time + 3] if state.show_initial_help_popup else []
+            if state.scrolling:
+                deadlines.append(last_scroll_time + 0.1)
+            if state.pending_window_size:
+                deadlines.append(state.resize_time + constant.RESIZE_DEBOUNCE_TIME)
+            if state.transition_player.active:
+                deadlines.append(time.time() + state.transition_player.time_to_next_frame())
+            if args.stats:
+                deadlines.append(next_stats_time)
+            events = renderer.wait_for_events(deadlines)
+            state.mouse_pos = pygame.mouse.get_pos()
+            if recorder:
+                recorder.record(events, pygame.key.get_mods(), state.mouse_pos)
+
+        frame_start = time.perf_counter()
+        profiler.begin_frame()
+        current_time = clock()  # Get the current time
+        with profiler.phase("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False  # Exit the main loop
+                elif event.type == pygame.KEYDOWN:
+                    handle_keydown(event, images, pdf_file,
+                                   state)  # Handle keydown events
+                elif event.type == pygame.KEYUP:
+                    handle_keyup(event, state)  # Handle keyup events
+                elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP):
+                    handle_mouse(event, images, state)  # Handle mouse events
+                elif event.type == constant.CONFIG_RELOADED_EVENT:
+                    state.transition_plan = event.transition_plan  # The current page and the slides are kept
+                    print("Transitions configuration reloaded")
+                elif event.type == pygame.VIDEORESIZE and not state.is_fullscreen:
+                    state.pending_window_size = event.size  # Applied once the user stops resizing
+                    state.resize_time = current_time
+
+            if state.pending_window_size and current_time - state.resize_time > constant.RESIZE_DEBOUNCE_TIME:
+                resize_window(images, state.pending_window_size, state)  # Re-render the slides for the new size
+                state.pending_window_size = None
+
+            images.focus(state.current_page)  # Keep the current slide and its neighbours in memory
+            # Keep the page the presenter is looking at at the front of the render queue
+            state.render_service.focus(state.focused_page if state.show_overview else state.current_page)
+
+            if not state.black_screen_mode:
+                if state.scrolling and current_time - last_scroll_time > 0.1:  # Scroll every 0.1 seconds
+                    scroll_slide(images, state.scroll_direction, state)
+                    last_scroll_time = current_time
+                if state.show_initial_help_popup and current_time - initial_popup_start_time >= 3:  # Show for 3 seconds
+                    state.show_initial_help_popup = False  # Hide the initial help popup
+
+        state.transition_player.advance(images)  # Move a running slide transition to the frame that is due
+        drawn = renderer.render()  # Draw and push whatever changed since the last frame
+        profiler.end_frame(drawn)
+        if args.replay:
+            frame_stats.add(time.perf_counter() - frame_start, current_time - replayer.start_time)
+        if args.stats and current_time >= next_stats_time:
+            print(json.dumps(collect_stats(images, state), separators=(',', ':')))
+            next_stats_time = current_time + constant.STATS_INTERVAL
+
+    profiler.stop_trace()
+    state.render_service.stop()
+    config_watcher.stop()
+    if recorder:
+        recorder.close()
+    if args.replay:
+        replayer.close()
+        print(json.dumps(frame_stats.report(), indent=2))
+    else:
+        state.annotation_journal.stop()  # Writes the last edits
     pygame.quit()
 
 
@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+
+from pyslides import constant
+from pyslides.config.annotations_config import AnnotationsConfig
+from pyslides.strokes import Stroke
+
+
+def apply_record(text_annotations, pen_annotations, record):
+    """
+    Applies one journal record to the annotations.
+    """
+    op, page = record["op"], record["page"]
+    if op == "add_text":
+        rect = record["rect"]
+        text_annotations.setdefault(page, []).append((tuple(rect) if rect else None, record["text"]))
+    elif op == "remove_text":
+        del text_annotations[page][record["index"]]
+    elif op == "add_stroke":
+        pen_annotations.setdefault(page, []).append(Stroke.from_points(record["points"]))
+    else:
+        raise ValueError(f"Unknown annotation journal record: {op}")
+
+
+def replay_journal(journal_file, text_annotations, pen_annotations, sequence=0):
+    """
+    Applies the records of a journal that are newer than the given sequence number to the annotations.
+    Returns the sequence number of the last record and whether the journal ended in a partly written record,
+    left by a crash while writing, which is ignored.
+    """
+    if not os.path.exists(journal_file):
+        return sequence, False
+    with open(journal_file, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                return sequence, True
+            if record["seq"] > sequence:  # Older records are already in the snapshot
+                apply_record(text_annotations, pen_annotations, record)
+                sequence = record["seq"]
+    return sequence, False
+
+
+class AnnotationJournal:
+    """
+    Persists annotations as they are made: every committed stroke and every added, moved, edited or removed
+    text annotation is appended to an append-only journal as one compact JSON record.
+
+    Recording an edit only queues it; a background writer thread appends the queued records to the journal
+    about once per ``interval`` seconds, so saving never holds up a frame and a crash loses at most the last
+    interval of edits. The writer keeps its own copy of the annotations, to which it applies every record it
+    writes. Once enough records have piled up, or when a save is requested, it compacts them: the copy is
+    written to the snapshot, atomically, and the journal is emptied. Records carry increasing sequence
+    numbers and the snapshot the number of the last record it includes, so a crash between the two steps
+    never replays a record twice.
+    """
+
+    def __init__(self, pdf_file, interval=constant.ANNOTATION_JOURNAL_INTERVAL,
+                 compact_records=constant.ANNOTATION_JOURNAL_COMPACT_RECORDS):
+        self.annotations_file = AnnotationsConfig.annotations_file(pdf_file)
+        self.journal_file = AnnotationsConfig.journal_file(pdf_file)
+        self.interval = interval
+        self.compact_records = compact_records
+        self.text_annotations, self.pen_annotations = {}, {}  # The writer's copy of the annotations
+        self.sequence = 0  # Sequence number of the last record written
+        self.journaled = 0  # Records in the journal, not yet compacted into the snapshot
+        self.queue = []  # Records waiting to be written
+        self.save_requested = False
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.writes = self.compactions = 0
+
+    def load(self, legacy_transform=None):
+        """
+        Loads the annotations from the last snapshot and the journal written since. Returns copies of the text
+        and pen annotations to edit; every edit of them must be recorded.
+        """
+        self.text_annotations, self.pen_annotations, snapshot_sequence = \
+            AnnotationsConfig.load_annotations_from_json(self.annotations_file, legacy_transform)
+        self.sequence, torn = replay_journal(self.journal_file, self.text_annotations, self.pen_annotations,
+                                             snapshot_sequence)
+        self.journaled = self.sequence - snapshot_sequence
+        self.save_requested = torn  # Compact right away, so no record is ever appended after a torn one
+        if os.path.exists(self.annotations_file) or self.journaled:
+            print(f"Annotations loaded from {self.annotations_file}")
+        else:
+            print(f"No annotations file found at {self.annotations_file}")
+        return ({page: list(annotations) for page, annotations in self.text_annotations.items()},
+                {page: list(strokes) for page, strokes in self.pen_annotations.items()})
+
+    def record(self, op, page, **fields):
+        """
+        Queues a journal record. Called on the main thread; writing happens in the background.
+        """
+        with self.condition:
+            self.queue.append(dict(op=op, page=page, **fields))
+
+    def add_text(self, page, rect, text):
+        """
+        Records a text annotation added to the end of a page's text annotations.
+        """
+        self.record("add_text", page, rect=AnnotationsConfig.rect_to_json(rect), text=text)
+
+    def remove_text(self, page, index):
+        """
+        Records a text annotation removed from a page, e.g. to edit or move it.
+        """
+        self.record("remove_text", page, index=index)
+
+    def add_stroke(self, page, stroke):
+        """
+        Records a pen stroke added to a page.
+        """
+        self.record("add_stroke", page, points=stroke)  # Converted to JSON by the writer
+
+    def save(self):
+        """
+        Asks the writer to write every queued record and compact the journal into the snapshot now.
+        Returns right away.
+        """
+        with self.condition:
+            self.save_requested = True
+            self.condition.notify_all()
+
+    def start(self):
+        """
+        Starts the background writer thread.
+        """
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="pyslides-journal", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Writes the queued records and stops the background writer thread.
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        """
+        Writer loop of the background thread.
+        """
+        while True:
+            with self.condition:
+                if self.running and not self.save_requested:
+                    self.condition.wait(self.interval)
+                records, self.queue = self.queue, []
+                compact, self.save_requested = self.save_requested, False
+                running = self.running
+            self.flush(records, compact)
+            if not running:
+                break
+
+    def flush(self, records, compact=False):
+        """
+        Appends records to the journal, then compacts it if asked to or once it holds enough records.
+        """
+        if records:
+            lines = []
+            for record in records:
+                if record["op"] == "add_stroke":
+                    record["points"] = AnnotationsConfig.stroke_to_json(record["points"])
+                self.sequence += 1
+                record["seq"] = self.sequence
+                apply_record(self.text_annotations, self.pen_annotations, record)
+                lines.append(json.dumps(record, separators=(',', ':')) + "\n")
+            with open(self.journal_file, 'a') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self.journaled += len(records)
+            self.writes += 1
+        if compact or self.journaled >= self.compact_records:
+            self.compact()
+            if compact:
+                print(f"Annotations saved to {self.annotations_file}")
+
+    def compact(self):
+        """
+        Writes the annotations to the snapshot and empties the journal.
+        """
+        AnnotationsConfig.save_annotations_to_json(self.text_annotations, self.pen_annotations,
+                                                   self.annotations_file, self.sequence)
+        open(self.journal_file, 'w').close()  # Every record is in the snapshot now
+        self.journaled = 0
+        self.compactions += 1
+
+    def stats(self):
+        """
+        Returns journal statistics.
+        """
+        with self.condition:
+            queued = len(self.queue)
+        return {"sequence": self.sequence, "journaled": self.journaled, "queued": queued, "writes": self.writes,
+                "compactions": self.compactions}
@@ -1,34 +1,292 @@
+from collections import OrderedDict
+
 import pygame
 
+from pyslides import constant
+from pyslides.page_transform import slide_transform
+from pyslides.slide_cache import surface_bytes
+
+
+TEXT_COLOR = (0, 0, 255)  # Colour of text annotations
+PEN_COLOR = (255, 0, 0)  # Colour of pen strokes
+PEN_WIDTH = 2  # Line width of pen strokes
+
 
-def draw_text_annotations(state):
+def draw_annotations(images, state):
     """
-    Draws text annotations on the current slide.
+    Draws the annotations on the current slide: the committed ones from the slide's annotation layer, then the
+    text being entered and the pen stroke being drawn on top.
     """
-    if state.current_page in state.text_annotations:
-        for rect, text in state.text_annotations[state.current_page]:
-            if rect:  # Draw only if rect is not None
-                render_text_in_box(text, rect, state)
+    state.annotation_layers.draw(state.screen, state, slide_transform(images, state.current_page, state.window_size))
 
     # Render the text being entered
     if state.is_entering_text and state.annotation_rect:
-        pygame.draw.rect(state.screen, (0, 0, 255), state.annotation_rect, 2)  # Draw the rectangle
+        pygame.draw.rect(state.screen, TEXT_COLOR, state.annotation_rect, 2)  # Draw the rectangle
         render_text_in_box(state.current_text, state.annotation_rect,
                            state)  # Render the entered text inside the rectangle
 
+    # Draw the current pen points being drawn
+    if state.is_drawing_pen and len(state.pen_points) > 1:
+        pygame.draw.lines(state.screen, PEN_COLOR, False, state.pen_points, PEN_WIDTH)
+
 
-def draw_pen_annotations(state):
+def annotations_edited(state, page_num):
     """
-    Draws the pen annotations on the current slide.
+    Records that the committed annotations of a page were edited, so their cached descriptions are rebuilt.
     """
-    if state.current_page in state.pen_annotations:
-        for points in state.pen_annotations[state.current_page]:
-            if len(points) > 1:  # Ensure there are enough points to draw
-                pygame.draw.lines(state.screen, (255, 0, 0), False, points, 2)  # Draw the pen stroke
+    state.annotation_versions[page_num] = state.annotation_versions.get(page_num, 0) + 1
 
-    # Draw the current pen points being drawn
-    if state.is_drawing_pen and len(state.pen_points) > 1:
-        pygame.draw.lines(state.screen, (255, 0, 0), False, state.pen_points, 2)
+
+def annotation_items(state, page_num, transform):
+    """
+    Describes the committed annotations of a page as {item: screen rect}, for the page shown with the given
+    transform. Items are hashable descriptions of everything that affects how an annotation looks, so an edited
+    or moved annotation is a new item.
+    """
+    items = {}
+    for rect, text in state.text_annotations.get(page_num, []):
+        if rect:  # Draw only if rect is not None
+            items[("text", tuple(rect), text)] = transform.to_screen_rect(rect)
+    for stroke_num, stroke in enumerate(state.pen_annotations.get(page_num, [])):
+        if len(stroke) > 1:  # Ensure there are enough points to draw
+            left, top, right, bottom = stroke.bounds()
+            (left, top), (right, bottom) = transform.to_screen_point((left, top)), transform.to_screen_point(
+                (right, bottom))
+            items[("pen", stroke_num, len(stroke), stroke[0], stroke[-1])] = pygame.Rect(
+                left - PEN_WIDTH, top - PEN_WIDTH, right - left + 2 * PEN_WIDTH + 1, bottom - top + 2 * PEN_WIDTH + 1)
+    return items
+
+
+def stroke_rect(points, width=PEN_WIDTH):
+    """
+    Returns the screen area covered by a pen stroke of the given line width.
+    """
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return pygame.Rect(min(xs) - width, min(ys) - width, max(xs) - min(xs) + 2 * width + 1,
+                       max(ys) - min(ys) + 2 * width + 1)
+
+
+class AnnotationLayers:
+    """
+    Keeps the committed annotations of recently shown slides rasterized into one transparent layer per slide.
+
+    Each frame only blits the part of the layer that holds annotations. When annotations are added, edited
+    or moved, only the areas of the annotations that appeared or disappeared are cleared and drawn
+    again, so a heavily inked slide costs a single blit per frame. The annotations of a page are only
+    described again after ``annotations_edited`` bumps its edit version or when it is shown at another size.
+    """
+
+    def __init__(self, max_pages=constant.ANNOTATION_LAYER_PAGES):
+        self.max_pages = max_pages
+        # Page number -> (layer, transform, {item: rect} drawn into it), least recently used first
+        self.layers = OrderedDict()
+        # Page number -> (edit version, transform, {item: rect}, bounds of the items), least recently used first
+        self.descriptions = OrderedDict()
+
+    def describe(self, state, page_num, transform):
+        """
+        Returns the annotation items of a page shown with the given transform and the area they cover,
+        described again only if the page was edited or the transform changed.
+        """
+        version = state.annotation_versions.get(page_num, 0)
+        description = self.descriptions.get(page_num)
+        if description is not None and description[0] == version and description[1] is transform:
+            self.descriptions.move_to_end(page_num)
+            return description[2], description[3]
+        items = annotation_items(state, page_num, transform)
+        rects = list(items.values())
+        bounds = rects[0].unionall(rects[1:]) if rects else None
+        self.descriptions[page_num] = (version, transform, items, bounds)
+        self.descriptions.move_to_end(page_num)
+        if len(self.descriptions) > self.max_pages:
+            self.descriptions.popitem(last=False)
+        return items, bounds
+
+    def items(self, state, page_num, transform):
+        """
+        Returns the annotation items of a page shown with the given transform. The dict is shared; copy it
+        before changing it.
+        """
+        return self.describe(state, page_num, transform)[0]
+
+    def layer(self, state, page_num, transform):
+        """
+        Returns the annotation layer of a page shown with the given transform and the items drawn into it,
+        bringing it up to date first.
+        """
+        items = self.items(state, page_num, transform)
+        layer, drawn_transform, drawn = self.layers.pop(page_num, (None, None, {}))
+        if layer is None or layer.get_size() != state.window_size or drawn_transform is not transform:
+            layer, drawn = pygame.Surface(state.window_size, pygame.SRCALPHA), {}  # Shown at another size
+        self.layers[page_num] = (layer, transform, items)
+        if len(self.layers) > self.max_pages:
+            self.layers.popitem(last=False)
+        if drawn is items:
+            return layer, items  # Not edited since it was drawn
+
+        strokes = state.pen_annotations.get(page_num, [])
+        # Redraw the areas of the annotations that appeared or disappeared, with every annotation overlapping
+        # them, in order, so the layer looks exactly as if it had been drawn from scratch
+        dirty = [rect for item, rect in drawn.items() if item not in items]
+        dirty += [rect for item, rect in items.items() if item not in drawn]
+        if len(dirty) > constant.ANNOTATION_LAYER_MAX_PATCHES:
+            dirty = [layer.get_rect()]  # A new layer or the slide shown at another size: draw everything once
+        for area in dirty:
+            layer.fill((0, 0, 0, 0), area)
+            layer.set_clip(area)
+            for item, rect in items.items():
+                if rect.colliderect(area):
+                    self.draw_item(layer, state, strokes, transform, item, rect)
+            layer.set_clip(None)
+        return layer, items
+
+    @staticmethod
+    def draw_item(layer, state, strokes, transform, item, rect):
+        """
+        Draws a single annotation into a layer.
+        """
+        if item[0] == "text":
+            draw_text_box(layer, state.annotation_font, item[2], rect)
+        else:
+            pygame.draw.lines(layer, PEN_COLOR, False, transform.to_screen_stroke(strokes[item[1]]),
+                              PEN_WIDTH)  # Draw the pen stroke
+
+    def draw(self, screen, state, transform):
+        """
+        Blits the annotation layer of the current slide, shown with the given transform.
+        """
+        layer, items = self.layer(state, state.current_page, transform)
+        _, bounds = self.describe(state, state.current_page, transform)
+        if bounds is not None:
+            bounds = bounds.clip(layer.get_rect())
+            screen.blit(layer, bounds.topleft, bounds)  # Only the part holding annotations
+
+    def reset(self):
+        """
+        Drops every layer.
+        """
+        self.layers.clear()
+        self.descriptions.clear()
+
+    def stats(self):
+        """
+        Returns the number of rasterized layers and the bytes they hold.
+        """
+        return {"layers": len(self.layers),
+                "layer_bytes": sum(surface_bytes(layer) for layer, _, _ in self.layers.values())}
+
+
+class TextLayoutCache:
+    """
+    Caches the word wrapping and the rendered lines of text annotations.
+
+    Wrapped layouts are cached by font, text and box width, and rendered lines by font, text and colour, so
+    drawing a slide full of notes only blits surfaces that already exist. Word widths are measured once and
+    summed as the line grows. While text is typed, the wrapping state before the last word is kept, so each
+    keystroke only wraps the word being typed again, and only lines that changed are rendered again.
+    """
+
+    def __init__(self, max_layouts=256, max_lines=1024, max_words=4096):
+        self.max_layouts = max_layouts
+        self.max_lines = max_lines
+        self.max_words = max_words
+        self.layouts = OrderedDict()  # (font, text, width) -> tuple of wrapped lines, least recently used first
+        self.lines = OrderedDict()  # (font, line, color) -> rendered line surface, least recently used first
+        self.word_widths = {}  # (font, word) -> width
+        self.checkpoint = None  # Wrapping state after every word but the last of the most recently wrapped text
+        self.hits = 0
+        self.misses = 0
+
+    def word_width(self, font, word):
+        """
+        Returns the width of a word in the given font.
+        """
+        key = (font, word)
+        width = self.word_widths.get(key)
+        if width is None:
+            if len(self.word_widths) >= self.max_words:
+                self.word_widths.clear()
+            width = self.word_widths[key] = font.size(word)[0]
+        return width
+
+    def wrap(self, font, text, max_width):
+        """
+        Returns the lines of a text wrapped to the given width. Words wider than the box are left out.
+        """
+        key = (font, text, max_width)
+        lines = self.layouts.get(key)
+        if lines is not None:
+            self.hits += 1
+            self.layouts.move_to_end(key)
+            return lines
+        self.misses += 1
+
+        words = text.split(' ')  # Split the text into words
+        space_width = self.word_width(font, ' ')  # Get the width of a space character
+        lines = []  # Initialize the list of lines
+        current_line = []  # Initialize the current line of text
+        line_width = 0  # Width of the words on the current line
+        start = 0
+        checkpoint = self.checkpoint
+        if checkpoint and checkpoint[0] == (font, max_width) and words[:len(checkpoint[1])] == checkpoint[1]:
+            # The text was extended or shortened after its last word: resume wrapping from there
+            _, prefix, done_lines, done_line, line_width = checkpoint
+            start, lines, current_line = len(prefix), list(done_lines), list(done_line)
+
+        for index in range(start, len(words)):
+            if index == len(words) - 1:
+                self.checkpoint = ((font, max_width), words[:index], tuple(lines), tuple(current_line), line_width)
+            word = words[index]
+            word_width = self.word_width(font, word)
+            if word_width > max_width:
+                continue  # Skip too long words
+            if line_width + word_width + space_width <= max_width:
+                current_line.append(word)  # Add the word to the current line
+                line_width += word_width
+            else:
+                lines.append(' '.join(current_line))  # Add the current line to the list of lines
+                current_line = [word]
+                line_width = word_width
+        if current_line:
+            lines.append(' '.join(current_line))  # Add the last line to the list of lines
+
+        lines = self.layouts[key] = tuple(lines)
+        if len(self.layouts) > self.max_layouts:
+            self.layouts.popitem(last=False)
+        return lines
+
+    def render_line(self, font, line, color):
+        """
+        Returns the rendered surface of a line of text.
+        """
+        key = (font, line, color)
+        surface = self.lines.get(key)
+        if surface is None:
+            surface = self.lines[key] = font.render(line, True, color)
+            if len(self.lines) > self.max_lines:
+                self.lines.popitem(last=False)
+        else:
+            self.lines.move_to_end(key)
+        return surface
+
+    def reset(self):
+        """
+        Drops every cached layout, rendered line and word width.
+        """
+        self.layouts.clear()
+        self.lines.clear()
+        self.word_widths.clear()
+        self.checkpoint = None
+
+    def stats(self):
+        """
+        Returns the layout cache counters and sizes.
+        """
+        return {"hits": self.hits, "misses": self.misses, "layouts": len(self.layouts), "lines": len(self.lines)}
+
+
+text_layouts = TextLayoutCache()  # Shared by every text annotation
 
 
 def adjust_annotation_rect(state):
@@ -37,57 +295,27 @@ def adjust_annotation_rect(state):
     """
     if not state.annotation_rect:
         return
-    words = state.current_text.split(' ')  # Split the text into words
-    space_width = state.annotation_font.size(' ')[0]  # Get the width of a space character
-    max_width = state.annotation_rect.width  # Get the maximum width for the text
-    x, y = state.annotation_rect.topleft
+    lines = text_layouts.wrap(state.annotation_font, state.current_text, state.annotation_rect.width)
     line_height = state.annotation_font.get_height()  # Get the height of a line of text
-    current_line = []  # Initialize the current line of text
-    max_height = 0  # Initialize the maximum height of the text
-
-    for word in words:
-        word_width, word_height = state.annotation_font.size(word)
-        if word_width > max_width:
-            continue  # Skip too long words
-        if sum(state.annotation_font.size(w)[0] for w in current_line) + word_width + space_width <= max_width:
-            current_line.append(word)  # Add the word to the current line
-        else:
-            max_height += line_height  # Move to the next line
-            current_line = [word]
-    if current_line:
-        max_height += line_height  # Add the height of the last line
-
-    state.annotation_rect.height = max_height  # Adjust the height of the annotation rectangle
+    state.annotation_rect.height = len(lines) * line_height  # Adjust the height of the annotation rectangle
 
 
 def render_text_in_box(text, rect, state):
     """
     Renders text inside a rectangular box, ensuring it wraps appropriately.
     """
-    words = text.split(' ')  # Split the text into words
-    space_width = state.annotation_font.size(' ')[0]  # Get the width of a space character
-    max_width = rect.width  # Get the maximum width for the text
-    max_height = rect.height  # Get the maximum height for the text
+    draw_text_box(state.screen, state.annotation_font, text, rect)
+
+
+def draw_text_box(surface, font, text, rect):
+    """
+    Draws text wrapped to a rectangular box onto a surface.
+    """
     x, y = rect.topleft
-    line_height = state.annotation_font.get_height()  # Get the height of a line of text
-    lines = []  # Initialize the list of lines
-    current_line = []  # Initialize the current line of text
-
-    for word in words:
-        word_width, word_height = state.annotation_font.size(word)
-        if word_width > max_width:
-            continue  # Skip too long words
-        if sum(state.annotation_font.size(w)[0] for w in current_line) + word_width + space_width <= max_width:
-            current_line.append(word)  # Add the word to the current line
-        else:
-            lines.append(' '.join(current_line))  # Add the current line to the list of lines
-            current_line = [word]
-    if current_line:
-        lines.append(' '.join(current_line))  # Add the last line to the list of lines
-
-    for line in lines:
-        line_surface = state.annotation_font.render(line, True, (0, 0, 255))  # Render the line of text
-        state.screen.blit(line_surface, (x, y))  # Display the line of text
+    line_height = font.get_height()  # Get the height of a line of text
+    for line in text_layouts.wrap(font, text, rect.width):
+        line_surface = text_layouts.render_line(font, line, TEXT_COLOR)  # Rendered once
+        surface.blit(line_surface, (x, y))  # Display the line of text
         y += line_height  # Move to the next line
         if y + line_height > rect.bottom:
             break  # Stop drawing if text exceeds the box
@@ -1,125 +1,117 @@
-import copy
 import json
 import os
 from pathlib import Path
-import pygame
-from pyslides.pdf_processor import scale_image_to_fit
+from pyslides.file_utils import write_json_atomic
+from pyslides.strokes import Stroke
+
+ANNOTATIONS_FORMAT_VERSION = 2  # Version 2 stores page-normalized coordinates, older files screen pixels
+COORDINATE_DIGITS = 6  # Decimals kept of page-normalized coordinates when saving
 
 
 class AnnotationsConfig:
 
     @staticmethod
-    def rescale_annotations(text_annotations, pen_annotations, original_image_size, new_size, original_size,
-                            new_window_size, original_window_size, is_fullscreen=False):
+    def annotations_file(pdf_file):
+        """
+        Returns the name of the annotations snapshot of a PDF.
+        """
+        return f"{Path(pdf_file).stem}_annotations.json"
+
+    @staticmethod
+    def journal_file(pdf_file):
         """
-        Rescales text and pen annotations when the window size or fullscreen mode changes.
+        Returns the name of the annotation journal of a PDF, holding the edits made since the last snapshot.
         """
-        # Create deep copies of the annotations to avoid modifying the originals
-        rescaled_text_annotations, rescaled_pen_annotations = copy.deepcopy(text_annotations), copy.deepcopy(
-            pen_annotations)
-        if original_size:
+        return f"{Path(pdf_file).stem}_annotations.journal"
 
-            width_scale = new_size[0] / original_size[0]  # Calculate the width scaling factor
-            height_scale = new_size[1] / original_size[1]  # Calculate the height scaling factor
+    @staticmethod
+    def annotation_counts(text_annotations, pen_annotations):
+        """
+        Returns the number of text annotation rects, pen strokes and pen points of every annotated page.
+        """
+        counts = {}
+        for page_num, annotations in text_annotations.items():
+            if annotations:
+                counts[page_num] = {"rects": len(annotations), "strokes": 0, "points": 0}
+        for page_num, strokes in pen_annotations.items():
+            if strokes:
+                page_counts = counts.setdefault(page_num, {"rects": 0, "strokes": 0, "points": 0})
+                page_counts["strokes"] = len(strokes)
+                page_counts["points"] = sum(len(stroke) for stroke in strokes)
+        return dict(sorted(counts.items()))
 
-            # Adjust text annotations
-            for page, annotations in rescaled_text_annotations.items():
-                for i, (rect, text) in enumerate(annotations):
-                    if is_fullscreen:
-                        # Adjust annotation position for fullscreen mode
-                        x_adjust = ((new_window_size[0] - new_size[0]) / 2)
-                        y_adjust = ((original_window_size[1] - original_image_size[1]) / 2)
-                        new_rect = pygame.Rect(
-                            int(round(x_adjust + rect.left * width_scale)),
-                            int(round((rect.top - y_adjust) * height_scale)),
-                            int(round(rect.width * width_scale)),
-                            int(round(rect.height * height_scale))
-                        )
-                    else:
-                        # Adjust annotation position for windowed mode
-                        x_adjust = ((original_window_size[0] - original_size[0]) / 2)
-                        y_adjust = ((new_window_size[1] - new_size[1]) / 2)
-                        new_rect = pygame.Rect(
-                            int(round((rect.left - x_adjust) * width_scale)),
-                            int(round((rect.top * height_scale) + y_adjust)),
-                            int(round(rect.width * width_scale)),
-                            int(round(rect.height * height_scale))
-                        )
+    @staticmethod
+    def files_size(pdf_file):
+        """
+        Returns the bytes taken up on disk by the annotations snapshot and journal of a PDF.
+        """
+        size = 0
+        for path in (AnnotationsConfig.annotations_file(pdf_file), AnnotationsConfig.journal_file(pdf_file)):
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        return size
 
-                    # Update the annotation with the new position and size
-                    rescaled_text_annotations[page][i] = (new_rect, text)
+    @staticmethod
+    def rect_to_json(rect):
+        """
+        Returns a page-normalized text annotation rect as saved to JSON.
+        """
+        return [round(c, COORDINATE_DIGITS) for c in rect] if rect else None
 
-            # Adjust pen annotations
-            for page, pen_strokes in rescaled_pen_annotations.items():
-                for stroke in pen_strokes:
-                    for i, (x, y) in enumerate(stroke):
-                        if is_fullscreen:
-                            # Adjust pen stroke position for fullscreen mode
-                            x_adjust = ((new_window_size[0] - new_size[0]) / 2)
-                            y_adjust = ((original_window_size[1] - original_image_size[1]) / 2)
-                            stroke[i] = (
-                                int(round(x_adjust + x * width_scale)), int(round((y - y_adjust) * height_scale)))
-                        else:
-                            # Adjust pen stroke position for windowed mode
-                            x_adjust = ((original_window_size[0] - original_size[0]) / 2)
-                            y_adjust = ((new_window_size[1] - new_size[1]) / 2)
-                            stroke[i] = (
-                                int(round((x - x_adjust) * width_scale)), int(round((y * height_scale) + y_adjust)))
-        return rescaled_text_annotations, rescaled_pen_annotations
+    @staticmethod
+    def stroke_to_json(stroke):
+        """
+        Returns a page-normalized pen stroke as saved to JSON.
+        """
+        return [[round(x, COORDINATE_DIGITS), round(y, COORDINATE_DIGITS)] for x, y in stroke]
 
     @staticmethod
-    def save_annotations_to_json(image, state, pdf_file):
-        """
-        Saves text and pen annotations to a JSON file.
-        """
-        rescaled_text_annotations, rescaled_pen_annotations = copy.deepcopy(state.text_annotations), copy.deepcopy(
-            state.pen_annotations)
-        if state.is_fullscreen:
-            # Rescale annotations if in fullscreen mode
-            fs_image_size = scale_image_to_fit(image, state.fullscreen_window_size)
-            org_image_size = scale_image_to_fit(image, state.original_window_size)
-            rescaled_text_annotations, rescaled_pen_annotations = AnnotationsConfig.rescale_annotations(
-                state.text_annotations, state.pen_annotations, state.original_image_size,
-                org_image_size.get_size(), fs_image_size.get_size(), state.original_window_size, state.fullscreen_window_size)
+    def save_annotations_to_json(text_annotations, pen_annotations, annotations_file, sequence=0):
+        """
+        Saves text and pen annotations to a JSON snapshot, in page-normalized coordinates, together with the
+        sequence number of the last journal record they include. The file is replaced atomically, so a crash
+        while saving leaves the previous snapshot intact.
+        """
         annotations = {
-            "text_annotations": {str(k): [{"rect": [r.left, r.top, r.width, r.height], "text": t} for r, t in v] for
-                                 k, v in
-                                 rescaled_text_annotations.items()},
-            "pen_annotations": {str(k): [[(x, y) for x, y in points] for points in v] for k, v in
-                                rescaled_pen_annotations.items()}
+            "version": ANNOTATIONS_FORMAT_VERSION,
+            "sequence": sequence,
+            "text_annotations": {str(k): [{"rect": AnnotationsConfig.rect_to_json(r), "text": t} for r, t in v]
+                                 for k, v in text_annotations.items()},
+            "pen_annotations": {str(k): [AnnotationsConfig.stroke_to_json(stroke) for stroke in v]
+                                for k, v in pen_annotations.items()}
         }
-        annotations_file = f"{Path(pdf_file).stem}_annotations.json"
-
-        # Create the file if it doesn't exist
-        if not os.path.exists(annotations_file):
-            with open(annotations_file, 'w') as f:
-                json.dump({}, f)  # Initialize an empty JSON object
-
-        # Save annotations to the file
-        with open(annotations_file, 'w') as f:
-            json.dump(annotations, f, indent=4)  # Use indent for better readability
-        print(f"Annotations saved to {annotations_file}")
+        write_json_atomic(annotations_file, annotations)
 
     @staticmethod
-    def load_annotations_from_json(pdf_file):
+    def load_annotations_from_json(annotations_file, legacy_transform=None):
         """
-        Loads text and pen annotations from a JSON file.
+        Loads text and pen annotations from a JSON snapshot. Returns them with the sequence number of the last
+        journal record the snapshot includes.
+
+        Files without a version were saved in screen pixels of the slides shown in the initial window; they are
+        converted to page-normalized coordinates with legacy_transform, which returns the ``PageTransform`` of a
+        page as it was shown then. Saving writes them back in the current format.
         """
         text_annotations, pen_annotations = {}, {}
-        annotations_file = f"{Path(pdf_file).stem}_annotations.json"
+        if not os.path.exists(annotations_file):
+            return text_annotations, pen_annotations, 0
 
-        if os.path.exists(annotations_file):
-            with open(annotations_file, 'r') as f:
-                annotations = json.load(f)
-                # Load text annotations from the JSON file
-                text_annotations = {
-                    int(k): [(pygame.Rect(a["rect"][0], a["rect"][1], a["rect"][2], a["rect"][3]), a["text"]) for a
-                             in v]
-                    for k, v in annotations.get("text_annotations", {}).items()}
-                # Load pen annotations from the JSON file
-                pen_annotations = {int(k): [points for points in v] for k, v in
-                                   annotations.get("pen_annotations", {}).items()}
-            print(f"Annotations loaded from {annotations_file}")
-        else:
-            print(f"No annotations file found at {annotations_file}")
-        return text_annotations, pen_annotations
+        with open(annotations_file, 'r') as f:
+            annotations = json.load(f)
+        legacy = annotations.get("version") is None
+        if legacy and legacy_transform is None:
+            raise ValueError(f"{annotations_file} uses screen coordinates and cannot be converted")
+        # Load text annotations from the JSON file
+        for k, v in annotations.get("text_annotations", {}).items():
+            text_annotations[int(k)] = [(tuple(a["rect"]) if a["rect"] else None, a["text"]) for a in v]
+            if legacy:
+                transform = legacy_transform(int(k))
+                text_annotations[int(k)] = [(transform.to_page_rect(rect), text)
+                                            for rect, text in text_annotations[int(k)]]
+        # Load pen annotations from the JSON file
+        for k, v in annotations.get("pen_annotations", {}).items():
+            pen_annotations[int(k)] = [Stroke.from_points(points) for points in v]
+            if legacy:
+                transform = legacy_transform(int(k))
+                pen_annotations[int(k)] = [transform.to_page_stroke(stroke) for stroke in pen_annotations[int(k)]]
+        return text_annotations, pen_annotations, annotations.get("sequence", 0)
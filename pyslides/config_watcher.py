@@ -0,0 +1,103 @@
+import os
+import threading
+
+import pygame
+
+from pyslides import constant
+
+
+def file_signature(path):
+    """
+    Returns what identifies a version of a file: its modification time and size, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigWatcher:
+    """
+    Reloads a configuration file in place whenever it changes, so a deck can be tuned without restarting.
+
+    A background thread polls the modification time and size of the file, which costs a single ``stat`` per
+    interval, and loads the file again when they changed. Loading and validating happen in the watcher thread;
+    a valid configuration is handed to ``on_reload`` and an invalid one to ``on_error``, leaving the last good
+    configuration active. The next change is picked up again, e.g. once the editor finished writing the file.
+    """
+
+    def __init__(self, path, load, on_reload, on_error=None, interval=constant.CONFIG_POLL_INTERVAL):
+        self.path = str(path)
+        self.load = load  # Reads and validates the file; raises for an invalid file
+        self.on_reload = on_reload  # Called from the watcher thread with every valid configuration loaded
+        self.on_error = on_error  # Called from the watcher thread with the error of every invalid configuration
+        self.interval = interval
+        self.signature = file_signature(self.path)  # Version of the file loaded last
+        self.reloads = self.errors = 0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """
+        Starts the watcher thread.
+        """
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="pyslides-config-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the watcher thread.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        """
+        Polling loop of the watcher thread.
+        """
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """
+        Reloads the file if it changed since it was last loaded. Returns True if a new configuration was loaded.
+        """
+        signature = file_signature(self.path)
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        try:
+            config = self.load(self.path)
+        except Exception as error:  # Also a file read while it was being written; the thread keeps watching
+            self.errors += 1
+            if self.on_error:
+                self.on_error(error)
+            return False
+        self.reloads += 1
+        self.on_reload(config)
+        return True
+
+    def stats(self):
+        """
+        Returns watcher statistics.
+        """
+        return {"reloads": self.reloads, "errors": self.errors}
+
+
+def post_config_reloaded(transition_plan):
+    """
+    Hands a reloaded transition plan to the main loop. Safe to call from any thread.
+    """
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(constant.CONFIG_RELOADED_EVENT, transition_plan=transition_plan))
+
+
+def report_config_error(error):
+    """
+    Reports a transitions configuration that could not be reloaded.
+    """
+    print(f"Transitions configuration not reloaded, keeping the previous one: {error}")
@@ -1,7 +1,44 @@
+import os
+
+import pygame
+
 DISPLAY_CAPTION = 'PySlides'
 SCREEN_WIDTH = 794
 SCREEN_HEIGHT = 1123
 PARTIAL_SLIDE_TRANSITION = 'partial_sliding'
 INVERT_TRANSITION = 'invert-transition'
 NONE = 'none'
-KEEP_ORIGINAL = 'keep_original'
\ No newline at end of file
+KEEP_ORIGINAL = 'keep_original'
+RENDER_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+                                'pyslides')
+
+SLIDE_CACHE_BUDGET = 256 * 1024 * 1024  # Bytes of decoded slide surfaces kept in memory
+SLIDE_CACHE_WARM_BUDGET = 64 * 1024 * 1024  # Bytes of compressed slides kept in memory
+SLIDE_CACHE_KEEP_AROUND = 2  # Slides on either side of the current slide that are never evicted
+
+RESIZE_DEBOUNCE_TIME = 0.2  # Seconds without resize events before the slides are re-rendered for a new window size
+
+ZOOM_TILE_SIZE = 256  # Width and height in pixels of the tiles zoomed slides are rendered in
+ZOOM_TILE_CACHE_BUDGET = 64 * 1024 * 1024  # Bytes of rendered zoom tiles kept in memory
+ZOOM_TILE_FRAME_BUDGET = 0.008  # Seconds per frame spent rendering missing zoom tiles
+
+OVERVIEW_THUMBNAIL_WIDTH = 160  # Width in pixels of the slide thumbnails in overview mode
+OVERVIEW_MARGIN = 10  # Space in pixels between the thumbnails in overview mode
+THUMBNAIL_ATLAS_SHEET_SIZE = 8  # Thumbnails per row and column of each thumbnail atlas sheet
+THUMBNAIL_FRAME_BUDGET = 0.008  # Seconds per frame spent rendering missing thumbnails
+
+SLIDE_UPDATED_EVENT = pygame.USEREVENT + 1  # Posted when a slide was rendered in the background
+CONFIG_RELOADED_EVENT = pygame.USEREVENT + 2  # Posted with the transition plan of a changed configuration file
+CONFIG_POLL_INTERVAL = 0.5  # Seconds between checks of the transitions configuration file for changes
+
+TRANSITION_FPS = 60  # Frames per second targeted while a slide transition plays
+TRANSITION_INTERRUPT = 'collapse'  # What a new navigation does to a running transition: 'collapse' or 'skip'
+
+FRAME_HUD_REFRESH_INTERVAL = 0.5  # Seconds of frames averaged for each update of the frame timing HUD
+STATS_INTERVAL = 1.0  # Seconds between the resource statistics printed with --stats
+
+ANNOTATION_LAYER_PAGES = 3  # Slides whose rasterized annotation layer is kept
+ANNOTATION_LAYER_MAX_PATCHES = 8  # Changed annotations patched one by one; beyond that the layer is redrawn
+PEN_SIMPLIFY_TOLERANCE = 1.0  # Pixels a finished pen stroke may deviate from the drawn one when simplified
+ANNOTATION_JOURNAL_INTERVAL = 1.0  # Seconds between writes of new annotation edits to the journal
+ANNOTATION_JOURNAL_COMPACT_RECORDS = 500  # Journal records after which they are compacted into the snapshot
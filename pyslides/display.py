@@ -1,15 +1,40 @@
+import functools
+
 import pygame
 
 from pyslides import constant
-from pyslides.annotations import draw_text_annotations, draw_pen_annotations
-from pyslides.config.annotations_config import AnnotationsConfig
-from pyslides.config.transitions_config_reader import TransitionsConfig
-from pyslides.pdf_processor import scale_image_to_fit
-
-
-def toggle_fullscreen(images, prev_window_size, state):
+from pyslides.annotations import draw_annotations
+from pyslides.frame_profiler import profiler
+from pyslides.transitions import draw_partial_slide
+
+HELP_TEXT = [
+    "Help Menu:",
+    "RIGHT ARROW: Next slide",
+    "LEFT ARROW: Previous slide",
+    "UP ARROW: Scroll up (for partial slides)",
+    "DOWN ARROW: Scroll down (for partial slides)",
+    "S: Toggle spotlight mode",
+    "R: Toggle highlight mode",
+    "+ / =: Increase spotlight radius",
+    "-: Decrease spotlight radius",
+    "F: Toggle fullscreen",
+    "TAB: Toggle overview mode",
+    "RETURN: Select slide in overview mode",
+    "H: Toggle help menu",
+    "Ctrl + Mouse Wheel: Zoom in/out",
+    "T: Add text annotation",
+    "P: Toggle pen mode for freehand drawing",
+    "RETURN: Stop entering text in text annotation box",
+    "Ctrl + S: Save annotations",
+    "F3: Toggle frame timing HUD",
+    "I: Print memory and cache statistics"
+]
+
+
+def toggle_fullscreen(images, state):
     """
-    Toggles fullscreen mode on and off, rescaling images and annotations as needed.
+    Toggles fullscreen mode on and off, re-rendering the slides for the new size. Annotations are stored relative
+    to their slide, so they follow without being touched.
     """
 
     # Toggle fullscreen state
@@ -20,30 +45,55 @@ def toggle_fullscreen(images, prev_window_size, state):
         state.fullscreen_window_size = state.screen.get_size()  # Update fullscreen window size
     else:
         # Set the screen back to windowed mode
-        state.screen = pygame.display.set_mode(state.original_window_size)
+        state.screen = pygame.display.set_mode(state.original_window_size,
+                                               pygame.RESIZABLE if state.resizable else 0)
 
     new_window_size = state.screen.get_size()  # Get the new window size
+    reformat_surfaces(images, state)
 
-    # Update the images to fit the new window size and track the new image size
-    images[:] = [scale_image_to_fit(pygame.image.load(img_path), new_window_size) for img_path in state.image_paths]
-    new_image_size = images[0].get_size()
+    # Re-render the slides from the PDF at the new window size in the background, visible page first
+    state.render_service.restart(new_window_size)
+    state.window_size = new_window_size  # Update global window size
 
-    # Rescale annotations to match the new image size
-    state.text_annotations, state.pen_annotations = AnnotationsConfig.rescale_annotations(state.text_annotations,
-                                                                                          state.pen_annotations,
-                                                                                          state.original_image_size,
-                                                                                          new_image_size,
-                                                                                          state.original_image_size,
-                                                                                          new_window_size,
-                                                                                          prev_window_size,
-                                                                                          state.is_fullscreen)
+    update_partial_slide_position(images, state)
 
-    state.window_size = new_window_size  # Update global window size
-    state.original_image_size = new_image_size  # Update the original image size to the new one
 
+def resize_window(images, new_window_size, state):
+    """
+    Applies a new size of the resizable window: the slides are re-rendered for it in the background, and the
+    annotations follow their slides.
+    """
+    state.screen = pygame.display.set_mode(new_window_size, pygame.RESIZABLE)
+    state.window_size = state.original_window_size = state.screen.get_size()  # Update global window size
+    reformat_surfaces(images, state)
+
+    state.render_service.restart(state.window_size)
+    update_partial_slide_position(images, state)
+
+
+def reformat_surfaces(images, state):
+    """
+    Converts the cached slides, thumbnails, overlay, zoom tiles and pre-rendered screens again after a display
+    mode change, as the display pixel format may have changed with it.
+    """
+    images.reformat()
+    if state.overview is not None:
+        state.overview.reformat()
+    state.overlay.reformat()
+    if state.zoom_engine is not None:
+        state.zoom_engine.reset()
+    help_screen.cache_clear()
+    initial_help_popup.cache_clear()
+    frame_hud.cache_clear()
+
+
+def update_partial_slide_position(images, state):
+    """
+    Recalculates the slide positions of an active partial slide transition for the current window size.
+    """
     # Recalculate slide positions if partial transition is active
     if state.current_page != 0 and (state.scrolling or constant.PARTIAL_SLIDE_TRANSITION ==
-                                    TransitionsConfig.get_transition_config(state)["transition"]):
+                                    state.transition_plan[state.current_page].transition):
         halfway_pos = state.window_size[1] / 4
         prev_start_pos = ((state.window_size[1] - images[state.current_page - 1].get_height()) // 2)
         prev_slide_position = prev_start_pos - halfway_pos
@@ -52,62 +102,29 @@ def toggle_fullscreen(images, prev_window_size, state):
 
 def display_overview(images, state):
     """
-    Displays thumbnails of all slides in an overview mode, with the currently highlighted slide faded out.
+    Displays the slide thumbnails in view in overview mode, with every slide but the highlighted one faded out.
     """
-    highlighted_page = state.focused_page
-    state.screen.fill((0, 0, 0))  # Clear the screen with black
-    margin = 10
-    rows = cols = int(len(images) ** 0.5) + 1  # Calculate the number of rows and columns
-    thumb_width = (state.window_size[0] - margin * (cols + 1)) // cols  # Calculate the thumbnail width
-    thumb_height = (state.window_size[1] - margin * (rows + 1)) // rows  # Calculate the thumbnail height
-
-    # Iterate through each thumbnail image and display it
-    for i, thumbnail in enumerate([pygame.transform.scale(img, (thumb_width, thumb_height)) for img in images]):
-        x = margin + (i % cols) * (thumb_width + margin)
-        y = margin + (i // cols) * (thumb_height + margin)
-        images[i].set_alpha(255)  # Just a quick fix for fade out slide in transition issue
-        if i != highlighted_page:
-            thumbnail.set_alpha(100)  # Fade out non-highlighted thumbnails
-        state.screen.blit(thumbnail, (x, y))  # Display the thumbnail on the screen
+    state.overview.draw(state.screen, state.focused_page, state.window_size)
 
 
 def select_thumbnail(mouse_pos, images, state):
     """
     Selects a thumbnail in overview mode based on the mouse click position.
     """
-    margin = 10
-    rows = cols = int(len(images) ** 0.5) + 1  # Calculate the number of rows and columns
-    thumb_width = (state.window_size[0] - margin * (cols + 1)) // cols  # Calculate the thumbnail width
-    thumb_height = (state.window_size[1] - margin * (rows + 1)) // rows  # Calculate the thumbnail height
-
-    # Iterate through thumbnails and check if the mouse click is within any thumbnail
-    for i in range(len(images)):
-        x = margin + (i % cols) * (thumb_width + margin)
-        y = margin + (i // cols) * (thumb_height + margin)
-        if x <= mouse_pos[0] <= x + thumb_width and y <= mouse_pos[1] <= y + thumb_height:
-            state.focused_page = i  # Update the focused page
-            state.current_page = state.focused_page  # Set the current page to the focused page
-            state.show_overview = False  # Exit overview mode
-            break
+    page_num = state.overview.page_at(mouse_pos, state.window_size)
+    if page_num is not None:
+        state.focused_page = page_num  # Update the focused page
+        state.current_page = state.focused_page  # Set the current page to the focused page
+        state.show_overview = False  # Exit overview mode
 
 
 def highlight_thumbnail(mouse_pos, images, state):
     """
     Highlights a thumbnail in overview mode based on the mouse hover position.
     """
-    margin = 10
-    rows = cols = int(len(images) ** 0.5) + 1  # Calculate the number of rows and columns
-    thumb_width = (state.window_size[0] - margin * (cols + 1)) // cols  # Calculate the thumbnail width
-    thumb_height = (state.window_size[1] - margin * (rows + 1)) // rows  # Calculate the thumbnail height
-
-    # Iterate through thumbnails and check if the mouse is hovering over any thumbnail
-    for i in range(len(images)):
-        x = margin + (i % cols) * (thumb_width + margin)
-        y = margin + (i // cols) * (thumb_height + margin)
-        images[i].set_alpha(255)  # Just a quick fix for fade out slide in transition issue
-        if x <= mouse_pos[0] <= x + thumb_width and y <= mouse_pos[1] <= y + thumb_height:
-            state.focused_page = i  # Update the focused page
-            break
+    page_num = state.overview.page_at(mouse_pos, state.window_size)
+    if page_num is not None:
+        state.focused_page = page_num  # Update the focused page
 
 
 def display_slide(images, state):
@@ -119,68 +136,79 @@ def display_slide(images, state):
     image = images[state.current_page]
 
     if state.zoom_level > 1:
-        # Scale the image for zooming
-        zoomed_image = pygame.transform.scale(image, (
-            int(image.get_width() * state.zoom_level), int(image.get_height() * state.zoom_level)))
-
-        # Calculate the portion of the image to display at the center
-        # New zoomed image size
-        zoomed_width, zoomed_height = zoomed_image.get_size()
-        # Center position on screen
-        center_x, center_y = state.window_size[0] // 2, state.window_size[1] // 2
-        # Calculate the offset from the zoom_pos to the center
-        offset_x = int(state.zoom_pos[0] * state.zoom_level) - center_x
-        offset_y = int(state.zoom_pos[1] * state.zoom_level) - center_y
-        # Create the rectangle to be displayed
-        zoom_rect = pygame.Rect(offset_x, offset_y, state.window_size[0], state.window_size[1])
-
-        # Ensure the rectangle is within the bounds of the zoomed image
-        zoom_rect = zoom_rect.clamp(pygame.Rect(0, 0, zoomed_width, zoomed_height))
-
-        state.screen.blit(zoomed_image, (0, 0), zoom_rect)  # Display the zoomed image
+        # Render the visible region of the slide from the PDF at the zoom level
+        state.zoom_engine.draw(state.screen, image, state.current_page, state.zoom_level, state.zoom_pos,
+                               state.window_size)
     else:
+        image.set_alpha(None)  # Undo any fading left over from a transition
         # Center the image on the screen
         image_rect = image.get_rect(center=(state.window_size[0] // 2, state.window_size[1] // 2))
         state.screen.blit(image, image_rect.topleft)  # Display the image
 
-        # Draw annotations relative to the current image size
-        draw_text_annotations(state)
-        draw_pen_annotations(state)
-
 
 def draw_spotlight(state):
     """
     Draws a spotlight effect on the slide, dimming the rest of the slide.
     """
-    # Create a surface for the spotlight effect
-    spotlight_surface = pygame.Surface(state.window_size, pygame.SRCALPHA)
-
-    # Fill the surface with a semi-transparent black
-    spotlight_surface.fill((0, 0, 0, 150))  # Use alpha value to dim
-
-    # Cut out the spotlight area by making it fully transparent
-    pygame.draw.circle(spotlight_surface, (0, 0, 0, 0), state.spotlight_position, state.spotlight_radius)
-
-    # Blit the spotlight effect onto the main screen
-    state.screen.blit(spotlight_surface, (0, 0))
+    state.overlay.draw_spotlight(state.screen, state.spotlight_position, state.spotlight_radius, state.window_size)
 
 
 def draw_highlight(state):
     """
-    Draws a highlight rectangle over the slide, dimming the rest of the slide.
+    Draws the highlighted regions and the highlight being dragged over the slide, dimming the rest of the slide.
     """
-    # global current_highlights
-    # Create an overlay surface with transparency to dim the rest of the slide
-    overlay_surface = pygame.Surface(state.window_size, pygame.SRCALPHA)
-    overlay_surface.fill((0, 0, 0, 150))  # Semi-transparent black fill
+    state.overlay.draw_highlight(state.screen, state.current_highlights, state.highlight_rect, state.window_size)
 
-    if state.current_highlights:
-        for rect in state.current_highlights:
-            # Cut out the highlight area by making it fully transparent
-            pygame.draw.rect(overlay_surface, (0, 0, 0, 0), rect)
 
-    # Blit the overlay to the screen
-    state.screen.blit(overlay_surface, (0, 0))
+def draw_frame(images, state):
+    """
+    Draws a complete frame: the current slide or the screen shown instead of it, the spotlight or highlight
+    overlay, the annotations, the initial help popup and the frame timing HUD.
+    """
+    if state.black_screen_mode:
+        state.screen.fill((0, 0, 0))  # Fill the screen with black if black screen mode is active
+        return
+
+    with profiler.phase("slide"):
+        if state.show_help:
+            display_help(state)  # Display the help screen
+        elif state.show_overview:
+            display_overview(images, state)  # Display the overview mode
+        elif state.end_of_presentation:
+            display_end_message(state)  # Display the end of the presentation message
+        elif state.transition_player.active:
+            state.transition_player.draw(images, state)  # Draw the current frame of the slide transition
+        else:
+            if state.transition_plan[state.current_page].transition != constant.PARTIAL_SLIDE_TRANSITION:
+                display_slide(images, state)  # Display the current slide
+            else:
+                draw_partial_slide(images, state)  # Draw the partial slide transition
+
+    with profiler.phase("overlay"):
+        if state.spotlight_mode:
+            draw_spotlight(state)  # Draw the spotlight effect
+        elif state.highlight_mode:
+            draw_highlight(state)  # Draw the highlight effect
+
+    if not state.show_overview and state.zoom_level == 1 and not state.show_help and \
+            not state.transition_player.active:
+        with profiler.phase("annotations"):
+            draw_annotations(images, state)  # Draw the text and pen annotations
+
+    if state.show_initial_help_popup:
+        with profiler.phase("chrome"):
+            display_initial_help_popup(state)  # Display the initial help popup
+
+    if profiler.show_hud:
+        display_frame_hud(state)  # Display the frame timing HUD
+
+
+@functools.lru_cache(maxsize=64)
+def render_text(font, text, color):
+    """
+    Renders a line of text once and reuses the surface for every later frame.
+    """
+    return font.render(text, True, color)
 
 
 def display_end_message(state):
@@ -188,53 +216,88 @@ def display_end_message(state):
     Displays a message indicating the end of the presentation.
     """
     state.screen.fill((0, 0, 0))  # Clear the screen with black
-    text = state.font.render("You have reached the end of the presentation", True, (255, 255, 255))
+    text = render_text(state.font, "You have reached the end of the presentation", (255, 255, 255))
     text_rect = text.get_rect(
         center=(state.window_size[0] // 2, state.window_size[1] // 2))  # Center the text on the screen
     state.screen.blit(text, text_rect)  # Display the end message
 
 
-def display_help(state):
+@functools.lru_cache(maxsize=4)
+def help_screen(font, window_size):
     """
-    Displays a help screen with key commands and instructions.
+    Renders the help screen for the given window size.
     """
-    state.screen.fill((75, 75, 75))  # Fill the screen with a dark gray color
-    help_text = [
-        "Help Menu:",
-        "RIGHT ARROW: Next slide",
-        "LEFT ARROW: Previous slide",
-        "UP ARROW: Scroll up (for partial slides)",
-        "DOWN ARROW: Scroll down (for partial slides)",
-        "S: Toggle spotlight mode",
-        "R: Toggle highlight mode",
-        "+ / =: Increase spotlight radius",
-        "-: Decrease spotlight radius",
-        "F: Toggle fullscreen",
-        "TAB: Toggle overview mode",
-        "RETURN: Select slide in overview mode",
-        "H: Toggle help menu",
-        "Ctrl + Mouse Wheel: Zoom in/out",
-        "T: Add text annotation",
-        "P: Toggle pen mode for freehand drawing",
-        "RETURN: Stop entering text in text annotation box",
-        "Ctrl + S: Save annotations"
-    ]
+    surface = pygame.Surface(window_size)
+    surface.fill((75, 75, 75))  # Fill the screen with a dark gray color
     y_offset = 50  # Initial vertical position for the help text
-    for line in help_text:
-        text = state.font.render(line, True, (255, 255, 255))  # Render each line of help text
-        state.screen.blit(text, (50, y_offset))  # Display the help text
+    for line in HELP_TEXT:
+        surface.blit(render_text(font, line, (255, 255, 255)), (50, y_offset))  # Display the help text
         y_offset += 40  # Move to the next line
+    return surface
+
+
+def display_help(state):
+    """
+    Displays a help screen with key commands and instructions.
+    """
+    state.screen.blit(help_screen(state.font, state.window_size), (0, 0))
+
+
+def initial_help_popup_rect(window_size):
+    """
+    Returns the screen area covered by the initial help popup.
+    """
+    popup_rect = pygame.Rect(0, 0, int(window_size[0] * 0.8), 100)
+    popup_rect.center = (window_size[0] // 2, window_size[1] // 2)  # Center the popup on the screen
+    return popup_rect
+
+
+@functools.lru_cache(maxsize=4)
+def initial_help_popup(font, size):
+    """
+    Renders the initial help popup with a short message.
+    """
+    popup_surface = pygame.Surface(size, pygame.SRCALPHA)
+    popup_surface.fill((0, 0, 0, 200))  # Create a semi-transparent black popup
+    text = font.render("Press 'H' for help", True, (255, 255, 255))  # Render the popup text
+    popup_surface.blit(text, text.get_rect(center=(size[0] // 2, size[1] // 2)))  # Center the text in the popup
+    return popup_surface
 
 
 def display_initial_help_popup(state):
     """
     Displays an initial help popup with a short message.
     """
-    popup_surface = pygame.Surface((state.window_size[0] * 0.8, 100), pygame.SRCALPHA)
-    popup_surface.fill((0, 0, 0, 200))  # Create a semi-transparent black popup
-    popup_rect = popup_surface.get_rect(
-        center=(state.window_size[0] // 2, state.window_size[1] // 2))  # Center the popup on the screen
-    text = state.font.render("Press 'H' for help", True, (255, 255, 255))  # Render the popup text
-    text_rect = text.get_rect(center=popup_rect.center)  # Center the text within the popup
-    state.screen.blit(popup_surface, popup_rect)  # Display the popup
-    state.screen.blit(text, text_rect)  # Display the popup text
+    popup_rect = initial_help_popup_rect(state.window_size)
+    state.screen.blit(initial_help_popup(state.font, popup_rect.size), popup_rect)  # Display the popup
+
+
+def frame_hud_rect(font, rows):
+    """
+    Returns the screen area covered by the frame timing HUD.
+    """
+    return pygame.Rect(10, 10, 180, 16 + font.get_linesize() * len(rows))
+
+
+@functools.lru_cache(maxsize=4)
+def frame_hud(font, rows):
+    """
+    Renders the frame timing HUD with the given (label, value) rows, values aligned to the right.
+    """
+    width, height = frame_hud_rect(font, rows).size
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 200))  # Semi-transparent black, like the initial help popup
+    for i, (label, value) in enumerate(rows):
+        y = 8 + i * font.get_linesize()
+        surface.blit(font.render(label, True, (255, 255, 0)), (8, y))
+        value = font.render(value, True, (255, 255, 0))
+        surface.blit(value, (width - 8 - value.get_width(), y))
+    return surface
+
+
+def display_frame_hud(state):
+    """
+    Displays the frame time, the frame rate and the milliseconds spent in every phase of recent frames.
+    """
+    rows = profiler.summary or (("measuring", ""),)
+    state.screen.blit(frame_hud(state.hud_font, rows), frame_hud_rect(state.hud_font, rows))
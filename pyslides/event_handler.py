@@ -3,11 +3,14 @@ import time
 import pygame
 
 from pyslides import constant
-from pyslides.annotations import adjust_annotation_rect
-from pyslides.config.annotations_config import AnnotationsConfig
-from pyslides.config.transitions_config_reader import TransitionsConfig
-from pyslides.display import display_slide, select_thumbnail, highlight_thumbnail, toggle_fullscreen
-from pyslides.transitions import SlideTransition, scroll_slide
+from pyslides.annotations import adjust_annotation_rect, annotations_edited
+from pyslides.display import select_thumbnail, highlight_thumbnail, toggle_fullscreen
+from pyslides.frame_profiler import profiler
+from pyslides.overlay import merge_highlight
+from pyslides.page_transform import slide_transform
+from pyslides.resource_stats import print_stats
+from pyslides.strokes import Stroke
+from pyslides.transitions import scroll_slide
 
 
 def handle_keydown(event, images, pdf_file, state):
@@ -21,11 +24,7 @@ def handle_keydown(event, images, pdf_file, state):
     if state.is_entering_text:
         # Handle text entry for annotations
         if event.key == pygame.K_RETURN:  # Stop entering text mode with 'Enter' key
-            if state.current_page not in state.text_annotations:
-                state.text_annotations[state.current_page] = []
-            state.text_annotations[state.current_page].append((state.annotation_rect, state.current_text))
-            state.current_text = ""
-            state.annotation_rect = None
+            commit_text_annotation(images, state)
             state.is_entering_text = False
             return
         elif event.key == pygame.K_BACKSPACE:
@@ -42,6 +41,10 @@ def handle_keydown(event, images, pdf_file, state):
         state.show_help = not state.show_help
         state.show_initial_help_popup = False
         state.is_drawing_pen = False  # Disable pen mode when help is shown
+    elif event.key == pygame.K_F3:
+        profiler.toggle_hud()  # Toggle the frame timing HUD
+    elif event.key == pygame.K_i:
+        print_stats(images, state)  # Print the memory and caches used by the presentation
     elif state.show_help:
         return  # Ignore other key presses when the help screen is active
 
@@ -51,6 +54,7 @@ def handle_keydown(event, images, pdf_file, state):
         if state.show_overview:
             # Navigate to the next slide in overview mode
             state.focused_page = (state.focused_page + 1) % len(images)
+            state.overview.scroll_to(state.focused_page, state.window_size)
         else:
             # Navigate to the next slide
             prev_page = state.current_page
@@ -58,8 +62,8 @@ def handle_keydown(event, images, pdf_file, state):
             if state.current_page >= len(images):
                 state.end_of_presentation = True
             else:
-                state.next_slide_position = SlideTransition.apply_transition(prev_page, images,
-                                                                             state, reverse=False)
+                state.next_slide_position = state.transition_player.start(prev_page, images,
+                                                                          state, reverse=False)
             state.zoom_level = 1.0  # Reset zoom level on slide change
             state.current_highlights.clear()  # Clear any highlights
     elif event.key == pygame.K_LEFT or event.key == pygame.K_PAGEUP:  # 'Page Up' for clickers
@@ -68,6 +72,7 @@ def handle_keydown(event, images, pdf_file, state):
         if state.show_overview:
             # Navigate to the previous slide in overview mode
             state.focused_page = (state.focused_page - 1) % len(images)
+            state.overview.scroll_to(state.focused_page, state.window_size)
         else:
             if state.end_of_presentation:
                 state.current_page = len(images) - 1
@@ -80,44 +85,44 @@ def handle_keydown(event, images, pdf_file, state):
                     state.current_page = 0
             state.zoom_level = 1.0  # Reset zoom level on slide change
             state.current_highlights.clear()  # Clear any highlights
-            transition_config_current = TransitionsConfig.get_transition_config(state)
-            reversal_strategy = transition_config_current["reversal-strategy"]
-            if reversal_strategy != constant.NONE:
-                state.next_slide_position = SlideTransition.apply_transition(prev_page, images, state,
-                                                                             TransitionsConfig.check_reversal_strategy(
-                                                                                 reversal_strategy))
+            reverse = state.transition_plan[state.current_page].reverse
+            if reverse is not None:
+                state.next_slide_position = state.transition_player.start(prev_page, images, state, reverse)
             else:
-                display_slide(images, state)
+                state.transition_player.finish(images)  # Show the slide right away
     elif event.key == pygame.K_f:
         # Toggle fullscreen mode
-        state.original_image_size = images[state.current_page].get_size()
-        prev_window_size = state.screen.get_size()
-        toggle_fullscreen(images, prev_window_size, state)
+        toggle_fullscreen(images, state)
     elif event.key == pygame.K_TAB:
         state.show_overview = not state.show_overview  # Toggle overview mode
+        if state.show_overview:
+            state.overview.scroll_to(state.focused_page, state.window_size)  # Show the highlighted slide
     elif event.key == pygame.K_RETURN and state.show_overview:
         # Select the slide in overview mode
         state.current_page = state.focused_page
         state.show_overview = False
+    elif event.key in (pygame.K_UP, pygame.K_DOWN) and state.show_overview:
+        # Move the highlight a row up or down in overview mode
+        columns = state.overview.layout(state.window_size)[0]
+        step = -columns if event.key == pygame.K_UP else columns
+        if 0 <= state.focused_page + step < len(images):
+            state.focused_page += step
+            state.overview.scroll_to(state.focused_page, state.window_size)
     elif event.key == pygame.K_UP:
         # Scroll up in partial slide transition
-        transition_config_prev = TransitionsConfig.get_transition_config(state)
-        transition_type_prev = transition_config_prev["transition"]
-        state.scrolling = transition_type_prev == constant.PARTIAL_SLIDE_TRANSITION
+        state.scrolling = state.transition_plan[state.current_page].transition == constant.PARTIAL_SLIDE_TRANSITION
         state.scroll_direction = -1  # Scroll up
         state.scroll_start_time = time.time()
     elif event.key == pygame.K_DOWN:
         # Scroll down in partial slide transition
-        transition_config_prev = TransitionsConfig.get_transition_config(state)
-        transition_type_prev = transition_config_prev["transition"]
-        state.scrolling = transition_type_prev == constant.PARTIAL_SLIDE_TRANSITION
+        state.scrolling = state.transition_plan[state.current_page].transition == constant.PARTIAL_SLIDE_TRANSITION
         state.scroll_direction = 1  # Scroll down
         state.scroll_start_time = time.time()
     elif event.key == pygame.K_s:
         # Toggle spotlight mode or save annotations with Ctrl + S
         if pygame.key.get_mods() & pygame.KMOD_CTRL:
-            AnnotationsConfig.save_annotations_to_json(images[state.current_page], state,
-                                                       pdf_file)  # Save annotations when Ctrl + S is pressed
+            if state.annotation_journal:
+                state.annotation_journal.save()  # Save annotations in the background when Ctrl + S is pressed
         else:
             state.spotlight_mode = not state.spotlight_mode
             if state.spotlight_mode:
@@ -129,6 +134,7 @@ def handle_keydown(event, images, pdf_file, state):
         state.spotlight_mode = False  # Turn off spotlight mode if highlight mode is enabled
         state.highlight_mode = not state.highlight_mode
         state.highlight_start = None  # Reset highlight start position
+        state.highlight_rect = None  # Drop the highlight being dragged
     elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
         # Increase spotlight radius
         if state.spotlight_mode:
@@ -145,33 +151,21 @@ def handle_keydown(event, images, pdf_file, state):
         state.is_drawing_pen = False  # Disable pen mode when text annotations are enabled
         if not state.show_overview and state.zoom_level == 1:
             if state.is_entering_text:  # Stop entering text mode
-                if state.current_page not in state.text_annotations:
-                    state.text_annotations[state.current_page] = []
-                state.text_annotations[state.current_page].append((state.annotation_rect, state.current_text))
-                state.current_text = ""
-                state.annotation_rect = None
+                commit_text_annotation(images, state)
                 state.is_entering_text = False
             else:  # Start drawing a box for text annotation
-                for rect, text in state.text_annotations.get(state.current_page, []):
-                    if rect.collidepoint(pygame.mouse.get_pos()):
-                        state.annotation_rect = rect
-                        state.current_text = text
-                        state.text_annotations[state.current_page].remove((rect, text))
-                        state.is_entering_text = True
-                        break
+                if take_text_annotation(images, state, state.mouse_pos):
+                    state.is_entering_text = True  # Edit the annotation under the mouse
                 else:
                     state.is_drawing_box = True
-                    state.annotation_start = pygame.mouse.get_pos()  # Capture the starting position for the annotation box
+                    state.annotation_start = state.mouse_pos  # Capture the starting position for the annotation box
                     state.current_text = ""  # Initialize an empty text string
     elif event.key == pygame.K_p:
         # Toggle pen mode for freehand drawing
         if not state.show_overview and state.zoom_level == 1:
             state.is_drawing_pen = not state.is_drawing_pen  # Toggle pen drawing mode
             if not state.is_drawing_pen and state.pen_points:
-                if state.current_page not in state.pen_annotations:
-                    state.pen_annotations[state.current_page] = []
-                state.pen_annotations[state.current_page].append(state.pen_points)
-                pen_points = []
+                commit_pen_stroke(images, state)
 
 
 def handle_keyup(event, state):
@@ -216,13 +210,8 @@ def handle_mouse(event, images, state):
                 state.pen_points.append(event.pos)
             else:
                 # Check if an annotation is being dragged
-                for rect, text in state.text_annotations.get(state.current_page, []):
-                    if rect.collidepoint(event.pos):
-                        state.dragging = True
-                        state.annotation_rect = rect
-                        state.current_text = text
-                        state.text_annotations[state.current_page].remove((rect, text))
-                        break
+                if take_text_annotation(images, state, event.pos):
+                    state.dragging = True
                 else:
                     # Navigate to the next slide on left-click
                     prev_page = state.current_page
@@ -232,9 +221,9 @@ def handle_mouse(event, images, state):
                     if state.current_page >= len(images):
                         state.end_of_presentation = True
                     else:
-                        state.next_slide_position = SlideTransition.apply_transition(prev_page, images,
-                                                                                     state,
-                                                                                     reverse=False)
+                        state.next_slide_position = state.transition_player.start(prev_page, images,
+                                                                                  state,
+                                                                                  reverse=False)
         elif event.button == 3 and not state.show_overview:  # Right mouse button and not in overview mode
             # Go to the previous slide
             if state.black_screen_mode:
@@ -250,34 +239,30 @@ def handle_mouse(event, images, state):
                     state.current_page = 0
             state.zoom_level = 1.0  # Reset zoom level on slide change
             state.current_highlights.clear()
-            transition_config_current = TransitionsConfig.get_transition_config(state)
-            reversal_strategy = transition_config_current["reversal-strategy"]
-            if reversal_strategy != constant.NONE:
-                state.next_slide_position = SlideTransition.apply_transition(prev_page, images,
-                                                                             state,
-                                                                             TransitionsConfig.
-                                                                             check_reversal_strategy(reversal_strategy))
+            reverse = state.transition_plan[state.current_page].reverse
+            if reverse is not None:
+                state.next_slide_position = state.transition_player.start(prev_page, images, state, reverse)
             else:
-                display_slide(images, state)
+                state.transition_player.finish(images)  # Show the slide right away
         elif event.button == 4:  # Scroll up (mouse wheel up)
             if pygame.key.get_mods() & pygame.KMOD_CTRL:  # Check if Ctrl key is pressed
                 state.is_drawing_pen = False
                 state.zoom_level = min(state.zoom_level * 1.25, state.max_zoom_level)  # Increase zoom level
                 state.zoom_pos = event.pos
+            elif state.show_overview:
+                state.overview.scroll_by(-1, state.window_size)  # Scroll the thumbnails up by a row
             else:
-                transition_config_prev = TransitionsConfig.get_transition_config(state)
-                transition_type_prev = transition_config_prev["transition"]
-                if transition_type_prev == constant.PARTIAL_SLIDE_TRANSITION:
+                if state.transition_plan[state.current_page].transition == constant.PARTIAL_SLIDE_TRANSITION:
                     scroll_slide(images, -1, state)  # Scroll up
         elif event.button == 5:  # Scroll down (mouse wheel down)
             if pygame.key.get_mods() & pygame.KMOD_CTRL:  # Check if Ctrl key is pressed
                 state.is_drawing_pen = False
                 state.zoom_level = max(state.zoom_level / 1.25, state.min_zoom_level)  # Decrease zoom level
                 state.zoom_pos = event.pos
+            elif state.show_overview:
+                state.overview.scroll_by(1, state.window_size)  # Scroll the thumbnails down by a row
             else:
-                transition_config_prev = TransitionsConfig.get_transition_config(state)
-                transition_type_prev = transition_config_prev["transition"]
-                if transition_type_prev == constant.PARTIAL_SLIDE_TRANSITION:
+                if state.transition_plan[state.current_page].transition == constant.PARTIAL_SLIDE_TRANSITION:
                     scroll_slide(images, 1, state)  # Scroll down
     elif event.type == pygame.MOUSEMOTION:
         if state.show_overview:
@@ -288,8 +273,7 @@ def handle_mouse(event, images, state):
             # Draw a highlight rectangle as the mouse is dragged
             x1, y1 = state.highlight_start
             x2, y2 = event.pos
-            highlight_rect = pygame.Rect(min(x1, x2), min(y1, y2), abs(x1 - x2), abs(y1 - y2))
-            state.current_highlights.append(highlight_rect)
+            state.highlight_rect = pygame.Rect(min(x1, x2), min(y1, y2), abs(x1 - x2), abs(y1 - y2))
         if state.zoom_level > 1:
             state.zoom_pos = event.pos  # Update zoom position
         if state.is_drawing_box and state.annotation_start:
@@ -308,18 +292,65 @@ def handle_mouse(event, images, state):
             state.is_entering_text = True  # Now enter text mode
         if event.button == 1 and state.dragging:
             state.dragging = False
-            state.text_annotations[state.current_page].append(
-                (state.annotation_rect, state.current_text))  # Save the dragged annotation
-            state.annotation_rect = None
-            state.current_text = ""
+            commit_text_annotation(images, state)  # Save the dragged annotation
         if event.button == 1 and state.is_drawing_pen and len(state.pen_points) > 1:
-            if state.current_page not in state.pen_annotations:
-                state.pen_annotations[state.current_page] = []
-            state.pen_annotations[state.current_page].append(state.pen_points)  # Save the pen stroke
-            state.pen_points = []
+            commit_pen_stroke(images, state)
         if event.button == 1 and state.highlight_mode and state.highlight_start:
             x1, y1 = state.highlight_start
             x2, y2 = event.pos
-            state.highlight_rect = pygame.Rect(min(x1, x2), min(y1, y2), abs(x1 - x2), abs(y1 - y2))
-            state.current_highlights.append(state.highlight_rect)  # Save the highlight rectangle
+            # Only the final rectangle of the drag is added to the highlighted regions
+            merge_highlight(state.current_highlights, pygame.Rect(min(x1, x2), min(y1, y2), abs(x1 - x2),
+                                                                  abs(y1 - y2)))
+            state.highlight_rect = None
             state.highlight_start = None
+
+
+def commit_pen_stroke(images, state):
+    """
+    Saves the pen stroke being drawn to the current slide, simplified, stored compactly and relative to the slide.
+    """
+    if state.current_page not in state.pen_annotations:
+        state.pen_annotations[state.current_page] = []
+    stroke = Stroke.from_points(state.pen_points).simplified(constant.PEN_SIMPLIFY_TOLERANCE)
+    transform = slide_transform(images, state.current_page, state.window_size)
+    stroke = transform.to_page_stroke(stroke)
+    state.pen_annotations[state.current_page].append(stroke)  # Save the pen stroke
+    annotations_edited(state, state.current_page)
+    if state.annotation_journal:
+        state.annotation_journal.add_stroke(state.current_page, stroke)
+    state.pen_points = []
+
+
+def commit_text_annotation(images, state):
+    """
+    Saves the text annotation being entered or moved to the current slide, relative to the slide.
+    """
+    if state.current_page not in state.text_annotations:
+        state.text_annotations[state.current_page] = []
+    rect = state.annotation_rect
+    if rect:
+        rect = slide_transform(images, state.current_page, state.window_size).to_page_rect(rect)
+    state.text_annotations[state.current_page].append((rect, state.current_text))
+    annotations_edited(state, state.current_page)
+    if state.annotation_journal:
+        state.annotation_journal.add_text(state.current_page, rect, state.current_text)
+    state.current_text = ""
+    state.annotation_rect = None
+
+
+def take_text_annotation(images, state, pos):
+    """
+    Takes the text annotation at the given screen position off the current slide to edit or move it.
+    Returns True if there was one.
+    """
+    transform = slide_transform(images, state.current_page, state.window_size)
+    for index, (rect, text) in enumerate(state.text_annotations.get(state.current_page, [])):
+        if rect and transform.to_screen_rect(rect).collidepoint(pos):
+            state.annotation_rect = transform.to_screen_rect(rect)
+            state.current_text = text
+            del state.text_annotations[state.current_page][index]
+            annotations_edited(state, state.current_page)
+            if state.annotation_journal:
+                state.annotation_journal.remove_text(state.current_page, index)
+            return True
+    return False
@@ -0,0 +1,17 @@
+import json
+import os
+import tempfile
+
+
+def write_json_atomic(path, data):
+    """
+    Writes a JSON file through a temporary file and a rename, so readers never see a partial file.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
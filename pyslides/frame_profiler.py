@@ -0,0 +1,167 @@
+import json
+import os
+import time
+
+from pyslides import constant
+
+PHASES = ("events", "slide", "transition", "overlay", "annotations", "chrome", "flip")  # Shown in this order
+
+
+class NullPhase:
+    """
+    The phase handed out while profiling is off: entering and leaving it does nothing.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class Phase:
+    """
+    Times one phase of a frame. Time spent in phases nested inside it is only counted for the nested phase.
+    """
+
+    __slots__ = ('profiler', 'name', 'start', 'resumed')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.resumed = now = time.perf_counter()
+        stack = self.profiler.stack
+        if stack:
+            stack[-1].pause(now)
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        now = time.perf_counter()
+        profiler = self.profiler
+        self.pause(now)
+        profiler.stack.pop()
+        if profiler.stack:
+            profiler.stack[-1].resumed = now
+        if profiler.trace is not None:
+            profiler.trace.append((self.name, self.start, now))
+        return False
+
+    def pause(self, now):
+        self.profiler.phase_times[self.name] += now - self.resumed
+
+
+class FrameProfiler:
+    """
+    Measures where the time of each frame goes: handling events, drawing the slide or the screen shown instead,
+    transitions, the spotlight and highlight overlays, annotations, the popups and pushing the frame to the
+    display.
+
+    The phases are shown in an on-screen HUD, averaged over the last half second, and can be written to a trace
+    file in the Chrome trace event format, which can be opened in chrome://tracing or https://ui.perfetto.dev.
+    While neither is on, ``phase`` hands out a shared no-op context manager and ``begin_frame`` and ``end_frame``
+    return right away, so the instrumentation costs next to nothing.
+    """
+
+    def __init__(self, refresh_interval=constant.FRAME_HUD_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.enabled = False
+        self.show_hud = False
+        self.trace = None  # (name, start, end) of every phase and frame while tracing, else None
+        self.trace_path = None
+        self.stack = []  # Phases being timed, innermost last
+        self.phase_times = dict.fromkeys(PHASES, 0.0)  # Seconds spent in each phase in the current frame
+        self.frame_start = None
+        self.window = []  # (frame time, phase times) of the frames drawn since the HUD was last refreshed
+        self.window_start = time.perf_counter()
+        self.summary = ()  # (label, value) rows shown in the HUD
+
+    def update_enabled(self):
+        self.enabled = self.show_hud or self.trace is not None
+
+    def toggle_hud(self):
+        """
+        Shows or hides the frame timing HUD.
+        """
+        self.show_hud = not self.show_hud
+        self.summary = ()
+        self.window = []
+        self.window_start = time.perf_counter()
+        self.update_enabled()
+
+    def start_trace(self, path):
+        """
+        Starts recording every frame and phase, to be written to path by ``stop_trace``.
+        """
+        self.trace = []
+        self.trace_path = path
+        self.update_enabled()
+
+    def stop_trace(self):
+        """
+        Writes the recorded frames and phases to the trace file and stops recording.
+        """
+        if self.trace is None:
+            return
+        pid = os.getpid()
+        events = [{"name": name, "cat": "frame" if name == "frame" else "phase", "ph": "X", "pid": pid, "tid": 1,
+                   "ts": round(start * 1e6, 3), "dur": round((end - start) * 1e6, 3)}
+                  for name, start, end in self.trace]
+        with open(self.trace_path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, separators=(',', ':'))
+        print(f"Wrote {len(events)} trace events to {self.trace_path}")
+        self.trace = None
+        self.update_enabled()
+
+    def phase(self, name):
+        """
+        Returns a context manager timing a phase of the current frame.
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+            self.phase_times = dict.fromkeys(PHASES, 0.0)
+
+    def end_frame(self, drawn=True):
+        """
+        Ends the current frame; frames in which nothing was drawn only appear in the trace.
+        """
+        if not self.enabled or self.frame_start is None:
+            return
+        now = time.perf_counter()
+        if self.trace is not None:
+            self.trace.append(("frame", self.frame_start, now))
+        if drawn:
+            self.window.append((now - self.frame_start, self.phase_times))
+        self.frame_start = None
+        if self.show_hud and now - self.window_start >= self.refresh_interval:
+            self.summary = self.summarize(self.window, now - self.window_start)
+            self.window = []
+            self.window_start = now
+
+    @staticmethod
+    def summarize(window, elapsed):
+        """
+        Returns the HUD rows for the frames drawn during elapsed seconds: the average frame time, the frame
+        rate and the average milliseconds of every phase.
+        """
+        count = max(1, len(window))
+        rows = [("frame", f"{sum(seconds for seconds, _ in window) / count * 1000:.2f} ms"),
+                ("fps", f"{len(window) / elapsed:.1f}")]
+        for name in PHASES:
+            rows.append((name, f"{sum(phases[name] for _, phases in window) / count * 1000:.2f} ms"))
+        return tuple(rows)
+
+
+profiler = FrameProfiler()  # Shared by the main loop, the display functions and the transitions
@@ -0,0 +1,107 @@
+import pygame
+
+from pyslides.slide_cache import surface_bytes, to_display_alpha_format
+
+DIM_COLOR = (0, 0, 0, 150)  # Semi-transparent black laid over everything outside the spotlight or highlights
+CLEAR_COLOR = (0, 0, 0, 0)  # Fully transparent holes
+
+
+def subtract_rect(rect, other):
+    """
+    Returns the parts of a rectangle not covered by another one, as up to four disjoint rectangles.
+    """
+    overlap = rect.clip(other)
+    if not overlap.width or not overlap.height:
+        return [rect]
+    pieces = [
+        pygame.Rect(rect.left, rect.top, rect.width, overlap.top - rect.top),  # Above
+        pygame.Rect(rect.left, overlap.bottom, rect.width, rect.bottom - overlap.bottom),  # Below
+        pygame.Rect(rect.left, overlap.top, overlap.left - rect.left, overlap.height),  # Left
+        pygame.Rect(overlap.right, overlap.top, rect.right - overlap.right, overlap.height),  # Right
+    ]
+    return [piece for piece in pieces if piece.width > 0 and piece.height > 0]
+
+
+def merge_highlight(regions, rect):
+    """
+    Adds a rectangle to the union of highlighted regions, kept as a list of disjoint rectangles, so an area is
+    never stored or drawn twice however often it is highlighted.
+    """
+    pieces = [pygame.Rect(rect)] if rect.width > 0 and rect.height > 0 else []
+    for region in regions:
+        pieces = [part for piece in pieces for part in subtract_rect(piece, region)]
+    regions.extend(pieces)
+
+
+class OverlayEngine:
+    """
+    Draws the spotlight and highlight overlays from one persistent dim layer.
+
+    The layer is a window-sized surface filled with the dim colour, with the spotlight circle or the highlighted
+    regions cut out as transparent holes. It is only created again when the window size changes; when the
+    spotlight moves or the highlights change, only the holes that disappeared are dimmed again and only the
+    new ones are cut out, so the cost of a frame does not depend on how much has been highlighted.
+    """
+
+    def __init__(self):
+        self.layer = None  # Dim layer for the current window size
+        self.holes = {}  # Hole description -> rect of the holes cut out of the layer
+
+    def prepare(self, window_size):
+        """
+        Returns the dim layer for the given window size, creating it when the size changed.
+        """
+        if self.layer is None or self.layer.get_size() != window_size:
+            self.layer = to_display_alpha_format(pygame.Surface(window_size, pygame.SRCALPHA))
+            self.layer.fill(DIM_COLOR)
+            self.holes = {}
+        return self.layer
+
+    def cut(self, holes, window_size):
+        """
+        Updates the holes of the dim layer, patching only the areas of the holes that changed.
+        Holes map a hashable description to a rect; descriptions starting with 'circle' are cut as the circle
+        inscribed in their rect.
+        """
+        layer = self.prepare(window_size)
+        removed = [rect for hole, rect in self.holes.items() if hole not in holes]
+        for rect in removed:
+            layer.fill(DIM_COLOR, rect)
+        for hole, rect in holes.items():
+            # Holes that overlap a dimmed area are cut again, so they survive the patch
+            if hole not in self.holes or rect.collidelist(removed) != -1:
+                if hole[0] == 'circle':
+                    pygame.draw.circle(layer, CLEAR_COLOR, rect.center, rect.width // 2)
+                else:
+                    layer.fill(CLEAR_COLOR, rect)
+        self.holes = holes
+        return layer
+
+    def reformat(self):
+        """
+        Converts the dim layer again, holes included, e.g. after the display pixel format changed.
+        """
+        if self.layer is not None:
+            self.layer = to_display_alpha_format(self.layer)
+
+    def stats(self):
+        """
+        Returns the bytes held by the dim layer and the number of holes cut out of it.
+        """
+        return {"layer_bytes": surface_bytes(self.layer) if self.layer else 0, "holes": len(self.holes)}
+
+    def draw_spotlight(self, screen, position, radius, window_size):
+        """
+        Dims everything but a circle of the given radius around the position.
+        """
+        circle = pygame.Rect(position[0] - radius, position[1] - radius, 2 * radius + 1, 2 * radius + 1)
+        screen.blit(self.cut({('circle', position, radius): circle}, window_size), (0, 0))
+
+    def draw_highlight(self, screen, regions, live_rect, window_size):
+        """
+        Dims everything but the highlighted regions and the rubber-band rectangle being dragged.
+        """
+        holes = {('rect', tuple(rect)): pygame.Rect(rect) for rect in regions}
+        if live_rect is not None:
+            holes[('live', tuple(live_rect))] = pygame.Rect(live_rect)
+        screen.blit(self.cut(holes, window_size), (0, 0))
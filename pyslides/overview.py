@@ -0,0 +1,247 @@
+import time
+
+import fitz  # PyMuPDF for PDF processing
+import pygame
+
+from pyslides import constant
+from pyslides.pdf_processor import samples_to_surface
+from pyslides.slide_cache import surface_bytes, to_display_format
+
+PLACEHOLDER_COLOR = (40, 40, 40)  # Shown in place of thumbnails that are not rendered yet
+FADE_ALPHA = 155  # Opacity of the black layer fading out the thumbnails that are not highlighted
+
+
+class ThumbnailAtlas:
+    """
+    Thumbnails of every page of a deck, rendered straight from the PDF at thumbnail resolution.
+
+    The thumbnails are packed into a few large sheets rather than one surface per page, and each page is only
+    rendered the first time it is needed. All thumbnails share the same size, so the atlas does not depend on
+    the window size and is reused when switching between windowed and fullscreen mode.
+    """
+
+    def __init__(self, pdf_path, thumbnail_width=constant.OVERVIEW_THUMBNAIL_WIDTH,
+                 sheet_size=constant.THUMBNAIL_ATLAS_SHEET_SIZE):
+        self.pdf_document = fitz.open(str(pdf_path))
+        self.page_count = len(self.pdf_document)
+        first_page = self.pdf_document.load_page(0).rect if self.page_count else fitz.Rect(0, 0, 4, 3)
+        self.thumbnail_size = (thumbnail_width, round(thumbnail_width * first_page.height / first_page.width))
+        self.sheet_size = sheet_size  # Thumbnails per row and column of a sheet
+        self.sheets = {}  # Sheet number -> Surface, allocated when its first thumbnail is rendered
+        self.rendered = [False] * self.page_count
+        self.version = 0  # Bumped whenever a thumbnail is rendered
+
+    def area(self, page_num):
+        """
+        Returns the sheet holding the thumbnail of a page and the thumbnail's rectangle within it.
+        """
+        sheet_num, index = divmod(page_num, self.sheet_size * self.sheet_size)
+        row, column = divmod(index, self.sheet_size)
+        width, height = self.thumbnail_size
+        return self.sheets.get(sheet_num), pygame.Rect(column * width, row * height, width, height)
+
+    def render(self, page_num):
+        """
+        Rasterizes the thumbnail of a page into its sheet, centred in its cell if the page has another aspect.
+        """
+        sheet_num = page_num // (self.sheet_size * self.sheet_size)
+        if sheet_num not in self.sheets:
+            width, height = self.thumbnail_size
+            self.sheets[sheet_num] = to_display_format(pygame.Surface((width * self.sheet_size,
+                                                                       height * self.sheet_size)))
+        sheet, cell = self.area(page_num)
+
+        page = self.pdf_document.load_page(page_num)
+        zoom_factor = min(cell.width / page.rect.width, cell.height / page.rect.height)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom_factor, zoom_factor), alpha=False)
+        thumbnail = samples_to_surface(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+        sheet.blit(thumbnail, thumbnail.get_rect(center=cell.center), (0, 0, cell.width, cell.height))
+        self.rendered[page_num] = True
+        self.version += 1
+
+    def reformat(self):
+        """
+        Converts the sheets again, e.g. after the display pixel format changed.
+        """
+        self.sheets = {sheet_num: to_display_format(sheet) for sheet_num, sheet in self.sheets.items()}
+        self.version += 1  # Frames composed from the old sheets are out of date
+
+    def stats(self):
+        """
+        Returns the number of rendered thumbnails and the bytes held by the sheets.
+        """
+        return {"thumbnails": sum(self.rendered), "sheets": len(self.sheets),
+                "sheet_bytes": sum(surface_bytes(sheet) for sheet in self.sheets.values())}
+
+    def render_missing(self, page_nums, frame_budget=constant.THUMBNAIL_FRAME_BUDGET):
+        """
+        Renders the missing thumbnails of the given pages in order, for as long as the frame budget allows.
+        """
+        deadline = time.perf_counter() + frame_budget
+        for page_num in page_nums:
+            if not self.rendered[page_num]:
+                self.render(page_num)
+                if time.perf_counter() >= deadline:
+                    break
+
+
+class OverviewGrid:
+    """
+    A scrollable grid of fixed-size slide thumbnails that only ever draws the rows in view.
+
+    The visible part of the grid is composed into a frame that is only redrawn when the scroll position, the
+    highlighted slide, the window size or the visible thumbnails change, so an idle overview costs a single
+    blit per frame. Positions map to pages arithmetically, without scanning the thumbnails.
+    """
+
+    def __init__(self, pdf_path, margin=constant.OVERVIEW_MARGIN):
+        self.pdf_path = pdf_path
+        self.margin = margin
+        self.atlas = None  # Created the first time the overview is shown
+        self.scroll = 0  # Vertical scroll position in pixels
+        self.frame = None  # Composed visible part of the grid
+        self.frame_key = None  # What the frame was composed from
+        self.pending = False  # Whether thumbnails in view are still missing
+
+    def load_atlas(self):
+        """
+        Returns the thumbnail atlas of the deck, creating it on first use.
+        """
+        if self.atlas is None:
+            self.atlas = ThumbnailAtlas(self.pdf_path)
+        return self.atlas
+
+    def layout(self, window_size):
+        """
+        Returns the number of columns, the cell size and the left edge of the grid for the window size.
+        """
+        width, height = self.load_atlas().thumbnail_size
+        cell_size = (width + self.margin, height + self.margin)
+        columns = max(1, (window_size[0] - self.margin) // cell_size[0])
+        left = (window_size[0] - columns * cell_size[0] + self.margin) // 2  # Centre the grid horizontally
+        return columns, cell_size, left
+
+    def max_scroll(self, window_size):
+        """
+        Returns the scroll position that shows the last row at the bottom of the window.
+        """
+        columns, (_, cell_height), _ = self.layout(window_size)
+        rows = -(-self.atlas.page_count // columns)
+        return max(0, rows * cell_height + self.margin - window_size[1])
+
+    def scroll_by(self, rows, window_size):
+        """
+        Scrolls the grid by the given number of rows.
+        """
+        _, (_, cell_height), _ = self.layout(window_size)
+        self.scroll = min(max(self.scroll + rows * cell_height, 0), self.max_scroll(window_size))
+
+    def scroll_to(self, page_num, window_size):
+        """
+        Scrolls the grid just enough to show the thumbnail of the given page.
+        """
+        columns, (_, cell_height), _ = self.layout(window_size)
+        top = self.margin + (page_num // columns) * cell_height
+        if top < self.scroll:
+            self.scroll = top - self.margin
+        elif top + cell_height > self.scroll + window_size[1]:
+            self.scroll = top + cell_height - window_size[1]
+        self.scroll = min(max(self.scroll, 0), self.max_scroll(window_size))
+
+    def thumbnail_position(self, page_num, window_size):
+        """
+        Returns the on-screen position of the thumbnail of a page at the current scroll position.
+        """
+        columns, (cell_width, cell_height), left = self.layout(window_size)
+        row, column = divmod(page_num, columns)
+        return left + column * cell_width, self.margin + row * cell_height - self.scroll
+
+    def visible_pages(self, window_size):
+        """
+        Returns the range of pages with a thumbnail at least partly in view.
+        """
+        columns, (_, cell_height), _ = self.layout(window_size)
+        first_row = max(0, (self.scroll - self.margin) // cell_height)
+        last_row = (self.scroll + window_size[1]) // cell_height
+        return range(first_row * columns, min((last_row + 1) * columns, self.atlas.page_count))
+
+    def page_at(self, pos, window_size):
+        """
+        Returns the page whose thumbnail is at the given screen position, or None.
+        """
+        columns, (cell_width, cell_height), left = self.layout(window_size)
+        column, x = divmod(pos[0] - left, cell_width)
+        row, y = divmod(pos[1] + self.scroll - self.margin, cell_height)
+        if not 0 <= column < columns or row < 0 or x >= cell_width - self.margin or y >= cell_height - self.margin:
+            return None  # Outside the grid, or on the margin between thumbnails
+        page_num = row * columns + column
+        return page_num if page_num < self.atlas.page_count else None
+
+    def draw(self, screen, highlighted_page, window_size):
+        """
+        Draws the visible thumbnails, with every thumbnail but the highlighted one faded out.
+        """
+        atlas = self.load_atlas()
+        self.scroll = min(self.scroll, self.max_scroll(window_size))  # The window may have grown
+        visible_pages = self.visible_pages(window_size)
+        # The highlighted thumbnail first, then the rest of the view from the top
+        atlas.render_missing([highlighted_page] * (highlighted_page in visible_pages) + list(visible_pages))
+        self.pending = not all(atlas.rendered[page_num] for page_num in visible_pages)
+
+        frame_key = (window_size, self.scroll, highlighted_page, atlas.version)
+        if self.frame is None or self.frame_key != frame_key:
+            self.compose(visible_pages, highlighted_page, window_size)
+            self.frame_key = frame_key
+        screen.blit(self.frame, (0, 0))
+
+    def compose(self, visible_pages, highlighted_page, window_size):
+        """
+        Redraws the frame holding the visible part of the grid.
+        """
+        if self.frame is None or self.frame.get_size() != window_size:
+            self.frame = to_display_format(pygame.Surface(window_size))
+        self.frame.fill((0, 0, 0))  # Clear the frame with black
+        for page_num in visible_pages:
+            self.draw_thumbnail(page_num, window_size)
+
+        # Fade out every thumbnail, then draw the highlighted one again on top
+        fade = pygame.Surface(window_size)
+        fade.set_alpha(FADE_ALPHA)
+        self.frame.blit(fade, (0, 0))
+        if highlighted_page in visible_pages:
+            self.draw_thumbnail(highlighted_page, window_size)
+
+        max_scroll = self.max_scroll(window_size)
+        if max_scroll:
+            # Show where the view is within the whole grid
+            bar_height = max(20, window_size[1] * window_size[1] // (max_scroll + window_size[1]))
+            bar_top = (window_size[1] - bar_height) * self.scroll // max_scroll
+            pygame.draw.rect(self.frame, (120, 120, 120), (window_size[0] - 6, bar_top, 4, bar_height))
+
+    def reformat(self):
+        """
+        Converts the thumbnail atlas again and drops the composed frame, e.g. after the display pixel format
+        changed.
+        """
+        if self.atlas is not None:
+            self.atlas.reformat()
+        self.frame = None
+
+    def draw_thumbnail(self, page_num, window_size):
+        """
+        Draws the thumbnail of a page onto the frame, or a placeholder while it is not rendered.
+        """
+        position = self.thumbnail_position(page_num, window_size)
+        sheet, area = self.atlas.area(page_num)
+        if self.atlas.rendered[page_num]:
+            self.frame.blit(sheet, position, area)
+        else:
+            self.frame.fill(PLACEHOLDER_COLOR, pygame.Rect(position, area.size))
+
+    def stats(self):
+        """
+        Returns the thumbnail atlas statistics and the bytes held by the thumbnails and the composed frame.
+        """
+        stats = self.atlas.stats() if self.atlas else {"thumbnails": 0, "sheets": 0, "sheet_bytes": 0}
+        stats["frame_bytes"] = surface_bytes(self.frame) if self.frame else 0
+        return stats
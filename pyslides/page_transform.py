@@ -0,0 +1,72 @@
+import functools
+
+import pygame
+
+
+class PageTransform:
+    """
+    Maps page-normalized coordinates, where (0, 0) is the top left and (1, 1) the bottom right corner of a
+    slide, to screen pixels of the slide as it is shown, and back.
+
+    Annotations are stored in page-normalized coordinates, so they never have to be rewritten when the slides
+    are shown at another size: they are only mapped to the screen when they are drawn or hit-tested.
+    """
+
+    def __init__(self, slide_rect):
+        self.slide_rect = pygame.Rect(slide_rect)
+        self.left, self.top, self.width, self.height = self.slide_rect
+
+    def to_screen_point(self, point):
+        """
+        Returns the screen pixel of a page-normalized point.
+        """
+        return round(self.left + point[0] * self.width), round(self.top + point[1] * self.height)
+
+    def to_page_point(self, point):
+        """
+        Returns the page-normalized coordinates of a screen pixel.
+        """
+        return (point[0] - self.left) / self.width, (point[1] - self.top) / self.height
+
+    def to_screen_rect(self, rect):
+        """
+        Returns the screen rect of a page-normalized (x, y, width, height) rectangle.
+        """
+        left, top = self.to_screen_point(rect)
+        return pygame.Rect(left, top, round(rect[2] * self.width), round(rect[3] * self.height))
+
+    def to_page_rect(self, rect):
+        """
+        Returns the page-normalized (x, y, width, height) of a screen rect.
+        """
+        rect = pygame.Rect(rect)
+        return (*self.to_page_point(rect.topleft), rect.width / self.width, rect.height / self.height)
+
+    def to_screen_stroke(self, stroke):
+        """
+        Returns a page-normalized stroke in screen pixels.
+        """
+        return stroke.transformed(self.width, self.height, self.left, self.top, rounded=True)
+
+    def to_page_stroke(self, stroke):
+        """
+        Returns a stroke drawn in screen pixels in page-normalized coordinates.
+        """
+        return stroke.transformed(1 / self.width, 1 / self.height, -self.left / self.width, -self.top / self.height)
+
+
+@functools.lru_cache(maxsize=64)
+def page_transform(window_size, slide_size):
+    """
+    Returns the transform of a slide of the given size centred in a window of the given size, placed exactly as
+    ``display_slide`` places it. Transforms are cached, so every slide size is only set up once per window size.
+    """
+    return PageTransform(pygame.Rect((0, 0), slide_size).move(window_size[0] // 2 - slide_size[0] // 2,
+                                                               window_size[1] // 2 - slide_size[1] // 2))
+
+
+def slide_transform(images, page_num, window_size):
+    """
+    Returns the transform of a slide as it is currently shown.
+    """
+    return page_transform(window_size, images[page_num].get_size())
@@ -1,41 +1,87 @@
-import os
 import fitz  # PyMuPDF for PDF processing
 import pygame
 
+HIGH_RES_FACTOR = 2.0  # Scale factor for higher resolution images
+EXACT_RES_FACTOR = 1.0  # Scale factor for slides rendered pixel for pixel at their size on screen
+PREVIEW_RES_FACTOR = 0.5  # Scale factor for the quick low-resolution previews of slow pages
 
-def convert_pdf_to_images(pdf_path, output_folder, window_size):
+worker_document = None  # PDF opened by a render worker process, see open_worker_document
+
+
+def page_zoom_factor(page_rect, window_size, render_scale=HIGH_RES_FACTOR):
     """
-    Converts a PDF document into a series of images, one for each page.
+    Returns the zoom factor used to rasterize a page of the given size for the given window.
     """
-    pdf_document = fitz.open(pdf_path)  # Open the PDF file
     screen_width, screen_height = window_size
-    high_res_factor = 2.0  # Scale factor for higher resolution images
-    images = []
+    return min(screen_width / page_rect.width, screen_height / page_rect.height) * render_scale
+
+
+def render_page_pixmap(page, window_size, render_scale=HIGH_RES_FACTOR):
+    """
+    Rasterizes a single PDF page to a high-resolution RGB pixmap sized for the given window.
+    """
+    zoom_factor = page_zoom_factor(page.rect, window_size, render_scale)
+    return page.get_pixmap(matrix=fitz.Matrix(zoom_factor, zoom_factor))  # Create a high-resolution pixmap
+
+
+def slide_size(page_rect, window_size, render_scale=EXACT_RES_FACTOR):
+    """
+    Returns the size a page will have on screen once rendered for the window at the given render scale and
+    scaled to fit the window.
+    """
+    zoom_factor = page_zoom_factor(page_rect, window_size, render_scale)
+    pixmap_rect = (page_rect * fitz.Matrix(zoom_factor, zoom_factor)).irect  # Same rounding as get_pixmap
+    if render_scale == EXACT_RES_FACTOR:
+        return pixmap_rect.width, pixmap_rect.height  # Shown as rendered, without scaling
+    return fit_size((pixmap_rect.width, pixmap_rect.height), window_size)
+
+
+def samples_to_surface(samples, width, height, channels, stride):
+    """
+    Builds a pygame Surface that shares the given RGB or RGBA sample buffer.
+    """
+    pixel_format = "RGBA" if channels == 4 else "RGB"
+    if stride != width * channels:
+        # pygame expects tightly packed rows, so padded rows have to be repacked first
+        samples = b"".join(bytes(samples[row * stride:row * stride + width * channels]) for row in range(height))
+    return pygame.image.frombuffer(samples, (width, height), pixel_format)
+
 
-    total_pages = len(pdf_document)  # Get the total number of pages in the PDF
+def render_page_samples(page, window_size, render_scale=HIGH_RES_FACTOR):
+    """
+    Renders a single page and returns its raw samples as (width, height, channels, stride, bytes).
+    """
+    pix = render_page_pixmap(page, window_size, render_scale)
+    return pix.width, pix.height, pix.n, pix.stride, pix.samples
 
-    # Iterate through each page of the PDF and save as an image
-    for page_num in range(total_pages):
-        page = pdf_document.load_page(page_num)  # Load the current page
-        zoom_factor = min(screen_width / page.rect.width, screen_height / page.rect.height) * high_res_factor
-        pix = page.get_pixmap(matrix=fitz.Matrix(zoom_factor, zoom_factor))  # Create a high-resolution pixmap
-        image_path = os.path.join(output_folder, f"page_{page_num}.png")  # Define the image path
-        pix.save(image_path)  # Save the pixmap as a PNG image
-        images.append(image_path)  # Add the image path to the list of images
 
-        # Update the progress in the terminal
-        print(f"\rLoading slides: {page_num + 1}/{total_pages} processed", end="")
+def open_worker_document(pdf_path):
+    """
+    Initializer of a render worker process: opens the PDF once, for every page the worker renders.
+    """
+    global worker_document
+    worker_document = fitz.open(pdf_path)
+
 
-    print(f"\rLoading completed. {total_pages}/{total_pages} processed.               ")  # Clear the line after
-    # completion
-    return images
+def render_worker_page_samples(page_num, window_size, render_scale=HIGH_RES_FACTOR):
+    """
+    Renders a page of the PDF opened by ``open_worker_document`` and returns its raw samples, ready to be
+    wrapped in a surface by the parent process.
+    """
+    return render_page_samples(worker_document.load_page(page_num), window_size, render_scale)
+
+
+def fit_size(size, window_size):
+    """
+    Returns the largest size with the aspect ratio of the given size that fits within the window size.
+    """
+    scale_factor = min(window_size[0] / size[0], window_size[1] / size[1])
+    return int(size[0] * scale_factor), int(size[1] * scale_factor)
 
 
 def scale_image_to_fit(image, window_size):
     """
     Scales an image to fit within the given window size while maintaining its aspect ratio.
     """
-    # Calculate the scale factor to fit the image within the window size
-    scale_factor = min(window_size[0] / image.get_width(), window_size[1] / image.get_height())
-    new_size = (int(image.get_width() * scale_factor), int(image.get_height() * scale_factor))
+    new_size = fit_size(image.get_size(), window_size)  # Fit the image within the window size
     return pygame.transform.scale(image, new_size)  # Return the scaled image
@@ -0,0 +1,117 @@
+import mmap
+import os
+import struct
+import tempfile
+
+import pygame
+
+MAGIC = b'PYSLPIX1'  # Identifies a pyslides pixel store file
+HEADER = struct.Struct('<8sI')  # Magic, page count
+PAGE_ENTRY = struct.Struct('<QIII')  # Data offset, width, height, stride of a page
+ALIGNMENT = 4096  # Page data starts on memory page boundaries
+PIXEL_FORMAT = 'RGB'
+BYTES_PER_PIXEL = 3
+
+
+class PixelStore:
+    """
+    A single memory-mapped file holding the decoded RGB pixels of every slide of a deck at one size.
+
+    Slides are stored as fixed-stride raw RGB rows after a small header and a page table. Surfaces are created
+    on demand straight on top of the mapping, so opening a store costs no decoding and the operating system
+    only pages in the slides that are actually drawn.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            # A private copy-on-write mapping gives pygame a writable buffer without ever touching the file
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, page_count = HEADER.unpack_from(self.mapping, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a pyslides pixel store")
+        self.pages = [PAGE_ENTRY.unpack_from(self.mapping, HEADER.size + i * PAGE_ENTRY.size)
+                      for i in range(page_count)]
+        self.buffer = memoryview(self.mapping)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __getitem__(self, page_num):
+        """
+        Creates a Surface that shares the mapped pixels of the given page.
+        """
+        offset, width, height, stride = self.pages[page_num]
+        return pygame.image.frombuffer(self.buffer[offset:offset + height * stride], (width, height), PIXEL_FORMAT)
+
+    def page_sizes(self):
+        """
+        Returns the (width, height) of every stored slide.
+        """
+        return [(width, height) for _, width, height, _ in self.pages]
+
+
+class PixelStoreWriter:
+    """
+    Writes a new pixel store page by page, in any order. The page sizes are known up front, so the page table is
+    written first and each page goes straight to its final offset as soon as it is rendered. The file is written
+    under a temporary name and only renamed into place by ``commit``, so a store that exists is always complete.
+    """
+
+    def __init__(self, path, page_sizes):
+        self.path = path
+        self.entries = []
+        offset = _align(HEADER.size + len(page_sizes) * PAGE_ENTRY.size)
+        for width, height in page_sizes:
+            self.entries.append((offset, width, height, width * BYTES_PER_PIXEL))
+            offset = _align(offset + height * width * BYTES_PER_PIXEL)
+        self.written = [False] * len(page_sizes)
+        self.aborted = False
+
+        fd, self.temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        self.file = os.fdopen(fd, 'wb')
+        self.file.write(HEADER.pack(MAGIC, len(page_sizes)))
+        for entry in self.entries:
+            self.file.write(PAGE_ENTRY.pack(*entry))
+        self.file.truncate(offset)  # Reserve the space of every page
+
+    def write_page(self, page_num, pixels):
+        """
+        Writes the tightly packed RGB pixels of a page.
+        """
+        offset, width, height, stride = self.entries[page_num]
+        if len(pixels) != height * stride:
+            raise ValueError(f"Expected {height * stride} bytes for slide {page_num}, got {len(pixels)}")
+        self.file.seek(offset)
+        self.file.write(pixels)
+        self.written[page_num] = True
+
+    def is_complete(self):
+        """
+        Returns True once every page has been written.
+        """
+        return all(self.written)
+
+    def commit(self):
+        """
+        Moves the completed store into place.
+        """
+        if not self.is_complete():
+            raise ValueError("Cannot commit a pixel store with missing slides")
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """
+        Discards the partially written store.
+        """
+        self.aborted = True
+        self.file.close()
+        os.unlink(self.temp_path)
+
+
+def _align(offset):
+    """
+    Rounds an offset up to the next multiple of the alignment.
+    """
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,145 @@
+import contextlib
+import hashlib
+import json
+import os
+
+try:
+    import fcntl  # POSIX file locking
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from pyslides import constant
+from pyslides.file_utils import write_json_atomic
+from pyslides.pdf_processor import EXACT_RES_FACTOR
+from pyslides.pixel_store import PixelStore, PixelStoreWriter
+
+MANIFEST_VERSION = 2
+
+
+@contextlib.contextmanager
+def file_lock(lock_path, exclusive=True):
+    """
+    Holds an advisory lock on the given lock file for the duration of the block, so that several pyslides
+    instances can share the cache safely.
+    """
+    with open(lock_path, 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)  # msvcrt only offers exclusive locks
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """
+    Computes the SHA-256 digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    A persistent render cache keyed by PDF content hash, target size and render scale.
+
+    Each deck gets its own folder named after its content hash, holding one pixel store per rendered variant
+    (target size and render scale) and a manifest listing the complete variants.
+    """
+
+    MANIFEST_FILE = 'manifest.json'
+    MANIFEST_LOCK_FILE = 'manifest.lock'
+
+    def __init__(self, pdf_path, cache_dir=constant.RENDER_CACHE_DIR):
+        self.pdf_path = pdf_path
+        self.pdf_hash = hash_file(pdf_path)  # Content address of the deck
+        self.deck_folder = os.path.join(cache_dir, self.pdf_hash)
+        os.makedirs(self.deck_folder, exist_ok=True)
+
+    @staticmethod
+    def variant_key(window_size, render_scale=EXACT_RES_FACTOR):
+        """
+        Returns the manifest key of a rendered variant, e.g. '794x1123@1'.
+        """
+        return f"{window_size[0]}x{window_size[1]}@{render_scale:g}"
+
+    def manifest_path(self):
+        """
+        Returns the path of the deck manifest.
+        """
+        return os.path.join(self.deck_folder, RenderCache.MANIFEST_FILE)
+
+    def pixel_store_path(self, window_size):
+        """
+        Returns the path of the pixel store holding the slides rendered for the given window size.
+        """
+        return os.path.join(self.deck_folder, f'{RenderCache.variant_key(window_size)}.pixels')
+
+    def read_manifest(self):
+        """
+        Reads the deck manifest. The manifest is only ever replaced atomically, so no lock is needed to read it.
+        """
+        try:
+            with open(self.manifest_path(), 'r') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("pdf_hash") != self.pdf_hash:
+            manifest = {"version": MANIFEST_VERSION, "pdf_hash": self.pdf_hash, "page_count": None,
+                        "pixel_stores": {}}
+        return manifest
+
+    def open_pixel_store(self, window_size):
+        """
+        Returns the pixel store of the slides rendered for the given window size, or None if it is not cached.
+        A warm start only reads the manifest and maps the store; it never opens the PDF.
+        """
+        manifest = self.read_manifest()
+        if RenderCache.variant_key(window_size) not in manifest["pixel_stores"]:
+            return None
+        try:
+            store = PixelStore(self.pixel_store_path(window_size))
+        except (FileNotFoundError, ValueError):
+            return None  # Removed or damaged behind the manifest's back
+        return store if len(store) == manifest["page_count"] else None
+
+    def create_pixel_store_writer(self, window_size, page_sizes):
+        """
+        Starts writing the pixel store for the given window size. The store only becomes visible to other
+        instances once ``commit_pixel_store`` has been called with the completed writer.
+        """
+        return PixelStoreWriter(self.pixel_store_path(window_size), page_sizes)
+
+    def commit_pixel_store(self, window_size, writer):
+        """
+        Moves a completely written pixel store into place and records it in the manifest.
+        """
+        writer.commit()  # Atomic, so instances rendering the same size concurrently simply replace each other's store
+        with file_lock(os.path.join(self.deck_folder, RenderCache.MANIFEST_LOCK_FILE)):
+            manifest = self.read_manifest()
+            manifest["page_count"] = len(writer.entries)
+            manifest["source"] = os.path.basename(self.pdf_path)
+            manifest["pixel_stores"][RenderCache.variant_key(window_size)] = os.path.basename(writer.path)
+            write_json_atomic(self.manifest_path(), manifest)
+
+    def stats(self):
+        """
+        Returns the bytes the deck takes up on disk and the number of window sizes it is cached at.
+        """
+        disk_bytes = 0
+        with os.scandir(self.deck_folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    disk_bytes += entry.stat().st_size
+        return {"disk_bytes": disk_bytes, "pixel_stores": len(self.read_manifest()["pixel_stores"])}
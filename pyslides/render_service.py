@@ -0,0 +1,390 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF for PDF processing
+import pygame
+
+from pyslides import constant
+from pyslides.pdf_processor import EXACT_RES_FACTOR, PREVIEW_RES_FACTOR, open_worker_document, \
+    render_page_samples, render_worker_page_samples, samples_to_surface, slide_size
+from pyslides.slide_cache import SlideCache, surface_bytes, to_display_format
+
+
+def create_placeholder(size, font):
+    """
+    Creates the surface shown in place of a slide that has not been rendered yet.
+    """
+    placeholder = pygame.Surface(size)
+    placeholder.fill((40, 40, 40))  # Dark gray background
+    text = font.render("Loading slide...", True, (160, 160, 160))
+    placeholder.blit(text, text.get_rect(center=(size[0] // 2, size[1] // 2)))
+    return placeholder
+
+
+class RenderService:
+    """
+    Renders the slides of a PDF in a background thread so the presentation can start before every page is ready.
+
+    Pages are rasterized from the PDF at exactly their size on screen, closest-first around the focused page:
+    the focused page, then its neighbours, then the rest of the deck. Rendered pages are put into the ``images``
+    slide cache as they come in; until then the cache returns placeholders. Pages evicted from the cache are
+    queued for rendering again, unless the deck has been saved to the render cache, in which case they are
+    reloaded from its pixel store.
+
+    Rendering is progressive: when the focused page is not ready, a quick low-resolution preview of it is
+    rendered first and shown at the final slide size, then swapped for the full-quality render.
+
+    When the window size changes the deck is re-rendered for the new size the same way. With a render cache,
+    every size the deck was completely rendered at (e.g. windowed and fullscreen) is kept in its own pixel
+    store, so switching back to it is served straight from the store without opening the PDF.
+    """
+
+    def __init__(self, pdf_path, window_size, workers=1, render_cache=None, budget=constant.SLIDE_CACHE_BUDGET,
+                 on_update=None):
+        self.pdf_path = str(pdf_path)
+        self.on_update = on_update  # Called from the render thread whenever a slide in the cache was replaced
+        self.workers = workers
+        self.render_cache = render_cache  # When set, rendered pages are also saved to the persistent cache
+        self.font = pygame.font.Font(None, 36)
+
+        self.page_rects = None  # Page rectangles, only read from the PDF once a size has to be rendered
+        self.store = None  # Pixel store serving the current window size, when it was found in the render cache
+        self.writer = None  # Pixel store being filled with the pages rendered for the current window size
+        self.images = SlideCache(0, self.load, budget, placeholder=self.placeholder, prepare=to_display_format)
+        self.warm_budget = self.images.warm_budget
+        self.placeholders = []  # Placeholder surface of each page
+        self.condition = threading.Condition()  # Always acquired after the slide cache lock
+        self.write_lock = threading.Lock()  # Held while writing to the pixel store writer; acquired last
+        self.focus_page = 0
+        self.generation = 0  # Bumped on every restart so results for a previous window size are dropped
+        self.running = False
+        self.thread = None
+        self.rendered = 0  # Pages rasterized from the PDF at full quality
+        self.previews = 0  # Low-resolution previews rasterized from the PDF
+        self.loaded = 0  # Pages loaded from a pixel store of the render cache
+        self.reset(window_size)
+
+    def reset(self, window_size):
+        """
+        Shows the slides for the given window size: straight from the render cache when they are stored there,
+        otherwise by queueing every page for rendering and showing placeholders until they are ready.
+        """
+        self.window_size = window_size
+        self.previewed = set()  # Pages showing a low-resolution preview
+        self.abort_writer()  # Rendered for a previous window size
+
+        self.store = self.render_cache.open_pixel_store(window_size) if self.render_cache is not None else None
+        if self.store is not None:
+            # Nothing to render; the slides come straight from the mapped store, never from the PDF
+            self.pending = set()
+            self.ready = [True] * len(self.store)
+            self.images.warm_budget = 0  # Reloading from the store is cheaper than keeping compressed copies
+            self.images.reset(self.load_stored, len(self.store))
+            return
+
+        if self.page_rects is None:
+            with fitz.open(self.pdf_path) as pdf_document:
+                self.page_rects = [pdf_document.load_page(page_num).rect for page_num in range(len(pdf_document))]
+        self.pending = set(range(len(self.page_rects)))  # Pages still to be rendered
+        self.ready = [False] * len(self.page_rects)
+        placeholders = {}  # One shared placeholder per slide size
+        sizes = [slide_size(page_rect, window_size) for page_rect in self.page_rects]
+        for size in sizes:
+            if size not in placeholders:
+                placeholders[size] = create_placeholder(size, self.font)
+        self.placeholders = [placeholders[size] for size in sizes]
+        if self.render_cache is not None:
+            self.writer = self.render_cache.create_pixel_store_writer(window_size, sizes)
+        self.images.warm_budget = self.warm_budget
+        self.images.reset(self.load, len(self.page_rects))
+
+    def start(self):
+        """
+        Starts the background render thread.
+        """
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="pyslides-render", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the background render thread.
+        """
+        with self.condition:
+            self.running = False
+            self.abort_writer()  # Incomplete stores are never kept
+            self.condition.notify_all()
+
+    def abort_writer(self):
+        """
+        Discards the pixel store being written, waiting for a page being written to it.
+        """
+        if self.writer is not None:
+            with self.write_lock:
+                self.writer.abort()
+            self.writer = None
+
+    def restart(self, window_size):
+        """
+        Shows the slides for a new window size, re-rendering them from the PDF starting from the focused page
+        unless they are in the render cache. Until the focused page is rendered, its slide at the previous size
+        is scaled to the new size and shown as a preview.
+        """
+        with self.images.lock, self.condition:
+            if window_size == self.window_size:
+                return
+            previous = self.images.hot.get(self.focus_page)
+            self.generation += 1
+            self.reset(window_size)
+            if previous is not None and self.focus_page in self.pending:
+                self.previewed.add(self.focus_page)
+                size = self.placeholders[self.focus_page].get_size()
+                self.images[self.focus_page] = pygame.transform.smoothscale(previous, size)
+            self.condition.notify_all()
+
+    def focus(self, page_num):
+        """
+        Moves the given page, then its neighbours, to the front of the render queue.
+        """
+        if page_num != self.focus_page:
+            with self.condition:
+                self.focus_page = page_num
+                self.condition.notify_all()
+
+    def placeholder(self, page_num):
+        """
+        Returns the placeholder shown while the given page is not rendered.
+        """
+        return self.placeholders[page_num]
+
+    def load(self, page_num):
+        """
+        Cold tier of the slide cache: queues a page that was evicted from the cache for rendering again.
+        The placeholder is shown until it is ready.
+        """
+        with self.condition:
+            if self.ready[page_num]:
+                self.ready[page_num] = False
+                self.pending.add(page_num)
+                self.condition.notify_all()
+        return None
+
+    def load_stored(self, page_num):
+        """
+        Cold tier of the slide cache once the deck is in the render cache: loads a page from the pixel store.
+        """
+        self.loaded += 1
+        return self.store[page_num]
+
+    def wait_until_rendered(self, timeout=None):
+        """
+        Blocks until every page is rendered at the current window size, e.g. so that a replay always starts
+        from the same slides. Returns False if the timeout (in seconds) expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while not all(self.ready):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def is_ready(self, page_num):
+        """
+        Returns True if the given page has been rendered at the current window size.
+        """
+        return self.ready[page_num]
+
+    def next_page(self):
+        """
+        Takes the pending page closest to the focused page off the queue, preferring pages after it.
+        Must be called with the condition held.
+        """
+        page_num = min(self.pending, key=lambda page: (abs(page - self.focus_page), page < self.focus_page))
+        self.pending.discard(page_num)
+        return page_num
+
+    def next_preview(self):
+        """
+        Returns the focused page if it still needs a low-resolution preview, or None.
+        Must be called with the condition held.
+        """
+        page_num = self.focus_page
+        if page_num in self.pending and page_num not in self.previewed:
+            self.previewed.add(page_num)
+            return page_num
+        return None
+
+    def run(self):
+        """
+        Render loop of the background thread. Pages are rendered in this thread, or spread over a process pool
+        when more than one worker is configured; each worker opens the PDF once and renders every page it is
+        given from it. The PDF and the pool are only opened once there is something to render, so a deck
+        served from the render cache never touches them. A page a worker failed to render is rendered again
+        in this thread.
+        """
+        pdf_document = None
+        executor = None
+        in_flight = {}  # Future -> (page number, generation, window size)
+
+        while True:
+            with self.condition:
+                while self.running and not self.pending and not in_flight:
+                    self.condition.wait()
+                if not self.running:
+                    break
+                preview_page = self.next_preview()
+                generation, window_size = self.generation, self.window_size
+
+            if pdf_document is None:
+                pdf_document = fitz.open(self.pdf_path)
+            if executor is None and self.workers > 1:
+                # 'spawn' keeps the workers clear of the SDL state already initialized in the parent process
+                executor = ProcessPoolExecutor(max_workers=self.workers,
+                                               mp_context=multiprocessing.get_context("spawn"),
+                                               initializer=open_worker_document, initargs=(self.pdf_path,))
+
+            if preview_page is not None:
+                # Show something sharp enough right away; the full render follows
+                try:
+                    samples = render_page_samples(pdf_document.load_page(preview_page), window_size,
+                                                  render_scale=PREVIEW_RES_FACTOR)
+                except Exception:
+                    samples = None  # Reported when the full render fails as well
+                if samples is not None:
+                    self.deliver_preview(preview_page, generation, window_size, samples)
+
+            with self.condition:
+                jobs = []
+                while self.pending and len(in_flight) + len(jobs) < max(self.workers, 1):
+                    jobs.append((self.next_page(), self.generation, self.window_size))
+                    if executor is None:
+                        break  # Render one page at a time in this thread so focus changes apply quickly
+
+            if executor is None:
+                for page_num, generation, window_size in jobs:
+                    self.render_here(pdf_document, page_num, generation, window_size)
+                continue
+
+            for page_num, generation, window_size in jobs:
+                future = executor.submit(render_worker_page_samples, page_num, window_size, EXACT_RES_FACTOR)
+                in_flight[future] = (page_num, generation, window_size)
+            done, _ = wait(list(in_flight), timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future not in in_flight:
+                    continue  # Queued again when the pool broke
+                page_num, generation, window_size = in_flight.pop(future)
+                try:
+                    samples = future.result()
+                except Exception as error:
+                    if isinstance(error, BrokenProcessPool) and executor is not None:
+                        # A worker died; render every remaining page in this thread from now on
+                        print(f"Error: render workers failed, rendering in a single process: {error}")
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor, self.workers = None, 1
+                        with self.condition:
+                            for other_page, other_generation, _ in in_flight.values():
+                                if other_generation == self.generation:
+                                    self.pending.add(other_page)  # Lost with the pool
+                        in_flight.clear()
+                    self.render_here(pdf_document, page_num, generation, window_size)
+                    continue
+                self.deliver(page_num, generation, window_size, samples)
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if pdf_document is not None:
+            pdf_document.close()
+
+    def render_here(self, pdf_document, page_num, generation, window_size):
+        """
+        Renders a page in the render thread. A page that cannot be rendered is reported and marked ready, so
+        its placeholder stays and waiting for the deck to be rendered does not hang.
+        """
+        try:
+            samples = render_page_samples(pdf_document.load_page(page_num), window_size, EXACT_RES_FACTOR)
+        except Exception as error:
+            print(f"Error: slide {page_num + 1} could not be rendered: {error}")
+            with self.condition:
+                if generation == self.generation:
+                    self.ready[page_num] = True
+                    self.condition.notify_all()
+            return
+        self.deliver(page_num, generation, window_size, samples)
+
+    def deliver_preview(self, page_num, generation, window_size, samples):
+        """
+        Shows a low-resolution preview of a page, scaled to the final slide size so the layout does not jump
+        when the full-quality render replaces it.
+        """
+        width, height, channels, stride, data = samples
+        size = slide_size(self.page_rects[page_num], window_size)
+        image = pygame.transform.smoothscale(samples_to_surface(data, width, height, channels, stride), size)
+        self.previews += 1
+        with self.images.lock:
+            with self.condition:
+                if generation != self.generation or self.ready[page_num]:
+                    return  # Outdated, or the full-quality render won the race
+            self.images[page_num] = image
+        if self.on_update:
+            self.on_update()
+
+    def deliver(self, page_num, generation, window_size, samples):
+        """
+        Swaps a rendered page in for its placeholder, unless the window size changed in the meantime.
+        """
+        width, height, channels, stride, data = samples
+        image = samples_to_surface(data, width, height, channels, stride)
+        size = self.placeholders[page_num].get_size()
+        if image.get_size() != size:
+            image = pygame.transform.smoothscale(image, size)  # Only when the page size rounds differently
+        self.rendered += 1
+        with self.condition:
+            if generation != self.generation:
+                return  # Rendered for a previous window size
+            writer = self.writer
+        if writer is not None:
+            # Written without the slide cache lock, which the drawing thread needs every frame
+            pixels = pygame.image.tobytes(image, 'RGB')
+            with self.write_lock:
+                if not writer.aborted:  # Unless the window size changed in the meantime
+                    writer.write_page(page_num, pixels)
+
+        with self.images.lock:
+            with self.condition:
+                if generation != self.generation:
+                    return  # Rendered for a previous window size
+                self.ready[page_num] = True
+                self.condition.notify_all()  # Wakes wait_until_rendered
+                completed = None
+                if writer is not None and self.writer is writer and writer.is_complete():
+                    completed, self.writer = writer, None
+            self.images[page_num] = image
+        if self.on_update:
+            self.on_update()
+
+        if completed is not None:
+            # Record the finished deck so the next start, or the next switch to this size, is served from the cache
+            self.render_cache.commit_pixel_store(window_size, completed)
+            store = self.render_cache.open_pixel_store(window_size)
+            with self.images.lock, self.condition:
+                if generation == self.generation and store is not None:
+                    self.store = store
+                    self.images.loader = self.load_stored  # Evicted pages now come back from the pixel store
+
+    def stats(self):
+        """
+        Returns how many pages were rendered from the PDF and loaded from the render cache, the pages still to
+        be rendered and the bytes held by placeholders.
+        """
+        with self.condition:
+            pending = len(self.pending)
+            ready = sum(self.ready)
+        placeholders = {id(placeholder): placeholder for placeholder in self.placeholders}  # Shared per size
+        return {"rendered": self.rendered, "previews": self.previews, "loaded_from_cache": self.loaded,
+                "ready": ready, "pending": pending,
+                "placeholder_bytes": sum(surface_bytes(surface) for surface in placeholders.values())}
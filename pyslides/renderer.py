@@ -0,0 +1,215 @@
+import time
+
+import pygame
+
+from pyslides import constant
+from pyslides.annotations import stroke_rect
+from pyslides.display import draw_frame, frame_hud_rect, initial_help_popup_rect
+from pyslides.frame_profiler import profiler
+from pyslides.page_transform import slide_transform
+
+
+def post_slide_updated():
+    """
+    Wakes up the main loop after a slide was rendered in the background. Safe to call from any thread.
+    """
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(constant.SLIDE_UPDATED_EVENT))
+
+
+class Renderer:
+    """
+    Draws frames only when something on screen changed, and only pushes the changed parts to the display.
+
+    The screen is described as a stack of layers: the slide (or the help, overview or end screen shown instead),
+    the spotlight or highlight overlay, the annotations and the popup chrome. For every layer the renderer keeps
+    the items it was last drawn with and where they are on screen. A frame is only drawn when an item changed,
+    clipped to the areas of the items that appeared or disappeared, and only those areas are pushed with
+    ``pygame.display.update``. In between, the main loop sleeps in ``wait_for_events`` until there is input,
+    a timer is due or a slide was rendered in the background.
+
+    In continuous mode every frame is drawn and flipped in full, as fast as the main loop runs.
+    """
+
+    def __init__(self, images, state, continuous=False):
+        self.images = images
+        self.state = state
+        self.continuous = continuous
+        self.layers = None  # Layer name -> (kind, {item: screen rect}) of the frame on screen; None forces a redraw
+        self.frames = 0  # Frames drawn
+        self.skipped = 0  # Loop iterations that did not need a new frame
+        self.pixels = 0  # Pixels pushed to the display
+
+    def animating(self):
+        """
+        Returns True while frames have to be drawn without waiting for input, e.g. while zoom tiles or overview
+        thumbnails are still being rendered.
+        """
+        state = self.state
+        if state.zoom_level > 1 and not state.show_overview and state.zoom_engine.pending:
+            return True
+        return state.show_overview and state.overview.pending
+
+    def wait_for_events(self, deadlines):
+        """
+        Returns the pending events, sleeping until the first event arrives or the earliest deadline (a
+        time.time() value) is due when there is nothing to draw.
+        """
+        if self.continuous or self.layers is None or self.animating():
+            events = pygame.event.get()
+        else:
+            timeout = min(deadlines) - time.time() if deadlines else None
+            if timeout is not None and timeout <= 0:
+                events = pygame.event.get()
+            else:
+                # pygame waits forever for a timeout of 0, so round up to at least a millisecond
+                event = pygame.event.wait() if timeout is None else pygame.event.wait(max(1, int(timeout * 1000) + 1))
+                events = ([event] if event.type != pygame.NOEVENT else []) + pygame.event.get()
+        self.check_exposed(events)
+        return events
+
+    def check_exposed(self, events):
+        """
+        Redraws the whole window on the next frame if the events report that its content was lost.
+        """
+        if any(event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE) for event in events):
+            self.layers = None  # The window content was lost
+
+    def render(self):
+        """
+        Draws a new frame if anything changed and pushes the changed areas to the display.
+        Returns True if a frame was drawn.
+        """
+        state = self.state
+        if self.continuous:
+            draw_frame(self.images, state)
+            with profiler.phase("flip"):
+                pygame.display.flip()  # Update the screen
+            self.frames += 1
+            self.pixels += state.window_size[0] * state.window_size[1]
+            return True
+
+        layers = self.layer_states()
+        damage = self.damage(self.layers, layers)
+        self.layers = layers
+        if not damage:
+            self.skipped += 1
+            return False
+
+        screen_rect = state.screen.get_rect()
+        damage = [rect.clip(screen_rect) for rect in damage]
+        state.screen.set_clip(damage[0].unionall(damage[1:]))  # Only redraw the changed part of the screen
+        draw_frame(self.images, state)
+        state.screen.set_clip(None)
+        with profiler.phase("flip"):
+            pygame.display.update(damage)
+        self.frames += 1
+        self.pixels += sum(rect.width * rect.height for rect in damage)
+        return True
+
+    def damage(self, previous, current):
+        """
+        Returns the screen areas that differ between two sets of layer states.
+        """
+        window = pygame.Rect((0, 0), self.state.window_size)
+        if previous is None:
+            return [window]
+        damage = []
+        for name, (kind, items) in current.items():
+            previous_kind, previous_items = previous.get(name, (None, {}))
+            if kind == previous_kind:
+                # Only the items that appeared or disappeared changed
+                damage.extend(items[item] for item in items.keys() - previous_items.keys())
+                damage.extend(previous_items[item] for item in previous_items.keys() - items.keys())
+            elif kind is None or previous_kind is None:
+                damage.extend(list(items.values()) + list(previous_items.values()))
+            else:
+                return [window]
+        return damage
+
+    def layer_states(self):
+        """
+        Describes what each layer shows, as (kind, {item: screen rect}). Items are hashable descriptions of
+        everything that affects how the layer looks.
+        """
+        state = self.state
+        window = pygame.Rect((0, 0), state.window_size)
+        if state.black_screen_mode:
+            return {"slide": ("black", {state.window_size: window})}
+
+        layers = {"slide": self.slide_layer(window), "overlay": (None, {}), "annotations": (None, {}),
+                  "chrome": (None, {}), "hud": self.hud_layer()}
+
+        if state.spotlight_mode:
+            radius = state.spotlight_radius
+            circle = pygame.Rect(state.spotlight_position[0] - radius, state.spotlight_position[1] - radius,
+                                 2 * radius + 1, 2 * radius + 1)
+            layers["overlay"] = ("spotlight", {"dim": window, (state.spotlight_position, radius): circle})
+        elif state.highlight_mode:
+            items = {"dim": window}
+            items.update((tuple(rect), pygame.Rect(rect)) for rect in state.current_highlights)
+            if state.highlight_rect is not None:
+                items[("live", tuple(state.highlight_rect))] = pygame.Rect(state.highlight_rect)
+            layers["overlay"] = ("highlight", items)
+
+        if not state.show_overview and state.zoom_level == 1 and not state.show_help and \
+                not state.transition_player.active:
+            layers["annotations"] = ("annotations", self.annotation_items())
+
+        if state.show_initial_help_popup:
+            layers["chrome"] = ("popup", {state.window_size: initial_help_popup_rect(state.window_size)})
+        return layers
+
+    def slide_layer(self, window):
+        """
+        Describes the slide layer, or the help, overview or end screen shown instead of the slide.
+        """
+        state, images = self.state, self.images
+        if state.show_help:
+            return "help", {state.window_size: window}
+        if state.show_overview:
+            overview = state.overview
+            atlas_version = overview.atlas.version if overview.atlas else None
+            return "overview", {(state.window_size, overview.scroll, state.focused_page, atlas_version): window}
+        if state.end_of_presentation:
+            return "end", {state.window_size: window}
+        if state.transition_player.active:
+            return "transition", {(state.window_size, state.transition_player.frame): window}
+
+        page = state.current_page
+        partial = state.transition_plan[page].transition == constant.PARTIAL_SLIDE_TRANSITION
+        key = (state.window_size, page, images.version(page), state.prev_slide_position, state.next_slide_position,
+               partial)  # The transition plan may be reloaded while the slide is shown
+        if partial and page > 0:
+            key += (images.version(page - 1),)  # Shown by partial slide transitions
+        if state.zoom_level > 1:
+            key += (state.zoom_level, state.zoom_pos, state.zoom_engine.misses)  # Redrawn as new tiles come in
+        return "slide", {key: window}
+
+    def hud_layer(self):
+        """
+        Describes the frame timing HUD, redrawn whenever its numbers are refreshed.
+        """
+        if not profiler.show_hud:
+            return None, {}
+        rows = profiler.summary or (("measuring", ""),)
+        return "hud", {rows: frame_hud_rect(self.state.hud_font, rows)}
+
+    def annotation_items(self):
+        """
+        Describes the annotations on the current slide, including the ones being drawn or typed.
+        """
+        state = self.state
+        items = dict(state.annotation_layers.items(state, state.current_page,
+                                                   slide_transform(self.images, state.current_page, state.window_size)))
+        if state.is_entering_text and state.annotation_rect:
+            items[("entering", tuple(state.annotation_rect), state.current_text)] = pygame.Rect(state.annotation_rect)
+        if state.is_drawing_pen and len(state.pen_points) > 1:
+            items[("drawing", len(state.pen_points))] = stroke_rect(state.pen_points)
+        return items
+
+    def stats(self):
+        """
+        Returns the frame counters.
+        """
+        return {"frames": self.frames, "skipped": self.skipped, "pixels": self.pixels}
@@ -0,0 +1,144 @@
+import gzip
+import json
+import time
+
+import pygame
+
+from pyslides import constant
+
+RECORDING_VERSION = 1
+LONG_FRAME_TIME = 1 / 60  # Seconds of work after which a frame missed a display refresh
+UNRECORDED_EVENTS = {constant.CONFIG_RELOADED_EVENT}  # Events carrying objects that cannot be saved
+
+
+class VirtualClock:
+    """
+    A clock that only moves when it is set, standing in for ``time.time`` while a recording is replayed.
+    """
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def event_to_json(event):
+    """
+    Returns an event as a compact JSON list of its type and its plain attributes.
+    """
+    attributes = {}
+    for name, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            attributes[name] = value
+        elif isinstance(value, (tuple, list)) and all(isinstance(item, (int, float)) for item in value):
+            attributes[name] = list(value)  # Positions, sizes and button states
+    return [event.type, attributes]
+
+
+def event_from_json(data):
+    """
+    Returns the event saved by ``event_to_json``.
+    """
+    event_type, attributes = data
+    return pygame.event.Event(event_type, {name: tuple(value) if isinstance(value, list) else value
+                                           for name, value in attributes.items()})
+
+
+class EventRecorder:
+    """
+    Records the input of a presentation to a compact file: one gzipped JSON line per iteration of the main loop,
+    with the time, the keyboard modifiers and the mouse position the iteration's events were handled with, and
+    the events themselves. The first line describes the session.
+    """
+
+    def __init__(self, path, pdf_file, window_size, resizable=False, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.start_time = clock()
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self.batches = 0
+        self.write({"version": RECORDING_VERSION, "pdf": str(pdf_file), "window_size": list(window_size),
+                    "resizable": resizable})
+
+    def write(self, data):
+        self.file.write(json.dumps(data, separators=(',', ':')) + "\n")
+
+    def record(self, events, mods, mouse_pos):
+        """
+        Records the events handled by one iteration of the main loop.
+        """
+        self.write([round(self.clock() - self.start_time, 6), mods, list(mouse_pos),
+                    [event_to_json(event) for event in events if event.type not in UNRECORDED_EVENTS]])
+        self.batches += 1
+
+    def close(self):
+        self.file.close()
+        print(f"Recorded {self.batches} iterations to {self.path}")
+
+
+class EventReplayer:
+    """
+    Plays back a recording made by ``EventRecorder``: every call to ``next_batch`` moves the virtual clock to
+    the time of the next recorded iteration, restores the keyboard modifiers and returns its events.
+    """
+
+    def __init__(self, path, clock):
+        self.path = path
+        self.clock = clock
+        self.file = gzip.open(path, 'rt', encoding='utf-8')
+        self.header = json.loads(self.file.readline())
+        if self.header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a pyslides recording of version {RECORDING_VERSION}")
+        self.start_time = clock.now
+
+    def next_batch(self):
+        """
+        Returns the mouse position and the events of the next recorded iteration, or None at the end.
+        """
+        line = self.file.readline()
+        if not line:
+            return None
+        offset, mods, mouse_pos, events = json.loads(line)
+        self.clock.now = self.start_time + offset
+        pygame.key.set_mods(mods)
+        return tuple(mouse_pos), [event_from_json(data) for data in events]
+
+    def close(self):
+        self.file.close()
+
+
+class FrameStats:
+    """
+    Collects the time each iteration of the main loop took and the CPU time used, and reports their distribution.
+    """
+
+    def __init__(self, long_frame_time=LONG_FRAME_TIME):
+        self.long_frame_time = long_frame_time
+        self.frame_times = []
+        self.long_frames = []  # (iteration, virtual time, seconds) of every long frame
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    def add(self, frame_time, virtual_time=None):
+        if frame_time > self.long_frame_time:
+            self.long_frames.append((len(self.frame_times), virtual_time, frame_time))
+        self.frame_times.append(frame_time)
+
+    def report(self):
+        """
+        Returns the frame time distribution in milliseconds, the long frames and the wall and CPU time used.
+        """
+        frame_times = sorted(self.frame_times) or [0]
+
+        def percentile(fraction):
+            return round(frame_times[min(len(frame_times) - 1, int(fraction * len(frame_times)))] * 1000, 3)
+
+        return {"frames": len(self.frame_times), "p50_ms": percentile(0.5), "p90_ms": percentile(0.9),
+                "p99_ms": percentile(0.99), "max_ms": round(frame_times[-1] * 1000, 3),
+                "long_frames": len(self.long_frames),
+                "longest": [{"iteration": iteration, "time": None if at is None else round(at, 3),
+                             "ms": round(frame_time * 1000, 3)}
+                            for iteration, at, frame_time in sorted(self.long_frames, key=lambda f: -f[2])[:10]],
+                "wall_s": round(time.perf_counter() - self.started, 3),
+                "cpu_s": round(time.process_time() - self.cpu_started, 3)}
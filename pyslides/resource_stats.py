@@ -0,0 +1,74 @@
+from pyslides.config.annotations_config import AnnotationsConfig
+
+MEGABYTE = 1024 * 1024
+
+
+def collect_stats(images, state):
+    """
+    Returns a snapshot of the resources held by the presentation: the bytes of the slide surfaces, thumbnails,
+    overlays and zoom tiles in memory, the annotations on every page, the render cache on disk and how many
+    pages were rendered from the PDF versus served from a cache.
+
+    Only counters and sizes already kept by each component are read, so this is cheap enough to poll every
+    second.
+    """
+    slides = images.stats()
+    render = state.render_service.stats() if state.render_service else {}
+    overview = state.overview.stats() if state.overview else {}
+    zoom = state.zoom_engine.stats() if state.zoom_engine else {}
+    memory = {
+        "slides": slides["hot_bytes"] + slides["warm_bytes"],
+        "placeholders": render.get("placeholder_bytes", 0),
+        "thumbnails": overview.get("sheet_bytes", 0) + overview.get("frame_bytes", 0),
+        "overlay": state.overlay.stats()["layer_bytes"],
+        "annotation_layers": state.annotation_layers.stats()["layer_bytes"],
+        "zoom_tiles": zoom.get("tile_bytes", 0),
+    }
+    memory["total"] = sum(memory.values())
+
+    pages = AnnotationsConfig.annotation_counts(state.text_annotations, state.pen_annotations)
+    annotations = {name: sum(counts[name] for counts in pages.values()) for name in ("rects", "strokes", "points")}
+    annotations["pages"] = pages
+    annotations["file_bytes"] = AnnotationsConfig.files_size(state.pdf_path) if state.pdf_path else 0
+
+    return {
+        "memory": memory,
+        "slides": {"pages": len(images), **slides},
+        "render": {name: value for name, value in render.items() if name != "placeholder_bytes"},
+        "thumbnails": overview.get("thumbnails", 0),
+        "render_cache": state.render_cache.stats() if state.render_cache else None,  # None when rendering in memory
+        "annotations": annotations,
+    }
+
+
+def format_stats(stats):
+    """
+    Returns a stats snapshot as lines of text for the console.
+    """
+    memory, slides, render, annotations = stats["memory"], stats["slides"], stats["render"], stats["annotations"]
+    lines = [f"Memory: {memory['total'] / MEGABYTE:.1f} MB"]
+    lines += [f"  {name.replace('_', ' ')}: {size / MEGABYTE:.1f} MB" for name, size in memory.items()
+              if name != "total"]
+    lines.append(f"Slides: {slides['hot_pages']} decoded and {slides['warm_pages']} compressed of {slides['pages']}, "
+                 f"{slides['hits']} hits, {slides['warm_hits']} warm hits, {slides['misses']} misses")
+    if render:
+        lines.append(f"Pages: {render['rendered']} rendered from the PDF ({render['previews']} previews), "
+                     f"{render['loaded_from_cache']} loaded from the render cache, {render['pending']} pending")
+    lines.append(f"Thumbnails: {stats['thumbnails']} rendered")
+    if stats["render_cache"]:
+        lines.append(f"Render cache: {stats['render_cache']['disk_bytes'] / MEGABYTE:.1f} MB on disk, "
+                     f"{stats['render_cache']['pixel_stores']} window sizes")
+    else:
+        lines.append("Render cache: off, rendering in memory")
+    lines.append(f"Annotations: {annotations['rects']} text boxes, {annotations['strokes']} strokes with "
+                 f"{annotations['points']} points, {annotations['file_bytes'] / 1024:.1f} KB on disk")
+    lines += [f"  slide {page_num}: {counts['rects']} text boxes, {counts['strokes']} strokes, "
+              f"{counts['points']} points" for page_num, counts in annotations["pages"].items()]
+    return lines
+
+
+def print_stats(images, state):
+    """
+    Prints the resources held by the presentation to the console.
+    """
+    print("\n".join(format_stats(collect_stats(images, state))))
@@ -0,0 +1,241 @@
+import threading
+import zlib
+from collections import OrderedDict
+
+import pygame
+
+from pyslides import constant
+
+WARM_PIXEL_FORMAT = 'RGB'  # Pixel format of the compressed copies kept in the warm tier
+
+
+class SlideCache:
+    """
+    A memory-budgeted, list-like cache of display-ready slide surfaces.
+
+    Slides live in one of three tiers:
+    - hot: decoded surfaces, kept in LRU order within the memory budget. Pages close to the current page are
+      never evicted from it.
+    - warm: zlib-compressed copies of slides evicted from the hot tier, within their own budget.
+    - cold: everything else, reloaded on demand through the loader (pixel store or PDF).
+
+    ``cache[i]`` returns the slide surface of page i, so the display and transition code can keep treating
+    the cache like the plain list of images it replaces. A loader may return None for a page that is not
+    available yet; the placeholder is then returned without being cached.
+
+    Slides may be put in from any thread in any pixel format. With ``prepare`` set (e.g. to
+    ``to_display_format``), a slide is converted the first time it is read, on the drawing thread, so every
+    later blit of it needs no per-pixel conversion. ``reformat`` converts them again after a display mode change.
+    """
+
+    def __init__(self, page_count, loader, budget=constant.SLIDE_CACHE_BUDGET,
+                 warm_budget=constant.SLIDE_CACHE_WARM_BUDGET, placeholder=None,
+                 keep_around=constant.SLIDE_CACHE_KEEP_AROUND, prepare=None):
+        self.page_count = page_count
+        self.loader = loader  # Cold tier: page number -> Surface, or None if not available yet
+        self.placeholder = placeholder  # Page number -> Surface shown while a page is not available
+        self.budget = budget  # Maximum bytes held by the hot tier
+        self.warm_budget = warm_budget  # Maximum bytes held by the warm tier
+        self.keep_around = keep_around  # Pages on either side of the current page that stay hot
+        self.prepare = prepare  # Surface -> Surface ready to be drawn, applied when a slide is first read
+        self.prepared = set()  # Pages of the hot tier that went through prepare
+        self.hot = OrderedDict()  # Page number -> Surface, least recently used first
+        self.warm = OrderedDict()  # Page number -> (size, compressed pixels), least recently used first
+        self.hot_bytes = 0
+        self.warm_bytes = 0
+        self.focus_page = 0
+        self.versions = [0] * page_count  # Bumped whenever the content of a page changes
+        self.hits = 0
+        self.warm_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.RLock()  # Slides may be put in by the background render service
+
+    def __len__(self):
+        return self.page_count
+
+    def __iter__(self):
+        for page_num in range(self.page_count):
+            yield self[page_num]
+
+    def __getitem__(self, page_num):
+        """
+        Returns the slide surface of a page, promoting it to the hot tier.
+        """
+        if page_num < 0:
+            page_num += self.page_count
+        if not 0 <= page_num < self.page_count:
+            raise IndexError("slide index out of range")
+
+        with self.lock:
+            surface = self.hot.get(page_num)
+            if surface is not None:
+                self.hits += 1
+                self.hot.move_to_end(page_num)
+                return self.prepared_surface(page_num, surface)
+
+            if page_num in self.warm:
+                self.warm_hits += 1
+                size, compressed = self.warm.pop(page_num)
+                self.warm_bytes -= len(compressed)
+                surface = pygame.image.frombuffer(bytearray(zlib.decompress(compressed)), size, WARM_PIXEL_FORMAT)
+            else:
+                self.misses += 1
+                surface = self.loader(page_num)
+                if surface is None:
+                    return self.placeholder(page_num)  # Not available yet; nothing to cache
+
+            self.put(page_num, surface)
+            return self.prepared_surface(page_num, surface)
+
+    def prepared_surface(self, page_num, surface):
+        """
+        Returns the hot surface of a page, converting it with ``prepare`` first if that has not happened yet.
+        Must be called with the lock held.
+        """
+        if self.prepare is None or page_num in self.prepared:
+            return surface
+        prepared = self.prepare(surface)
+        self.prepared.add(page_num)
+        if prepared is not surface:
+            self.hot[page_num] = prepared
+            self.hot_bytes += surface_bytes(prepared) - surface_bytes(surface)
+        return prepared
+
+    def __setitem__(self, page_num, surface):
+        """
+        Replaces the slide surface of a page, e.g. when a newly rendered page comes in.
+        """
+        with self.lock:
+            self.discard(page_num)
+            self.versions[page_num] += 1
+            self.put(page_num, surface)
+
+    def put(self, page_num, surface):
+        """
+        Adds a surface to the hot tier and evicts least recently used pages to stay within the budget.
+        """
+        with self.lock:
+            self.hot[page_num] = surface
+            self.hot_bytes += surface_bytes(surface)
+            self.evict()
+
+    def discard(self, page_num):
+        """
+        Drops a page from the hot and warm tiers.
+        """
+        with self.lock:
+            surface = self.hot.pop(page_num, None)
+            if surface is not None:
+                self.hot_bytes -= surface_bytes(surface)
+            self.prepared.discard(page_num)
+            entry = self.warm.pop(page_num, None)
+            if entry is not None:
+                self.warm_bytes -= len(entry[1])
+
+    def reset(self, loader=None, page_count=None):
+        """
+        Drops every cached slide, e.g. after the window size changed, optionally switching to a new loader.
+        """
+        with self.lock:
+            self.hot.clear()
+            self.prepared.clear()
+            self.warm.clear()
+            self.hot_bytes = self.warm_bytes = 0
+            if loader is not None:
+                self.loader = loader
+            if page_count is not None and page_count != self.page_count:
+                self.page_count = page_count
+                self.versions = [0] * page_count
+            self.versions = [version + 1 for version in self.versions]
+
+    def reformat(self):
+        """
+        Prepares the cached slides again on their next read, e.g. after the display pixel format changed.
+        """
+        with self.lock:
+            self.prepared.clear()
+
+    def focus(self, page_num):
+        """
+        Sets the current page; it and its neighbours are kept in the hot tier.
+        """
+        self.focus_page = page_num
+
+    def version(self, page_num):
+        """
+        Returns a counter that changes whenever the content of a page changes, for caches derived from slides.
+        """
+        return self.versions[page_num]
+
+    def evict(self):
+        """
+        Moves least recently used pages out of the hot tier until it fits in the budget, compressing them into
+        the warm tier, which in turn drops its least recently used pages back to the cold tier.
+        Must be called with the lock held.
+        """
+        if self.hot_bytes <= self.budget:
+            return
+        for page_num in list(self.hot):
+            if self.hot_bytes <= self.budget:
+                break
+            if abs(page_num - self.focus_page) <= self.keep_around:
+                continue  # Pages around the current page stay hot
+            surface = self.hot.pop(page_num)
+            self.hot_bytes -= surface_bytes(surface)
+            self.prepared.discard(page_num)
+            self.evictions += 1
+            if self.warm_budget > 0:
+                compressed = zlib.compress(pygame.image.tobytes(surface, WARM_PIXEL_FORMAT), 1)
+                self.warm[page_num] = (surface.get_size(), compressed)
+                self.warm_bytes += len(compressed)
+
+        while self.warm_bytes > self.warm_budget and self.warm:
+            _, (_, compressed) = self.warm.popitem(last=False)
+            self.warm_bytes -= len(compressed)
+
+    def stats(self):
+        """
+        Returns the cache counters and tier sizes.
+        """
+        return {
+            "hits": self.hits,
+            "warm_hits": self.warm_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hot_pages": len(self.hot),
+            "hot_bytes": self.hot_bytes,
+            "warm_pages": len(self.warm),
+            "warm_bytes": self.warm_bytes,
+        }
+
+
+def surface_bytes(surface):
+    """
+    Returns the number of bytes held by a surface's pixels.
+    """
+    return surface.get_height() * surface.get_pitch()
+
+
+def to_display_format(surface):
+    """
+    Returns the surface in the pixel format of the display, so blitting it, also with a surface alpha as in
+    fades, takes the fast path instead of converting every pixel. Surfaces already in that format, and every
+    surface while there is no display, are returned as they are.
+    """
+    display = pygame.display.get_surface() if pygame.display.get_init() else None
+    if display is None or (surface.get_bitsize() == display.get_bitsize() and
+                           surface.get_masks() == display.get_masks()):
+        return surface
+    return surface.convert()
+
+
+def to_display_alpha_format(surface):
+    """
+    Returns a transparent surface in the per-pixel alpha format that blits fastest onto the display, or the
+    surface as it is while there is no display.
+    """
+    display = pygame.display.get_surface() if pygame.display.get_init() else None
+    if display is None:
+        return surface
+    return surface.convert_alpha()
@@ -1,6 +1,10 @@
 import pygame
 
 from pyslides import constant
+from pyslides.annotations import AnnotationLayers
+from pyslides.overlay import OverlayEngine
+from pyslides.transition_plan import TransitionPlan
+from pyslides.transitions import TransitionPlayer
 
 
 class AppState:
@@ -16,22 +20,31 @@ class AppState:
         pygame.font.init()
         self.font = pygame.font.Font(None, 36)  # Default font, size 36 for general text
         self.annotation_font = pygame.font.SysFont("timesnewroman", 18)  # Font for annotations
+        self.hud_font = pygame.font.Font(None, 22)  # Font for the frame timing HUD
 
         # Global state variables to track various modes and states in the presentation
         self.is_fullscreen = False  # Track whether fullscreen mode is active
+        self.resizable = False  # Track whether the window can be resized by the user
+        self.pending_window_size = None  # Size of a resizable window still being resized by the user
+        self.resize_time = 0  # Time of the last resize event
         self.show_overview = False  # Track whether overview mode is active
         self.current_page = 0  # Track the current slide being displayed
         self.focused_page = 0  # Track the currently highlighted slide in overview mode
         self.prev_slide_position = 0  # Y position of the previous slide during partial slide transition
         self.next_slide_position = 0  # Y position of the next slide during partial slide transition
+        self.transition_plan = TransitionPlan.compile({}, 0)  # Transition of every slide; the defaults until loaded
+        self.transition_player = TransitionPlayer()  # Plays slide transitions frame by frame from the main loop
         self.scrolling = False  # Flag to indicate if scrolling is active (for partial slides)
         self.scroll_direction = 0  # Direction of scrolling: -1 for up, 1 for down
         self.scroll_start_time = 0  # Time when scrolling started
+        self.mouse_pos = (0, 0)  # Mouse position the events of the current frame are handled with
         self.spotlight_mode = False  # Flag to indicate if spotlight mode is active
         self.highlight_mode = False  # Flag to indicate if highlight mode is active
         self.highlight_start = None  # Start position for the highlight rectangle
         self.highlight_rects = {}  # Store highlight rectangles per slide
-        self.current_highlights = []  # Current highlights being drawn
+        self.current_highlights = []  # Union of the highlighted regions, as disjoint rectangles
+        self.highlight_rect = None  # Rubber-band rectangle of the highlight being dragged
+        self.overlay = OverlayEngine()  # Draws the spotlight and highlight dim layer
         self.spotlight_radius = 100  # Initial spotlight radius
         self.spotlight_position = (constant.SCREEN_WIDTH // 2, constant.SCREEN_HEIGHT // 2)  # Initial spotlight position
         self.end_of_presentation = False  # Flag to indicate the end of the presentation
@@ -41,6 +54,7 @@ class AppState:
         self.max_zoom_level = 4  # Maximum zoom level allowed
         self.min_zoom_level = 1  # Minimum zoom level allowed
         self.zoom_pos = (0, 0)  # Position around which zoom is centered
+        self.zoom_engine = None  # Renders the visible region of zoomed slides from the PDF
         self.black_screen_mode = False  # Flag to indicate if black screen mode is active
 
         # Global variables for text annotation
@@ -49,11 +63,19 @@ class AppState:
         self.annotation_rect = None  # Rectangle defining the annotation area
         self.is_entering_text = False  # Flag to indicate if text is being entered
         self.current_text = ""  # Current text being entered in the annotation
-        self.text_annotations = {}  # Store list of (rect, text) per slide
+        self.text_annotations = {}  # Store list of (rect, text) per slide, rects relative to the slide
         self.dragging = False  # Flag for dragging the annotation box
 
         # Global variables for pen annotations
         self.is_drawing_pen = False  # Flag to indicate if pen mode is active
         self.pen_points = []  # Store points for the current pen stroke
-        self.pen_annotations = {}  # Store list of pen points per slide
-        self.original_image_size = []  # Store the original size of the images
+        self.pen_annotations = {}  # Store list of pen strokes per slide, relative to the slide
+        self.annotation_versions = {}  # Page number -> count of edits to its committed annotations
+        self.annotation_layers = AnnotationLayers()  # Committed annotations rasterized per slide
+        self.annotation_journal = None  # Journal every committed annotation edit is recorded in
+
+        # Global variables for slide rendering
+        self.pdf_path = None  # Absolute path of the PDF being presented
+        self.render_cache = None  # Persistent render cache of the deck (None when rendering in memory)
+        self.render_service = None  # Background render service providing the slides for the window size
+        self.overview = None  # Scrollable grid of slide thumbnails shown in overview mode
@@ -0,0 +1,126 @@
+import math
+from array import array
+
+from pyslides import constant
+
+COORDINATE_TYPE = 'f'  # Pen coordinates are stored as 32-bit floats
+
+
+class Stroke:
+    """
+    A finished pen stroke, stored as one flat typed array of x, y coordinates instead of a list of tuples.
+    Saved strokes are kept in page-normalized coordinates (see ``PageTransform``).
+
+    A stroke behaves like a read-only sequence of (x, y) points, so it can be drawn with ``pygame.draw.lines``
+    directly. It is immutable: moving or scaling it returns a new stroke.
+    """
+
+    __slots__ = ('coordinates', 'extent')
+
+    def __init__(self, coordinates):
+        self.coordinates = coordinates  # array of x0, y0, x1, y1, ...
+        self.extent = None  # Bounding box, computed when first needed
+
+    @classmethod
+    def from_points(cls, points):
+        """
+        Builds a stroke from a sequence of (x, y) points.
+        """
+        coordinates = array(COORDINATE_TYPE)
+        for x, y in points:
+            coordinates.append(x)
+            coordinates.append(y)
+        return cls(coordinates)
+
+    def __len__(self):
+        return len(self.coordinates) // 2
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("stroke point index out of range")
+        return self.coordinates[2 * index], self.coordinates[2 * index + 1]
+
+    def __iter__(self):
+        return zip(self.coordinates[0::2], self.coordinates[1::2])
+
+    def __eq__(self, other):
+        return isinstance(other, Stroke) and self.coordinates == other.coordinates
+
+    def __hash__(self):
+        return hash(self.coordinates.tobytes())
+
+    def __repr__(self):
+        return f"Stroke({self.points()!r})"
+
+    def points(self):
+        """
+        Returns the points as a list of [x, y] pairs.
+        """
+        coordinates = self.coordinates
+        return [[coordinates[i], coordinates[i + 1]] for i in range(0, len(coordinates), 2)]
+
+    def bounds(self):
+        """
+        Returns the (left, top, right, bottom) bounding box of the stroke.
+        """
+        if self.extent is None:
+            xs, ys = self.coordinates[0::2], self.coordinates[1::2]
+            self.extent = (min(xs), min(ys), max(xs), max(ys))
+        return self.extent
+
+    def transformed(self, x_scale, y_scale, x_offset, y_offset, rounded=False):
+        """
+        Returns the stroke with every point moved to (x * x_scale + x_offset, y * y_scale + y_offset), optionally
+        rounded to whole pixels. Each axis is mapped in one comprehension and the results are interleaved straight
+        into the new flat array.
+        """
+        xs, ys = self.coordinates[0::2], self.coordinates[1::2]
+        coordinates = [0.0] * len(self.coordinates)
+        if rounded:
+            coordinates[0::2] = [round(x * x_scale + x_offset) for x in xs]
+            coordinates[1::2] = [round(y * y_scale + y_offset) for y in ys]
+        else:
+            coordinates[0::2] = [x * x_scale + x_offset for x in xs]
+            coordinates[1::2] = [y * y_scale + y_offset for y in ys]
+        return Stroke(array(COORDINATE_TYPE, coordinates))
+
+    def simplified(self, tolerance=constant.PEN_SIMPLIFY_TOLERANCE):
+        """
+        Returns the stroke without the points that deviate less than the tolerance (in pixels) from the line
+        through their neighbours, using the Ramer-Douglas-Peucker algorithm. The end points are always kept.
+        """
+        count = len(self)
+        if count < 3 or tolerance <= 0:
+            return self
+        coordinates = self.coordinates
+        keep = bytearray(count)
+        keep[0] = keep[-1] = 1
+        ranges = [(0, count - 1)]
+        while ranges:
+            start, end = ranges.pop()
+            x1, y1 = coordinates[2 * start], coordinates[2 * start + 1]
+            x2, y2 = coordinates[2 * end], coordinates[2 * end + 1]
+            dx, dy = x2 - x1, y2 - y1
+            length = math.hypot(dx, dy)
+            farthest, max_distance = None, tolerance
+            for index in range(start + 1, end):
+                x, y = coordinates[2 * index], coordinates[2 * index + 1]
+                if length:
+                    distance = abs(dy * (x - x1) - dx * (y - y1)) / length  # Distance to the line
+                else:
+                    distance = math.hypot(x - x1, y - y1)  # Distance to the point the stroke returned to
+                if distance > max_distance:
+                    farthest, max_distance = index, distance
+            if farthest is not None:
+                keep[farthest] = 1
+                ranges.append((start, farthest))
+                ranges.append((farthest, end))
+
+        simplified = array(COORDINATE_TYPE)
+        for index in range(count):
+            if keep[index]:
+                simplified.append(coordinates[2 * index])
+                simplified.append(coordinates[2 * index + 1])
+        return Stroke(simplified)
@@ -0,0 +1,144 @@
+import math
+from collections import namedtuple
+
+from pyslides import constant
+from pyslides.config.transitions_config_reader import DEFAULT_GENERAL_SETTINGS, TransitionsConfig
+from pyslides.transitions import EASINGS, SlideTransition
+
+SETTING_KEYS = ("transition", "transition-duration", "reversal-strategy", "easing")  # Keys allowed in a section
+NAME_KEYS = ("transition", "reversal-strategy", "easing")  # Settings given as a name
+REVERSAL_STRATEGIES = {
+    constant.INVERT_TRANSITION: True,  # Going back plays the transition reversed
+    constant.KEEP_ORIGINAL: False,  # Going back plays the transition as it is
+    constant.NONE: None,  # Going back shows the slide right away
+}
+
+# The compiled transition of a slide: the transition name, the function drawing its frames, its duration in
+# seconds, its easing function and whether going back to the slide reverses it (None: no transition back)
+TransitionSettings = namedtuple("TransitionSettings", "transition draw_frame duration easing reverse")
+
+
+class TransitionConfigError(ValueError):
+    """
+    Raised when a transitions configuration is invalid. Lists every problem found.
+    """
+
+    def __init__(self, problems):
+        super().__init__("Invalid transitions configuration:\n  " + "\n  ".join(problems))
+        self.problems = problems
+
+
+def parse_duration(value):
+    """
+    Parses a transition duration such as "1s", "0.25s" or 0.5 into seconds.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"invalid duration {value!r}")
+    if isinstance(value, str):
+        value = value.strip()
+        value = value[:-1] if value.endswith('s') else value
+    try:
+        duration = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid duration {value!r}") from None
+    if not math.isfinite(duration) or duration < 0:
+        raise ValueError(f"invalid duration {value!r}")
+    return duration
+
+
+class TransitionPlan:
+    """
+    The transitions configuration of a deck compiled into one immutable table with the settings of every page,
+    so looking up the transition of a slide is a list index.
+
+    Every setting is validated and parsed once, when the configuration is loaded: the transition name is
+    resolved to its frame function, the duration parsed to seconds and the easing and reversal strategy looked
+    up. Unknown transitions, easings or reversal strategies, bad durations, unknown keys and slide numbers
+    beyond the page count are all reported together, up front.
+    """
+
+    __slots__ = ('pages', 'general')
+
+    def __init__(self, pages, general):
+        self.pages = tuple(pages)  # TransitionSettings of every page
+        self.general = general  # TransitionSettings of the general settings
+
+    def __getitem__(self, page_num):
+        """
+        Returns the transition settings of a page; pages beyond the deck use the general settings.
+        """
+        if 0 <= page_num < len(self.pages):
+            return self.pages[page_num]
+        return self.general
+
+    def __len__(self):
+        return len(self.pages)
+
+    @staticmethod
+    def compile_settings(section, settings, fallback, problems):
+        """
+        Compiles the settings of one configuration section, filling in missing settings from fallback.
+        Appends every problem found to problems.
+        """
+        if not isinstance(settings, dict):
+            problems.append(f"{section}: expected an object of settings, not {type(settings).__name__}")
+            settings = {}
+        for key in settings:
+            if key not in SETTING_KEYS:
+                problems.append(f"{section}: unknown setting {key!r}")
+        settings = {**fallback, **settings}
+        for key in NAME_KEYS:
+            if not isinstance(settings[key], str):
+                problems.append(f"{section}: {key} must be a name, not {settings[key]!r}")
+                settings[key] = fallback[key]  # Keeps checking the rest of the section
+
+        transition = settings["transition"]
+        draw_frame = SlideTransition.frame_function(transition)
+        if draw_frame is None:
+            problems.append(f"{section}: unknown transition {transition!r}")
+        try:
+            duration = parse_duration(settings["transition-duration"])
+        except ValueError as error:
+            problems.append(f"{section}: {error}")
+            duration = 0
+        easing = EASINGS.get(settings["easing"])
+        if easing is None:
+            problems.append(f"{section}: unknown easing {settings['easing']!r}")
+        if settings["reversal-strategy"] not in REVERSAL_STRATEGIES:
+            problems.append(f"{section}: unknown reversal strategy {settings['reversal-strategy']!r}")
+        return settings, TransitionSettings(transition, draw_frame, duration, easing,
+                                            REVERSAL_STRATEGIES.get(settings["reversal-strategy"]))
+
+    @classmethod
+    def compile(cls, config, page_count):
+        """
+        Compiles a transitions configuration, as read from its JSON file, for a deck of page_count pages.
+        Raises TransitionConfigError if the configuration is invalid.
+        """
+        if not isinstance(config, dict):
+            raise TransitionConfigError([f"expected an object of sections, not {type(config).__name__}"])
+        problems = []
+        general_settings, general = cls.compile_settings("General", config.get("General", {}),
+                                                         DEFAULT_GENERAL_SETTINGS, problems)
+        pages = [general] * page_count
+        for key, settings in config.items():
+            if key == "General":
+                continue
+            name, _, number = key.partition(" ")
+            if name != "Slide" or not number.isdigit():
+                problems.append(f"unknown section {key!r}")
+                continue
+            if int(number) >= page_count:
+                problems.append(f"{key}: beyond the {page_count} slides of the deck")
+                continue
+            pages[int(number)] = cls.compile_settings(key, settings, general_settings, problems)[1]
+        if problems:
+            raise TransitionConfigError(problems)
+        return cls(pages, general)
+
+    @classmethod
+    def load(cls, config_path, page_count):
+        """
+        Loads and compiles the transitions configuration file of a deck; a missing file means the defaults.
+        """
+        return cls.compile(TransitionsConfig.read_config(config_path), page_count)
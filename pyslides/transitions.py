@@ -2,296 +2,402 @@ import pygame
 import time
 
 from pyslides import constant
-from pyslides.config.transitions_config_reader import TransitionsConfig
+from pyslides.frame_profiler import profiler
+
+
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+    "ease_in_out": lambda t: t * t * (3 - 2 * t),
+}  # Maps the linear progress of a transition to the progress shown on screen
 
 
 class SlideTransition:
     preset_alpha = 255  # Default opacity value for images
+    opaque_alpha = None  # No surface alpha at all, so opaque slides are blitted without blending
 
     @staticmethod
-    def pull(prev_image, next_image, window_size, screen, duration=1, reverse=False):
+    def play(draw_frame, prev_image, next_image, window_size, screen, duration=1, reverse=False):
         """
-         Perform a vertical pull transition between two slides.
+        Plays a transition to the end before returning, drawing one frame every 10 ms.
         """
 
         # Record the start and end time for the transition
         start_time = time.time()
         end_time = start_time + duration
 
+        while time.time() < end_time:
+            progress = (time.time() - start_time) / duration
+            profiler.begin_frame()
+            with profiler.phase("transition"):
+                draw_frame(prev_image, next_image, window_size, screen, progress, reverse)
+            with profiler.phase("flip"):
+                pygame.display.flip()
+            profiler.end_frame()
+
+            # Delay to control frame rate
+            pygame.time.delay(10)
+
+    @staticmethod
+    def pull(prev_image, next_image, window_size, screen, duration=1, reverse=False):
+        """
+         Perform a vertical pull transition between two slides.
+        """
+        SlideTransition.play(SlideTransition.pull_frame, prev_image, next_image, window_size, screen, duration,
+                             reverse)
+
+    @staticmethod
+    def pull_frame(prev_image, next_image, window_size, screen, progress, reverse=False):
+        """
+        Draws the frame of a vertical pull transition at the given progress (0 to 1).
+        """
+
         # Define starting position (above the screen) and ending position (centered) for the next image
         start_pos = window_size[1] if reverse else -window_size[1]
         end_pos = (window_size[1] - next_image.get_height()) // 2
 
-        # Define the starting position for the previous image (centered)
-        y_pos_prev = (window_size[1] - prev_image.get_height()) // 2
+        # Calculate current positions for images based on progress
+        y_pos_next = start_pos - (start_pos - end_pos) * progress if reverse else start_pos + (
+                end_pos - start_pos) * progress
+        y_pos_prev = -(window_size[1] - prev_image.get_height()) // 2 + window_size[1] * progress if reverse else \
+            (window_size[1] - prev_image.get_height()) // 2 - window_size[1] * progress
 
-        # Perform the pull transition
-        while time.time() < end_time:
-            elapsed_time = time.time() - start_time
-            progress = elapsed_time / duration
-
-            # Calculate current positions for images based on progress
-            y_pos_next = start_pos - (start_pos - end_pos) * progress if reverse else start_pos + (
-                    end_pos - start_pos) * progress
-            # y_pos_prev = y_pos_prev + window_size[1] * progress if reverse else y_pos_prev - window_size[1] * progress
-            y_pos_prev = -(window_size[1] - prev_image.get_height()) // 2 + window_size[1] * progress if reverse else \
-                (window_size[1] - prev_image.get_height()) // 2 - window_size[1] * progress
-
-            # Clear screen and draw images at calculated positions
-            screen.fill((0, 0, 0))
-            if y_pos_prev > start_pos:
-                screen.blit(prev_image, ((window_size[0] - prev_image.get_width()) // 2, y_pos_prev))
-            screen.blit(next_image, ((window_size[0] - next_image.get_width()) // 2, y_pos_next))
-            pygame.display.flip()
-
-            # Delay to control frame rate
-            pygame.time.delay(10)
+        # Clear screen and draw images at calculated positions
+        screen.fill((0, 0, 0))
+        if y_pos_prev > start_pos:
+            screen.blit(prev_image, ((window_size[0] - prev_image.get_width()) // 2, y_pos_prev))
+        screen.blit(next_image, ((window_size[0] - next_image.get_width()) // 2, y_pos_next))
 
     @staticmethod
     def fade_out_slide_in(prev_image, next_image, window_size, screen, duration=1, reverse=False):
         """
         Perform a fade-out and slide-in transition between two slides.
         """
+        SlideTransition.play(SlideTransition.fade_out_slide_in_frame, prev_image, next_image, window_size, screen,
+                             duration, reverse)
 
-        # Record the start and end time for the transition
-        start_time = time.time()
-        end_time = start_time + duration
+    @staticmethod
+    def fade_out_slide_in_frame(prev_image, next_image, window_size, screen, progress, reverse=False):
+        """
+        Draws the frame of a fade-out and slide-in transition at the given progress (0 to 1).
+        """
 
         # Define starting position (above the screen) and ending position (centered) for the next image
         start_pos = window_size[1] if reverse else -window_size[1]
         end_pos = (window_size[1] - next_image.get_height()) // 2
-        # Calculate alpha decrement step per frame
-        alpha_step = 255 / (duration * 100)
 
-        y_pos_next = start_pos  # Start above the screen for the next image
-        alpha = 255  # Start with full opacity for the previous image
+        # Calculate current position and alpha based on progress
+        y_pos_next = start_pos - (start_pos - end_pos) * progress if reverse else start_pos + (
+                end_pos - start_pos) * progress
+        alpha = 255 - (255 * progress)
 
-        # Perform the fade out and slide in transition
-        while time.time() < end_time:
-            # Calculate elapsed time and progress
-            elapsed_time = time.time() - start_time
-            progress = elapsed_time / duration
-
-            # Calculate current position and alpha based on progress
-            y_pos_next = start_pos - (start_pos - end_pos) * progress if reverse else start_pos + (
-                    end_pos - start_pos) * progress
-            # alpha = 255 * progress if reverse else 255 - (255 * progress)
-            alpha = 255 - (255 * progress)
-
-            # Clear screen and draw images at calculated positions with updated alpha
-            screen.fill((0, 0, 0))
-            if alpha > 0:
-                prev_image.set_alpha(int(alpha))
-                screen.blit(prev_image, (
-                    (window_size[0] - prev_image.get_width()) // 2, (window_size[1] - prev_image.get_height()) // 2))
-            screen.blit(next_image, ((window_size[0] - next_image.get_width()) // 2, y_pos_next))
-            pygame.display.flip()
-
-            # Delay to control frame rate
-            pygame.time.delay(10)
+        # Clear screen and draw images at calculated positions with updated alpha
+        screen.fill((0, 0, 0))
+        if alpha > 0:
+            prev_image.set_alpha(int(alpha))
+            screen.blit(prev_image, (
+                (window_size[0] - prev_image.get_width()) // 2, (window_size[1] - prev_image.get_height()) // 2))
+        screen.blit(next_image, ((window_size[0] - next_image.get_width()) // 2, y_pos_next))
 
     @staticmethod
     def swipe_right(prev_image, next_image, window_size, screen, duration=1, reverse=False):
         """
         Perform a swipe-right transition between two slides.
         """
+        SlideTransition.play(SlideTransition.swipe_right_frame, prev_image, next_image, window_size, screen,
+                             duration, reverse)
 
-        # Record the start and end time for the transition
-        start_time = time.time()
-        end_time = start_time + duration
+    @staticmethod
+    def swipe_right_frame(prev_image, next_image, window_size, screen, progress, reverse=False):
+        """
+        Draws the frame of a swipe-right transition at the given progress (0 to 1).
+        """
 
         # Define starting position (left of the screen) and ending position (centered) for the next image
         start_pos = window_size[0] if reverse else -window_size[0]
         end_pos = 0  # Centered on the screen
 
-        # Define the starting position for the previous image (centered)
-        x_pos_prev = (window_size[0] - prev_image.get_width()) // 2
+        # Calculate current positions for images based on progress
+        x_pos_next = start_pos - (start_pos - end_pos) * progress if reverse else start_pos + (
+                end_pos - start_pos) * progress
+        x_pos_prev = end_pos - window_size[0] * progress if reverse else (window_size[
+                                                                              0] - prev_image.get_width()) // 2 + \
+                                                                         window_size[0] * progress
 
-        # Perform the swipe right transition
-        while time.time() < end_time:
-            # Calculate elapsed time and progress
-            elapsed_time = time.time() - start_time
-            progress = elapsed_time / duration
-
-            # Calculate current positions for images based on progress
-            x_pos_next = start_pos - (start_pos - end_pos) * progress if reverse else start_pos + (
-                    end_pos - start_pos) * progress
-            x_pos_prev = end_pos - window_size[0] * progress if reverse else (window_size[
-                                                                                  0] - prev_image.get_width()) // 2 + \
-                                                                             window_size[0] * progress
-
-            # Clear screen and draw images at calculated positions
-            screen.fill((0, 0, 0))
-            screen.blit(prev_image, (x_pos_prev, (window_size[1] - prev_image.get_height()) // 2))
-            screen.blit(next_image, (x_pos_next, (window_size[1] - next_image.get_height()) // 2))
-            pygame.display.flip()
-
-            # Delay to control frame rate
-            pygame.time.delay(10)
+        # Clear screen and draw images at calculated positions
+        screen.fill((0, 0, 0))
+        screen.blit(prev_image, (x_pos_prev, (window_size[1] - prev_image.get_height()) // 2))
+        screen.blit(next_image, (x_pos_next, (window_size[1] - next_image.get_height()) // 2))
 
     @staticmethod
     def swipe_left(prev_image, next_image, window_size, screen, duration=1, reverse=False):
         """
         Perform a swipe-left transition between two slides.
         """
+        SlideTransition.play(SlideTransition.swipe_left_frame, prev_image, next_image, window_size, screen,
+                             duration, reverse)
 
-        # Record the start and end time for the transition
-        start_time = time.time()
-        end_time = start_time + duration
+    @staticmethod
+    def swipe_left_frame(prev_image, next_image, window_size, screen, progress, reverse=False):
+        """
+        Draws the frame of a swipe-left transition at the given progress (0 to 1).
+        """
 
         # Define starting position (right of the screen) and ending position (centered) for the next image
         start_pos = -window_size[0] if reverse else window_size[0]
         end_pos = 0  # Centered on the screen
 
-        # Define the starting position for the previous image (centered)
-        x_pos_prev = (window_size[0] - prev_image.get_width()) // 2
+        # Calculate current positions for images based on progress
+        x_pos_next = start_pos + (end_pos - start_pos) * progress if reverse else start_pos - (
+                start_pos - end_pos) * progress
+        x_pos_prev = end_pos + window_size[0] * progress if reverse else (window_size[
+                                                                              0] - prev_image.get_width()) // 2 - \
+                                                                         window_size[0] * progress
 
-        # Perform the swipe left transition
-        while time.time() < end_time:
-            elapsed_time = time.time() - start_time
-            progress = elapsed_time / duration
-
-            # Calculate current positions for images based on progress
-            x_pos_next = start_pos + (end_pos - start_pos) * progress if reverse else start_pos - (
-                    start_pos - end_pos) * progress
-            x_pos_prev = end_pos + window_size[0] * progress if reverse else (window_size[
-                                                                                  0] - prev_image.get_width()) // 2 - \
-                                                                             window_size[0] * progress
-
-            # Clear screen and draw images at calculated positions
-            screen.fill((0, 0, 0))
-            screen.blit(prev_image, (x_pos_prev, (window_size[1] - prev_image.get_height()) // 2))
-            screen.blit(next_image, (x_pos_next, (window_size[1] - next_image.get_height()) // 2))
-            pygame.display.flip()
-
-            # Delay to control frame rate
-            pygame.time.delay(10)
+        # Clear screen and draw images at calculated positions
+        screen.fill((0, 0, 0))
+        screen.blit(prev_image, (x_pos_prev, (window_size[1] - prev_image.get_height()) // 2))
+        screen.blit(next_image, (x_pos_next, (window_size[1] - next_image.get_height()) // 2))
 
     @staticmethod
     def fade_in(prev_image, next_image, window_size, screen, duration=1, reverse=False):
         """
         Perform a fade-in transition between two slides.
         """
+        SlideTransition.play(SlideTransition.fade_in_frame, prev_image, next_image, window_size, screen, duration,
+                             reverse)
 
-        # Record the start and end time for the transition
-        start_time = time.time()
-        end_time = start_time + duration
+    @staticmethod
+    def fade_in_frame(prev_image, next_image, window_size, screen, progress, reverse=False):
+        """
+        Draws the frame of a fade-in transition at the given progress (0 to 1).
+        """
 
         # Define starting and ending alpha values
         start_alpha = 255 if reverse else 0  # Starting alpha for the next image
         end_alpha = 0 if reverse else 255  # Ending alpha for the next image
-        alpha_step = end_alpha / (duration * 100)  # Calculate alpha increment per frame
-
-        # Perform the fade in transition
-        while time.time() < end_time:
-            # Calculate elapsed time and current alpha based on progress
-            elapsed_time = time.time() - start_time
-            progress = elapsed_time / duration
-            alpha = start_alpha + (end_alpha - start_alpha) * progress
-
-            # Clear screen and draw images with updated alpha
-            screen.fill((0, 0, 0))
-            prev_image.set_alpha(int(255 - alpha) if not reverse else int(alpha))
-            next_image.set_alpha(int(alpha) if not reverse else int(255 - alpha))
-            screen.blit(prev_image, (
-                (window_size[0] - prev_image.get_width()) // 2, (window_size[1] - prev_image.get_height()) // 2))
-            screen.blit(next_image, (
-                (window_size[0] - next_image.get_width()) // 2, (window_size[1] - next_image.get_height()) // 2))
-            pygame.display.flip()
+        alpha = start_alpha + (end_alpha - start_alpha) * progress
 
-            # Delay to control frame rate
-            pygame.time.delay(10)
+        # Clear screen and draw images with updated alpha
+        screen.fill((0, 0, 0))
+        prev_image.set_alpha(int(255 - alpha) if not reverse else int(alpha))
+        next_image.set_alpha(int(alpha) if not reverse else int(255 - alpha))
+        screen.blit(prev_image, (
+            (window_size[0] - prev_image.get_width()) // 2, (window_size[1] - prev_image.get_height()) // 2))
+        screen.blit(next_image, (
+            (window_size[0] - next_image.get_width()) // 2, (window_size[1] - next_image.get_height()) // 2))
 
     @staticmethod
-    def partial_sliding(prev_image, next_image, window_size, screen, duration=1, reverse=False):
+    def partial_sliding(prev_image, next_image, window_size, screen, duration=1, reverse=False, general=None):
         """
         Perform a partial sliding transition where the next slide slides in partially from the bottom.
+        Going back plays the general transition instead, taken from the compiled ``TransitionSettings`` in
+        general (e.g. ``TransitionPlan.general``).
         """
         if reverse:
-            SlideTransition.choose_transition(prev_image, next_image, window_size, screen,
-                                              TransitionsConfig.general_settings["transition"],
-                                              float(
-                                                  TransitionsConfig.general_settings["transition-duration"]
-                                                      .replace('s', '')), reverse=False)
-            # SlideTransition.fade_in(prev_image, next_image, window_size, screen, duration)
+            if general is None:
+                raise ValueError("Going back from a partial sliding transition needs the general transition settings")
+            SlideTransition.play(general.draw_frame, prev_image, next_image, window_size, screen, general.duration)
         else:
-            # Record the start and end time for the transition
-            start_time = time.time()
-            end_time = start_time + duration
+            SlideTransition.play(SlideTransition.partial_sliding_frame, prev_image, next_image, window_size, screen,
+                                 duration)
 
-            # Calculate start and end positions for both images
-            prev_start_pos = (window_size[1] - prev_image.get_height()) // 2
-            next_start_pos = window_size[1]
-            halfway_pos = window_size[1] / 4
+    @staticmethod
+    def partial_sliding_frame(prev_image, next_image, window_size, screen, progress, reverse=False):
+        """
+        Draws the frame of a partial sliding transition at the given progress (0 to 1).
+        """
 
-            # Distance the next slide needs to move
-            distance_to_move = next_start_pos - (prev_start_pos + prev_image.get_height())
+        # Calculate start and end positions for both images
+        prev_start_pos = (window_size[1] - prev_image.get_height()) // 2
+        next_start_pos = window_size[1]
+        halfway_pos = window_size[1] / 4
 
-            # Perform the partial sliding transition
-            while time.time() < end_time:
-                elapsed_time = time.time() - start_time
-                progress = elapsed_time / duration
+        # Distance the next slide needs to move
+        distance_to_move = next_start_pos - (prev_start_pos + prev_image.get_height())
 
-                # Move previous image up halfway and next image up from the bottom to just below the previous image
-                y_pos_prev = prev_start_pos - halfway_pos * progress
+        # Move previous image up halfway and next image up from the bottom to just below the previous image
+        y_pos_prev = prev_start_pos - halfway_pos * progress
 
-                # Calculate current vertical position of the next slide
-                y_pos_next = next_start_pos - (halfway_pos + distance_to_move) * progress
+        # Calculate current vertical position of the next slide
+        y_pos_next = next_start_pos - (halfway_pos + distance_to_move) * progress
 
-                screen.fill((0, 0, 0))
-                screen.blit(prev_image, ((window_size[0] - prev_image.get_width()) // 2, y_pos_prev))
-                screen.blit(next_image, ((window_size[0] - next_image.get_width()) // 2, y_pos_next))
-                pygame.display.flip()
-                pygame.time.delay(10)
+        screen.fill((0, 0, 0))
+        screen.blit(prev_image, ((window_size[0] - prev_image.get_width()) // 2, y_pos_prev))
+        screen.blit(next_image, ((window_size[0] - next_image.get_width()) // 2, y_pos_next))
 
     @staticmethod
-    def choose_transition(prev_image, next_image, window_size, screen, transition_type, duration, reverse=False):
+    def frame_function(transition_type):
+        """
+        Returns the function drawing single frames of the given transition type, or None if it is unknown.
+        """
+        return {
+            'pull': SlideTransition.pull_frame,
+            'fade_out_slide_in': SlideTransition.fade_out_slide_in_frame,
+            'swipe_right': SlideTransition.swipe_right_frame,
+            'swipe_left': SlideTransition.swipe_left_frame,
+            'partial_sliding': SlideTransition.partial_sliding_frame,
+            'fade_in': SlideTransition.fade_in_frame,
+        }.get(transition_type)
+
+    @staticmethod
+    def choose_transition(prev_image, next_image, window_size, screen, transition_type, duration, reverse=False,
+                          general=None):
         """
         Choose and apply the appropriate transition method based on the transition type.
+        general holds the compiled general ``TransitionSettings``, played when going back from a partial slide.
+        Raises ValueError for unknown transition types.
         """
+        transition = {
+            'pull': SlideTransition.pull,
+            'fade_out_slide_in': SlideTransition.fade_out_slide_in,
+            'swipe_right': SlideTransition.swipe_right,
+            'swipe_left': SlideTransition.swipe_left,
+            'partial_sliding': SlideTransition.partial_sliding,
+            'fade_in': SlideTransition.fade_in,
+        }.get(transition_type)
+        if transition is None:
+            raise ValueError(f"Unknown transition: {transition_type}")
 
         # Reset alpha values to full opacity before starting any transition
         prev_image.set_alpha(SlideTransition.preset_alpha)
         next_image.set_alpha(SlideTransition.preset_alpha)
 
-        # Call the appropriate transition method based on the transition type
-        if transition_type == 'pull':
-            SlideTransition.pull(prev_image, next_image, window_size, screen, duration, reverse)
-        elif transition_type == 'fade_out_slide_in':
-            SlideTransition.fade_out_slide_in(prev_image, next_image, window_size, screen, duration, reverse)
-        elif transition_type == 'swipe_right':
-            SlideTransition.swipe_right(prev_image, next_image, window_size, screen, duration, reverse)
-        elif transition_type == 'swipe_left':
-            SlideTransition.swipe_left(prev_image, next_image, window_size, screen, duration, reverse)
-        elif transition_type == 'partial_sliding':
-            SlideTransition.partial_sliding(prev_image, next_image, window_size, screen, duration, reverse=reverse)
-        elif transition_type == 'fade_in':
-            SlideTransition.fade_in(prev_image, next_image, window_size, screen, duration, reverse)
+        # Call the transition method of the transition type
+        if transition_type == constant.PARTIAL_SLIDE_TRANSITION:
+            transition(prev_image, next_image, window_size, screen, duration, reverse=reverse, general=general)
+        else:
+            transition(prev_image, next_image, window_size, screen, duration, reverse=reverse)
 
-    @staticmethod
-    def apply_transition(prev_page, images, state, reverse=False):
+
+def set_partial_slide_positions(prev_page, images, state):
+    """
+    Sets the slide positions reached at the end of a partial slide transition.
+    """
+    halfway_pos = state.window_size[1] / 4
+    prev_start_pos = ((state.window_size[1] - images[prev_page].get_height()) // 2)
+    state.prev_slide_position = prev_start_pos - halfway_pos
+    state.next_slide_position = state.prev_slide_position + images[prev_page].get_height()
+
+
+class TransitionPlayer:
+    """
+    Plays slide transitions one frame at a time, advanced from the main loop, so input keeps being handled while
+    a transition runs.
+
+    Progress is measured on a monotonic clock and eased with the easing configured for the slide. New frames are
+    only produced at the target frame rate, however often the main loop runs. When a new navigation arrives while
+    a transition is playing, the running transition is either skipped to its end before the new one starts
+    ('skip'), or replaced by a transition that starts from the frame currently on screen ('collapse'), so rapid
+    clicks never queue up transitions.
+    """
+
+    def __init__(self, fps=constant.TRANSITION_FPS, interrupt=constant.TRANSITION_INTERRUPT, clock=time.monotonic):
+        self.frame_interval = 1 / fps  # Seconds between two frames
+        self.interrupt = interrupt  # 'skip' or 'collapse'
+        self.clock = clock
+        self.transition = None  # The transition being played, or None
+        self.progress = 0  # Eased progress of the frame to draw, from 0 to 1
+        self.frame = 0  # Number of the frame to draw, bumped whenever a new frame is due
+        self.next_frame_time = 0
+        self.started = 0  # Transitions started
+        self.interrupted = 0  # Transitions skipped or collapsed by a new navigation
+
+    @property
+    def active(self):
         """
-        Applies a transition effect between slides, based on the transition configuration.
+        Returns True while a transition is being played.
         """
+        return self.transition is not None
 
-        # Reset alpha values before applying the transition
-        images[prev_page].set_alpha(SlideTransition.preset_alpha)
-        images[state.current_page].set_alpha(SlideTransition.preset_alpha)
-
-        transition_config = TransitionsConfig.get_transition_config(state)
-        transition_type = transition_config["transition"]  # Get the transition type
-        duration = float(transition_config["duration"].replace('s', ''))  # Get the transition duration
-        SlideTransition.choose_transition(images[prev_page], images[state.current_page], state.window_size,
-                                          state.screen, transition_type,
-                                          duration, reverse)  # Apply the transition
-        if transition_type == constant.PARTIAL_SLIDE_TRANSITION:
-            # Calculate positions for partial slide transitions
-            halfway_pos = state.window_size[1] / 4
-            prev_start_pos = ((state.window_size[1] - images[prev_page].get_height()) // 2)
-            state.prev_slide_position = prev_start_pos - halfway_pos
-            state.next_slide_position = state.prev_slide_position + images[prev_page].get_height()
+    def start(self, prev_page, images, state, reverse=False):
+        """
+        Starts the configured transition from the previous page to the current page.
+        Returns the position of the next slide reached once a partial slide transition has played.
+        """
+        settings = state.transition_plan[state.current_page]
+        if settings.transition == constant.PARTIAL_SLIDE_TRANSITION:
+            set_partial_slide_positions(prev_page, images, state)
+            if reverse:
+                # Going back from a partial slide uses the general transition
+                settings = state.transition_plan.general
+                reverse = False
+
+        prev_image = None  # Drawn from the previous page
+        if self.transition is not None:
+            self.interrupted += 1
+            if self.interrupt == 'collapse' and settings.transition != constant.PARTIAL_SLIDE_TRANSITION:
+                prev_image = state.screen.copy()  # Continue from exactly what the audience sees
+
+        self.finish(images)
+        if settings.duration <= 0:
+            return state.next_slide_position  # Nothing to play
+
+        images[prev_page].set_alpha(SlideTransition.opaque_alpha)
+        images[state.current_page].set_alpha(SlideTransition.opaque_alpha)
+        now = self.clock()
+        self.transition = {"draw_frame": settings.draw_frame, "prev_page": prev_page,
+                           "next_page": state.current_page, "prev_image": prev_image, "start_time": now,
+                           "duration": settings.duration, "easing": settings.easing, "reverse": reverse}
+        self.progress = 0
+        self.frame += 1
+        self.next_frame_time = now + self.frame_interval
+        self.started += 1
         return state.next_slide_position
 
+    def advance(self, images):
+        """
+        Moves the transition to the frame due at the current time. Returns True if a new frame has to be drawn.
+        """
+        if self.transition is None:
+            return False
+        now = self.clock()
+        if now < self.next_frame_time:
+            return False  # Hold the frame rate, however often the main loop runs
+        self.next_frame_time = max(self.next_frame_time + self.frame_interval, now)
+        linear_progress = (now - self.transition["start_time"]) / self.transition["duration"]
+        if linear_progress >= 1:
+            self.finish(images)  # Finished; the slides are left opaque and drawn as they are from now on
+            return True
+        self.progress = self.transition["easing"](linear_progress)
+        self.frame += 1
+        return True
+
+    def time_to_next_frame(self):
+        """
+        Returns the seconds until the next frame is due, or None when no transition is playing.
+        """
+        if self.transition is None:
+            return None
+        return max(0, self.next_frame_time - self.clock())
+
+    def draw(self, images, state):
+        """
+        Draws the current frame of the transition.
+        """
+        transition = self.transition
+        prev_image = transition["prev_image"] or images[transition["prev_page"]]
+        with profiler.phase("transition"):
+            transition["draw_frame"](prev_image, images[transition["next_page"]], state.window_size, state.screen,
+                                     self.progress, transition["reverse"])
+
+    def finish(self, images):
+        """
+        Skips the transition being played to its end.
+        """
+        if self.transition is not None:
+            images[self.transition["prev_page"]].set_alpha(SlideTransition.opaque_alpha)
+            images[self.transition["next_page"]].set_alpha(SlideTransition.opaque_alpha)
+            self.transition = None
+            self.frame += 1
+
+    def stats(self):
+        """
+        Returns the transition counters.
+        """
+        return {"started": self.started, "interrupted": self.interrupted}
+
 
 def scroll_slide(images, direction, state):
     """
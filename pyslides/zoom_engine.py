@@ -0,0 +1,148 @@
+import math
+import time
+from collections import OrderedDict
+
+import fitz  # PyMuPDF for PDF processing
+import pygame
+
+from pyslides import constant
+from pyslides.pdf_processor import EXACT_RES_FACTOR, page_zoom_factor, samples_to_surface
+from pyslides.slide_cache import surface_bytes, to_display_format
+
+
+class ZoomEngine:
+    """
+    Draws zoomed-in slides sharply by rendering only the visible region from the PDF vectors.
+
+    The zoomed slide is split into fixed-size tiles, each rasterized from the page with a clip rectangle and kept
+    in an LRU tile cache, so panning only renders the tiles that scroll into view. Missing tiles are rendered
+    within a per-frame time budget, closest to the centre of the view first; until they are ready the visible
+    region of the slide itself is scaled up in their place.
+    """
+
+    def __init__(self, pdf_path, tile_size=constant.ZOOM_TILE_SIZE, budget=constant.ZOOM_TILE_CACHE_BUDGET,
+                 frame_budget=constant.ZOOM_TILE_FRAME_BUDGET):
+        self.pdf_path = str(pdf_path)
+        self.tile_size = tile_size
+        self.budget = budget  # Maximum bytes held by the tile cache
+        self.frame_budget = frame_budget  # Seconds per frame spent rendering missing tiles
+        self.pdf_document = None  # Only opened once a slide is zoomed into
+        self.display_list = None  # (page number, display list) of the last zoomed page, to render tiles quickly
+        self.tiles = OrderedDict()  # (page, zoom factor, column, row) -> (Surface, origin), least recently used first
+        self.tile_bytes = 0
+        self.pending = False  # Whether tiles of the last drawn view are still missing
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def viewport(image_size, zoom_level, zoom_pos, window_size):
+        """
+        Returns the region of the zoomed slide shown in the window, in zoomed slide pixels. The zoom position
+        is moved to the centre of the window, as far as the edges of the zoomed slide allow.
+        """
+        zoomed_size = (int(image_size[0] * zoom_level), int(image_size[1] * zoom_level))
+        offset_x = int(zoom_pos[0] * zoom_level) - window_size[0] // 2
+        offset_y = int(zoom_pos[1] * zoom_level) - window_size[1] // 2
+        view = pygame.Rect(offset_x, offset_y, window_size[0], window_size[1])
+        return view.clamp(pygame.Rect((0, 0), zoomed_size))  # Ensure the view stays within the zoomed slide
+
+    def draw(self, screen, image, page_num, zoom_level, zoom_pos, window_size):
+        """
+        Draws the visible region of a slide at the given zoom level.
+        """
+        view = ZoomEngine.viewport(image.get_size(), zoom_level, zoom_pos, window_size)
+        page = self.load_page(page_num)
+        zoom_factor = round(page_zoom_factor(page.rect, window_size, EXACT_RES_FACTOR) * zoom_level, 6)
+
+        # A zoomed slide smaller than the window is centred, so the view may reach past its edges; only the
+        # tiles covering the page are drawn
+        columns = math.ceil(page.rect.width * zoom_factor / self.tile_size)
+        rows = math.ceil(page.rect.height * zoom_factor / self.tile_size)
+        tiles, missing = [], []
+        for row in range(max(0, view.top // self.tile_size), min(rows, (view.bottom - 1) // self.tile_size + 1)):
+            for column in range(max(0, view.left // self.tile_size),
+                                min(columns, (view.right - 1) // self.tile_size + 1)):
+                key = (page_num, zoom_factor, column, row)
+                tile = self.tiles.get(key)
+                if tile is not None:
+                    self.hits += 1
+                    self.tiles.move_to_end(key)
+                    tiles.append(tile)
+                else:
+                    missing.append(key)
+
+        # Render the missing tiles closest to the centre of the view first, within the frame budget
+        missing.sort(key=lambda key: math.hypot((key[2] + 0.5) * self.tile_size - view.centerx,
+                                                (key[3] + 0.5) * self.tile_size - view.centery))
+        deadline = time.perf_counter() + self.frame_budget
+        rendered = 0
+        while missing and (rendered == 0 or time.perf_counter() < deadline):  # At least one tile per frame
+            tile = self.render_tile(missing.pop(0))
+            if tile is not None:
+                tiles.append(tile)
+            rendered += 1
+
+        self.pending = bool(missing)
+        if missing:
+            # Stand in for the tiles that are not rendered yet with the visible region of the slide, scaled up
+            source = pygame.Rect(view.left / zoom_level, view.top / zoom_level, math.ceil(view.width / zoom_level),
+                                 math.ceil(view.height / zoom_level)).clip(image.get_rect())
+            if source.width and source.height:
+                scaled = pygame.transform.scale(image.subsurface(source), (round(source.width * zoom_level),
+                                                                           round(source.height * zoom_level)))
+                screen.blit(scaled, (round(source.left * zoom_level) - view.left,
+                                     round(source.top * zoom_level) - view.top))
+        for surface, (x, y) in tiles:
+            screen.blit(surface, (x - view.left, y - view.top))
+
+    def load_page(self, page_num):
+        """
+        Returns the given page of the PDF, opening the document on first use.
+        """
+        if self.pdf_document is None:
+            self.pdf_document = fitz.open(self.pdf_path)
+        return self.pdf_document.load_page(page_num)
+
+    def render_tile(self, key):
+        """
+        Rasterizes a single tile from the PDF and adds it to the tile cache. Returns None for a tile outside
+        the page.
+        """
+        page_num, zoom_factor, column, row = key
+        self.misses += 1
+        if self.display_list is None or self.display_list[0] != page_num:
+            # Interpreting the page once makes every further tile of it much cheaper to render
+            self.display_list = (page_num, self.load_page(page_num).get_displaylist())
+        page_rect = self.display_list[1].rect
+        clip = (fitz.Rect(column, row, column + 1, row + 1) * (self.tile_size / zoom_factor)) & page_rect
+        if clip.is_empty or round(clip.width * zoom_factor) < 1 or round(clip.height * zoom_factor) < 1:
+            return None
+        pix = self.display_list[1].get_pixmap(matrix=fitz.Matrix(zoom_factor, zoom_factor), alpha=False, clip=clip)
+        surface = to_display_format(samples_to_surface(pix.samples, pix.width, pix.height, pix.n, pix.stride))
+        tile = (surface, (pix.x, pix.y))
+
+        self.tiles[key] = tile
+        self.tile_bytes += surface_bytes(tile[0])
+        while self.tile_bytes > self.budget and len(self.tiles) > 1:
+            _, (surface, _) = self.tiles.popitem(last=False)
+            self.tile_bytes -= surface_bytes(surface)
+        return tile
+
+    def reset(self):
+        """
+        Drops every cached tile.
+        """
+        self.tiles.clear()
+        self.tile_bytes = 0
+        self.display_list = None
+
+    def stats(self):
+        """
+        Returns the tile cache counters and size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "tiles": len(self.tiles),
+            "tile_bytes": self.tile_bytes,
+        }
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+
+from pyslides.annotation_journal import AnnotationJournal
+from pyslides.config.annotations_config import AnnotationsConfig
+from pyslides.page_transform import PageTransform
+from pyslides.strokes import Stroke
+
+
+class TestAnnotationJournal(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)  # Annotation files are written next to the working directory
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def edit(self, journal, text_annotations, pen_annotations):
+        """
+        Makes a few edits the way the event handler does, recording each of them.
+        """
+        stroke = Stroke.from_points([(0.1, 0.2), (0.3, 0.25)])
+        pen_annotations.setdefault(0, []).append(stroke)
+        journal.add_stroke(0, stroke)
+        for rect, text in (((0.1, 0.1, 0.3, 0.1), "first"), ((0.5, 0.5, 0.3, 0.1), "second"), (None, "")):
+            text_annotations.setdefault(2, []).append((rect, text))
+            journal.add_text(2, rect, text)
+        del text_annotations[2][0]  # Taken off the slide to move it
+        journal.remove_text(2, 0)
+        text_annotations[2].append(((0.2, 0.1, 0.3, 0.1), "first"))
+        journal.add_text(2, (0.2, 0.1, 0.3, 0.1), "first")
+
+    def test_edits_written_in_the_background_are_replayed(self):
+        journal = AnnotationJournal("deck.pdf", interval=0.01)
+        text_annotations, pen_annotations = journal.load()
+        journal.start()
+        self.edit(journal, text_annotations, pen_annotations)
+        journal.stop()
+
+        self.assertFalse(os.path.exists("deck_annotations.json"))  # Only journaled so far
+        self.assertEqual(AnnotationJournal("deck.pdf").load(), (text_annotations, pen_annotations))
+
+    def test_compaction_moves_the_journal_into_the_snapshot(self):
+        journal = AnnotationJournal("deck.pdf", compact_records=3)
+        text_annotations, pen_annotations = journal.load()
+        self.edit(journal, text_annotations, pen_annotations)
+        journal.flush(journal.queue)
+
+        self.assertEqual(os.path.getsize("deck_annotations.journal"), 0)
+        with open("deck_annotations.json") as f:
+            self.assertEqual(json.load(f)["sequence"], 6)
+        self.assertEqual(AnnotationJournal("deck.pdf").load(), (text_annotations, pen_annotations))
+
+    def test_crashes_while_writing_lose_nothing_that_was_written(self):
+        journal = AnnotationJournal("deck.pdf")
+        text_annotations, pen_annotations = journal.load()
+        self.edit(journal, text_annotations, pen_annotations)
+        journal.flush(journal.queue)
+        with open("deck_annotations.journal") as f:
+            records = f.read()
+        journal.compact()
+        with open("deck_annotations.journal", 'w') as f:  # Crashed before the journal was emptied...
+            f.write(records + '{"op":"add_text","pa')  # ...and in the middle of a later record
+
+        reloaded = AnnotationJournal("deck.pdf")
+        self.assertEqual(reloaded.load(), (text_annotations, pen_annotations))
+        self.assertTrue(reloaded.save_requested)  # The torn record is compacted away first
+
+    def test_legacy_files_are_migrated_and_saved_normalized(self):
+        with open("deck_annotations.json", 'w') as f:
+            json.dump({"text_annotations": {"1": [{"rect": [200, 125, 300, 60], "text": "note"}]},
+                       "pen_annotations": {"1": [[[100, 50], [500, 350]]]}}, f)
+        transform = PageTransform((100, 50, 400, 300))
+
+        journal = AnnotationJournal("deck.pdf")
+        text_annotations, pen_annotations = journal.load(lambda page: transform)
+        self.assertEqual(text_annotations, {1: [((0.25, 0.25, 0.75, 0.2), "note")]})
+        self.assert_points_equal(pen_annotations[1][0], [(0, 0), (1, 1)])
+
+        journal.flush([], compact=True)
+        text_annotations, pen_annotations, _ = AnnotationsConfig.load_annotations_from_json("deck_annotations.json")
+        self.assertEqual(text_annotations, {1: [((0.25, 0.25, 0.75, 0.2), "note")]})
+        self.assert_points_equal(pen_annotations[1][0], [(0, 0), (1, 1)])
+
+    def assert_points_equal(self, stroke, points):
+        self.assertEqual(len(stroke), len(points))
+        for point, expected in zip(stroke, points):
+            self.assertAlmostEqual(point[0], expected[0], places=6)
+            self.assertAlmostEqual(point[1], expected[1], places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
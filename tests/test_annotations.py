@@ -0,0 +1,111 @@
+import random
+import unittest
+
+import pygame
+
+from pyslides.annotations import AnnotationLayers, TextLayoutCache, annotations_edited
+from pyslides.page_transform import PageTransform
+from pyslides.state import AppState
+from pyslides.strokes import Stroke
+
+
+def wrap_words(font, text, max_width):
+    """
+    Reference word wrapping, summing the widths of the whole line for every word.
+    """
+    space_width = font.size(' ')[0]
+    lines, current_line = [], []
+    for word in text.split(' '):
+        word_width = font.size(word)[0]
+        if word_width > max_width:
+            continue
+        if sum(font.size(w)[0] for w in current_line) + word_width + space_width <= max_width:
+            current_line.append(word)
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+    if current_line:
+        lines.append(' '.join(current_line))
+    return tuple(lines)
+
+
+class TestTextLayoutCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 18)
+
+    def test_typing_wraps_like_a_full_wrap(self):
+        layouts = TextLayoutCache()
+        rng = random.Random(4)
+        text = ""
+        for _ in range(300):
+            if text and rng.random() < 0.15:
+                text = text[:-1]  # Backspace
+            else:
+                text += rng.choice("abcdefghij    ")
+            for width in (60, 150):
+                self.assertEqual(layouts.wrap(self.font, text, width), wrap_words(self.font, text, width))
+
+    def test_layouts_and_lines_are_reused(self):
+        layouts = TextLayoutCache()
+        text = "a note that is long enough to be wrapped over several lines"
+        lines = layouts.wrap(self.font, text, 100)
+        self.assertGreater(len(lines), 2)
+        self.assertIs(layouts.wrap(self.font, text, 100), lines)
+        self.assertEqual(layouts.stats()["hits"], 1)
+
+        surface = layouts.render_line(self.font, lines[0], (0, 0, 255))
+        self.assertIs(layouts.render_line(self.font, lines[0], (0, 0, 255)), surface)
+
+
+class TestAnnotationLayers(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.state = AppState()
+        self.state.text_annotations = {0: [((0.1, 0.1, 0.4, 0.15), "a note on the first slide")]}
+        self.state.pen_annotations = {0: [Stroke.from_points([(0.02, 0.025), (0.2, 0.3), (0.4, 0.1)])]}
+        self.transform = PageTransform((0, 0, 500, 400))
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def layer_bytes(self, layers):
+        layer, _ = layers.layer(self.state, 0, self.transform)
+        return pygame.image.tobytes(layer, "RGBA")
+
+    def test_edited_layer_matches_a_fresh_layer(self):
+        layers = AnnotationLayers()
+        self.layer_bytes(layers)
+        layer = layers.layers[0][0]
+
+        self.state.pen_annotations[0].append(Stroke.from_points([(0.12, 0.175), (0.6, 0.75)]))  # A new stroke over the text
+        annotations_edited(self.state, 0)
+        self.assertEqual(self.layer_bytes(layers), self.layer_bytes(AnnotationLayers()))
+        self.state.pen_annotations[0].append(Stroke.from_points([(0.04, 0.5), (0.48, 0.075)]))
+        self.state.text_annotations[0] = [((0.16, 0.15, 0.4, 0.15), "a note on the first slide")]  # Moved
+        annotations_edited(self.state, 0)
+        self.assertEqual(self.layer_bytes(layers), self.layer_bytes(AnnotationLayers()))
+        del self.state.pen_annotations[0][1]  # Erased; the strokes crossing it are patched
+        annotations_edited(self.state, 0)
+        self.assertEqual(self.layer_bytes(layers), self.layer_bytes(AnnotationLayers()))
+        self.assertIs(layers.layers[0][0], layer)  # Patched, not created again
+
+    def test_items_are_described_again_only_after_an_edit(self):
+        layers = AnnotationLayers()
+        items = layers.items(self.state, 0, self.transform)
+        self.assertIs(layers.items(self.state, 0, self.transform), items)
+        self.assertIsNot(layers.items(self.state, 0, PageTransform((0, 0, 250, 200))), items)  # Another size
+
+        self.state.pen_annotations[0].append(Stroke.from_points([(0.12, 0.175), (0.6, 0.75)]))
+        annotations_edited(self.state, 0)
+        self.assertEqual(len(layers.items(self.state, 0, self.transform)), len(items) + 1)
+
+    def test_only_recent_pages_keep_a_layer(self):
+        layers = AnnotationLayers(max_pages=2)
+        for page_num in range(4):
+            layers.layer(self.state, page_num, self.transform)
+        self.assertEqual(list(layers.layers), [2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+
+from pyslides.config_watcher import ConfigWatcher
+from pyslides.transition_plan import TransitionConfigError, TransitionPlan
+
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "deck.json")
+        self.plans, self.errors = [], []
+        self.watcher = ConfigWatcher(self.path, lambda path: TransitionPlan.load(path, 3), self.plans.append,
+                                     self.errors.append)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, config, mtime):
+        with open(self.path, 'w') as f:
+            f.write(config if isinstance(config, str) else json.dumps(config))
+        os.utime(self.path, (mtime, mtime))  # Distinct modification times, however fast the test runs
+
+    def test_changes_are_reloaded_and_errors_keep_the_last_good_config(self):
+        self.assertFalse(self.watcher.check())  # Nothing changed yet
+
+        self.write({"Slide 1": {"transition": "pull"}}, 1000)
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(self.plans[-1][1].transition, "pull")
+        self.assertFalse(self.watcher.check())  # Loaded once per change
+
+        self.write({"Slide 1": {"transition": "pul"}}, 1001)  # A typo
+        self.assertFalse(self.watcher.check())
+        self.write('{"Slide 1": {"transi', 1002)  # Caught while being written
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(len(self.plans), 1)
+        self.assertEqual(len(self.errors), 2)
+
+        self.write({"Slide 1": {"transition": "swipe_left"}}, 1003)  # Fixed
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(self.plans[-1][1].transition, "swipe_left")
+        self.assertEqual(self.watcher.stats(), {"reloads": 2, "errors": 2})
+
+    def test_the_watcher_thread_survives_a_malformed_edit(self):
+        def load(path):
+            with open(path) as f:
+                if f.read() == "crash":
+                    raise TypeError("not a configuration")  # Whatever the loader may raise
+            return TransitionPlan.load(path, 3)
+
+        self.watcher.load = load
+        self.watcher.interval = 0.01
+        self.watcher.start()
+        self.write({"Slide 1": "pull"}, 1000)  # Valid JSON of the wrong shape
+        self.wait_for(lambda: any(isinstance(error, TransitionConfigError) for error in self.errors))
+        self.write("crash", 1001)
+        self.wait_for(lambda: any(isinstance(error, TypeError) for error in self.errors))
+        self.write({"Slide 1": {"transition": "pull"}}, 1002)  # Fixed
+        self.wait_for(lambda: self.plans)
+        self.watcher.stop()
+        self.assertEqual(self.plans[-1][1].transition, "pull")
+        self.assertEqual(self.watcher.stats()["reloads"], 1)  # Files caught while being written add errors
+
+    def wait_for(self, condition):
+        for _ in range(500):
+            if condition():
+                return
+            self.watcher.stopped.wait(0.01)
+
+    def test_the_watcher_thread_polls_in_the_background(self):
+        self.watcher.interval = 0.01
+        self.watcher.start()
+        self.write({"General": {"transition": "pull"}}, 1000)
+        for _ in range(500):
+            if self.plans:
+                break
+            self.watcher.stopped.wait(0.01)
+        self.watcher.stop()
+        self.assertEqual(self.plans[0].general.transition, "pull")
+
+
+if __name__ == '__main__':
+    unittest.main()
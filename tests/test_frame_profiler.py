@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from pyslides.frame_profiler import NULL_PHASE, PHASES, FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_disabled_profiler_records_nothing(self):
+        profiler = FrameProfiler()
+        self.assertIs(profiler.phase("slide"), NULL_PHASE)
+        profiler.begin_frame()
+        with profiler.phase("slide"):
+            pass
+        profiler.end_frame()
+        self.assertEqual(profiler.window, [])
+
+    def test_nested_phases_are_not_counted_twice(self):
+        profiler = FrameProfiler(refresh_interval=0)
+        profiler.toggle_hud()
+        profiler.begin_frame()
+        with profiler.phase("slide"):
+            with profiler.phase("transition"):
+                time.sleep(0.02)
+        profiler.end_frame()  # Summarized right away
+
+        self.assertEqual(len(profiler.summary), 2 + len(PHASES))
+        rows = dict(profiler.summary)
+        transition = float(rows["transition"].split()[0])
+        slide = float(rows["slide"].split()[0])
+        self.assertGreaterEqual(transition, 20)
+        self.assertLess(slide, 10)
+
+    def test_trace_is_written_in_the_chrome_format(self):
+        profiler = FrameProfiler()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            profiler.start_trace(path)
+            for _ in range(2):
+                profiler.begin_frame()
+                with profiler.phase("events"):
+                    pass
+                profiler.end_frame(drawn=False)
+            profiler.stop_trace()
+            self.assertFalse(profiler.enabled)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual([event["name"] for event in events], ["events", "frame"] * 2)
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+        self.assertLessEqual(events[1]["ts"], events[0]["ts"])  # The frame encloses its phases
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import pygame
+
+from pyslides.overlay import OverlayEngine, merge_highlight
+
+
+class TestOverlay(unittest.TestCase):
+    window_size = (320, 240)
+
+    def frame(self, overlay, draw, *args):
+        screen = pygame.Surface(self.window_size)
+        screen.fill((255, 255, 255))
+        draw(overlay, screen, *args, self.window_size)
+        return pygame.image.tobytes(screen, "RGB")
+
+    def test_highlights_are_merged_into_disjoint_regions(self):
+        regions = []
+        merge_highlight(regions, pygame.Rect(10, 10, 100, 100))
+        merge_highlight(regions, pygame.Rect(50, 50, 100, 100))
+        merge_highlight(regions, pygame.Rect(20, 20, 30, 30))  # Already highlighted
+        merge_highlight(regions, pygame.Rect(200, 200, 0, 0))  # A click without a drag
+
+        self.assertEqual(sum(rect.width * rect.height for rect in regions), 2 * 100 * 100 - 60 * 60)
+        for i, rect in enumerate(regions):
+            self.assertEqual(rect.collidelist(regions[i + 1:]), -1)
+
+    def test_moved_spotlight_matches_a_fresh_overlay(self):
+        overlay = OverlayEngine()
+        self.frame(overlay, OverlayEngine.draw_spotlight, (100, 100), 50)
+        layer = overlay.layer
+        moved = self.frame(overlay, OverlayEngine.draw_spotlight, (130, 90), 40)
+
+        self.assertIs(overlay.layer, layer)  # Patched, not created again
+        self.assertEqual(moved, self.frame(OverlayEngine(), OverlayEngine.draw_spotlight, (130, 90), 40))
+
+    def test_rubber_band_and_committed_highlights_match_a_fresh_overlay(self):
+        overlay = OverlayEngine()
+        regions = [pygame.Rect(20, 20, 80, 60)]
+        for corner in ((150, 150), (90, 70), (200, 100)):
+            live = pygame.Rect(60, 40, corner[0] - 60, corner[1] - 40)
+            self.frame(overlay, OverlayEngine.draw_highlight, regions, live)
+        merge_highlight(regions, live)
+        committed = self.frame(overlay, OverlayEngine.draw_highlight, regions, None)
+
+        self.assertEqual(committed, self.frame(OverlayEngine(), OverlayEngine.draw_highlight, regions, None))
+
+    def test_reformatted_layer_keeps_its_holes(self):
+        pygame.display.init()
+        try:
+            pygame.display.set_mode(self.window_size)
+            overlay = OverlayEngine()
+            spotlight = self.frame(overlay, OverlayEngine.draw_spotlight, (100, 100), 50)
+            self.assertTrue(overlay.layer.get_flags() & pygame.SRCALPHA)
+
+            overlay.reformat()
+            self.assertEqual(self.frame(overlay, OverlayEngine.draw_spotlight, (100, 100), 50), spotlight)
+        finally:
+            pygame.display.quit()
+
+
+if __name__ == '__main__':
+    unittest.main()
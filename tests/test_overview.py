@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+import fitz
+import pygame
+
+from pyslides.overview import OverviewGrid, ThumbnailAtlas
+
+
+class TestOverviewGrid(unittest.TestCase):
+    def setUp(self):
+        # Create a PDF with more slides than fit in the window
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.temp_dir.name, "deck.pdf")
+        document = fitz.open()
+        for page_num in range(100):
+            page = document.new_page(width=720, height=540)
+            page.insert_text((72, 72), f"Slide {page_num}", fontsize=36)
+        document.save(self.pdf_path)
+        document.close()
+        self.window_size = (800, 600)
+        self.screen = pygame.Surface(self.window_size)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_page_at_matches_thumbnail_positions(self):
+        grid = OverviewGrid(self.pdf_path)
+        grid.scroll_to(60, self.window_size)
+        width, height = grid.load_atlas().thumbnail_size
+        for page_num in grid.visible_pages(self.window_size):
+            x, y = grid.thumbnail_position(page_num, self.window_size)
+            if 0 <= y and y + height <= self.window_size[1]:
+                self.assertEqual(grid.page_at((x, y), self.window_size), page_num)
+                self.assertEqual(grid.page_at((x + width - 1, y + height - 1), self.window_size), page_num)
+                self.assertIsNone(grid.page_at((x + width, y), self.window_size))  # On the margin
+
+    def test_only_visible_thumbnails_are_rendered(self):
+        grid = OverviewGrid(self.pdf_path)
+        for _ in range(100):  # At least one thumbnail is rendered per frame
+            grid.draw(self.screen, 0, self.window_size)
+        visible_pages = grid.visible_pages(self.window_size)
+        self.assertEqual([page_num for page_num, rendered in enumerate(grid.atlas.rendered) if rendered],
+                         list(visible_pages))
+        self.assertLess(len(visible_pages), 100)
+
+    def test_scroll_to_shows_the_page(self):
+        grid = OverviewGrid(self.pdf_path)
+        grid.scroll_to(99, self.window_size)
+        self.assertIn(99, grid.visible_pages(self.window_size))
+        self.assertEqual(grid.scroll, grid.max_scroll(self.window_size))
+        grid.scroll_by(-1000, self.window_size)
+        self.assertEqual(grid.scroll, 0)
+
+    def test_thumbnails_are_rendered_from_the_pdf(self):
+        atlas = ThumbnailAtlas(self.pdf_path, thumbnail_width=96)
+        atlas.render(10)
+        sheet, area = atlas.area(10)
+
+        with fitz.open(self.pdf_path) as pdf_document:
+            page = pdf_document.load_page(10)
+            zoom_factor = min(area.width / page.rect.width, area.height / page.rect.height)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom_factor, zoom_factor), alpha=False)
+        self.assertEqual(area.size, (pix.width, pix.height))
+        self.assertEqual(pygame.image.tobytes(sheet.subsurface(area), "RGB"), pix.samples)
+
+    def test_reformat_converts_the_sheets_and_composes_the_frame_again(self):
+        pygame.display.init()
+        try:
+            screen = pygame.display.set_mode(self.window_size)
+            grid = OverviewGrid(self.pdf_path)
+            grid.scroll_to(40, self.window_size)
+            for _ in range(100):
+                grid.draw(self.screen, 40, self.window_size)
+            drawn = pygame.image.tobytes(self.screen, "RGB")
+
+            grid.reformat()
+            self.assertIsNone(grid.frame)
+            grid.draw(self.screen, 40, self.window_size)
+            self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), drawn)
+            for surface in list(grid.atlas.sheets.values()) + [grid.frame]:
+                self.assertEqual((surface.get_bitsize(), surface.get_masks()),
+                                 (screen.get_bitsize(), screen.get_masks()))
+        finally:
+            pygame.display.quit()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+import pygame
+
+from pyslides.page_transform import PageTransform, page_transform
+from pyslides.strokes import Stroke
+
+
+class TestPageTransform(unittest.TestCase):
+    def test_slides_are_centred_like_display_slide(self):
+        transform = page_transform((1000, 700), (800, 600))
+        self.assertEqual(transform.slide_rect, pygame.Rect(100, 50, 800, 600))
+        self.assertIs(page_transform((1000, 700), (800, 600)), transform)
+
+    def test_screen_coordinates_round_trip(self):
+        transform = PageTransform((37, 12, 801, 599))
+        rect = pygame.Rect(120, 80, 213, 67)
+        self.assertEqual(transform.to_screen_rect(transform.to_page_rect(rect)), rect)
+        stroke = Stroke.from_points([(40, 15), (300, 402), (837, 610)])
+        self.assertEqual(list(transform.to_screen_stroke(transform.to_page_stroke(stroke))), list(stroke))
+
+    def test_size_switches_do_not_move_annotations(self):
+        windowed, fullscreen = page_transform((1280, 720), (960, 720)), page_transform((1920, 1080), (1440, 1080))
+        rect = windowed.to_page_rect(pygame.Rect(250, 140, 300, 90))
+        stroke = windowed.to_page_stroke(Stroke.from_points([(250, 140), (400, 300), (613, 211)]))
+        for _ in range(20):  # Stored once, only ever mapped to the screen
+            fullscreen.to_screen_rect(rect), fullscreen.to_screen_stroke(stroke)
+        self.assertEqual(windowed.to_screen_rect(rect), pygame.Rect(250, 140, 300, 90))
+        self.assertEqual(list(windowed.to_screen_stroke(stroke)), [(250, 140), (400, 300), (613, 211)])
+        self.assertEqual(fullscreen.to_screen_rect(rect), pygame.Rect(375, 210, 450, 135))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import fitz
+import pygame
+
+from pyslides import constant
+from pyslides import pdf_processor
+from pyslides.pdf_processor import EXACT_RES_FACTOR, open_worker_document, render_page_samples, \
+    render_worker_page_samples, samples_to_surface, scale_image_to_fit, slide_size
+
+
+class TestPdfProcessor(unittest.TestCase):
+    def setUp(self):
+        # Create a small PDF with a distinct label on each page
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.temp_dir.name, "deck.pdf")
+        document = fitz.open()
+        for page_num in range(5):
+            page = document.new_page(width=720, height=540)
+            page.insert_text((72, 72), f"Slide {page_num}", fontsize=36)
+        document.save(self.pdf_path)
+        document.close()
+        self.window_size = (constant.SCREEN_WIDTH, constant.SCREEN_HEIGHT)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_exact_renders_have_the_slide_size(self):
+        with fitz.open(self.pdf_path) as document:
+            page = document.load_page(0)
+            width, height, _, _, _ = render_page_samples(page, self.window_size, EXACT_RES_FACTOR)
+            self.assertEqual((width, height), slide_size(page.rect, self.window_size))
+
+    def test_workers_render_from_the_document_they_opened(self):
+        open_worker_document(self.pdf_path)  # As the initializer of a worker process
+        try:
+            document = pdf_processor.worker_document
+            page_samples = [render_worker_page_samples(page_num, self.window_size, EXACT_RES_FACTOR)
+                            for page_num in (3, 1, 4)]
+            self.assertIs(pdf_processor.worker_document, document)  # Opened once
+            self.assertEqual(page_samples, [render_page_samples(document.load_page(page_num), self.window_size,
+                                                                EXACT_RES_FACTOR) for page_num in (3, 1, 4)])
+        finally:
+            pdf_processor.worker_document.close()
+            pdf_processor.worker_document = None
+
+    def test_padded_rows_are_repacked(self):
+        rows = [bytes([row] * 6) + b"\xff\xff" for row in range(3)]  # 2 RGB pixels and 2 bytes of padding per row
+        surface = samples_to_surface(b"".join(rows), 2, 3, 3, 8)
+        self.assertEqual(pygame.image.tobytes(surface, "RGB"), b"".join(bytes([row] * 6) for row in range(3)))
+
+    def test_scaled_images_keep_their_aspect_ratio(self):
+        image = scale_image_to_fit(pygame.Surface((720, 540)), self.window_size)
+        self.assertEqual(image.get_size(), (self.window_size[0], self.window_size[0] * 3 // 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
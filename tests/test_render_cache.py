@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import fitz
+import pygame
+
+from pyslides import constant
+from pyslides.render_cache import RenderCache
+from pyslides.render_service import RenderService
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        # Create a small PDF and an empty cache folder
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.pdf_path = os.path.join(self.temp_dir.name, "a.b.pdf")
+        document = fitz.open()
+        for page_num in range(3):
+            page = document.new_page(width=720, height=540)
+            page.insert_text((72, 72), f"Slide {page_num}", fontsize=36)
+        document.save(self.pdf_path)
+        document.close()
+        self.window_size = (constant.SCREEN_WIDTH, constant.SCREEN_HEIGHT)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def render(self, cache, window_size):
+        """
+        Renders the deck for the given window size and waits until it has been saved to the cache.
+        """
+        service = RenderService(self.pdf_path, window_size, render_cache=cache)
+        service.start()
+        deadline = time.time() + 10
+        while service.store is None and time.time() < deadline:
+            time.sleep(0.01)
+        service.stop()
+        self.assertIsNotNone(service.store)
+        return service
+
+    def test_warm_start_does_not_open_pdf(self):
+        rendered = [pygame.image.tobytes(image, "RGB") for image in self.render(RenderCache(self.pdf_path,
+                                                                                            self.cache_dir),
+                                                                                self.window_size).images]
+
+        with patch('fitz.open', side_effect=AssertionError("PDF opened on a warm start")):
+            service = RenderService(self.pdf_path, self.window_size,
+                                    render_cache=RenderCache(self.pdf_path, self.cache_dir))
+            self.assertTrue(all(service.ready))
+            self.assertEqual([pygame.image.tobytes(image, "RGB") for image in service.images], rendered)
+            self.assertEqual(service.stats()["rendered"], 0)
+            self.assertEqual(service.stats()["loaded_from_cache"], 3)  # Every page served from the pixel store
+
+    def test_manifest_records_pixel_stores_per_size(self):
+        cache = RenderCache(self.pdf_path, self.cache_dir)
+        self.render(cache, self.window_size)
+        self.render(cache, (400, 300))
+
+        with open(cache.manifest_path()) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["pdf_hash"], cache.pdf_hash)
+        self.assertEqual(manifest["page_count"], 3)
+        self.assertEqual(sorted(manifest["pixel_stores"]),
+                         sorted([RenderCache.variant_key(self.window_size), RenderCache.variant_key((400, 300))]))
+        stats = cache.stats()
+        self.assertEqual(stats["pixel_stores"], 2)
+        self.assertGreater(stats["disk_bytes"], os.path.getsize(cache.pixel_store_path(self.window_size)))
+
+    def test_changed_content_gets_a_new_cache_entry(self):
+        cache = RenderCache(self.pdf_path, self.cache_dir)
+        self.render(cache, self.window_size)
+
+        document = fitz.open()
+        document.new_page(width=720, height=540)
+        document.save(self.pdf_path)
+        document.close()
+
+        changed_cache = RenderCache(self.pdf_path, self.cache_dir)
+        self.assertNotEqual(changed_cache.pdf_hash, cache.pdf_hash)
+        self.assertIsNone(changed_cache.open_pixel_store(self.window_size))
+        self.assertEqual(len(self.render(changed_cache, self.window_size).images), 1)
+
+    def test_incomplete_pixel_store_is_not_used(self):
+        cache = RenderCache(self.pdf_path, self.cache_dir)
+        writer = cache.create_pixel_store_writer(self.window_size, [(2, 2)] * 3)
+        writer.write_page(0, bytes(12))
+        with self.assertRaises(ValueError):
+            cache.commit_pixel_store(self.window_size, writer)
+        writer.abort()
+
+        self.assertIsNone(cache.open_pixel_store(self.window_size))
+        self.assertEqual(os.listdir(cache.deck_folder), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
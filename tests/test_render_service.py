@@ -0,0 +1,154 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import fitz
+import pygame
+
+from pyslides import constant
+from pyslides.pdf_processor import EXACT_RES_FACTOR, PREVIEW_RES_FACTOR, render_page_samples
+from pyslides.render_cache import RenderCache
+from pyslides.render_service import RenderService
+
+
+class TestRenderService(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        # Create a small PDF with a distinct label on each page
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.temp_dir.name, "deck.pdf")
+        document = fitz.open()
+        for page_num in range(6):
+            page = document.new_page(width=720, height=540)
+            page.insert_text((72, 72), f"Slide {page_num}", fontsize=36)
+        document.save(self.pdf_path)
+        document.close()
+        self.window_size = (constant.SCREEN_WIDTH, constant.SCREEN_HEIGHT)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def wait_until_ready(self, service, timeout=10):
+        deadline = time.time() + timeout
+        while not all(service.ready) and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(all(service.ready))
+
+    def test_pages_are_queued_closest_to_focus_first(self):
+        service = RenderService(self.pdf_path, self.window_size)
+        service.focus(3)
+        order = [service.next_page() for _ in range(6)]
+        self.assertEqual(order, [3, 4, 2, 5, 1, 0])
+
+    def test_focused_page_gets_a_single_preview(self):
+        service = RenderService(self.pdf_path, self.window_size)
+        service.focus(2)
+        self.assertEqual(service.next_preview(), 2)
+        self.assertIsNone(service.next_preview())
+
+        # A preview is shown at the final slide size, without marking the page as ready
+        samples = render_page_samples(fitz.open(self.pdf_path).load_page(2), self.window_size,
+                                      render_scale=PREVIEW_RES_FACTOR)
+        service.deliver_preview(2, service.generation, self.window_size, samples)
+        self.assertEqual(service.images[2].get_size(), service.placeholder(2).get_size())
+        self.assertIsNot(service.images[2], service.placeholder(2))
+        self.assertFalse(service.is_ready(2))
+
+    def test_placeholders_have_the_final_slide_size(self):
+        service = RenderService(self.pdf_path, self.window_size)
+        placeholder_sizes = [image.get_size() for image in service.images]
+        service.start()
+        self.wait_until_ready(service)
+        service.stop()
+        self.assertEqual([image.get_size() for image in service.images], placeholder_sizes)
+
+    def test_rendered_pages_match_exact_size_rendering(self):
+        service = RenderService(self.pdf_path, self.window_size)
+        service.start()
+        self.wait_until_ready(service)
+        service.stop()
+
+        with fitz.open(self.pdf_path) as pdf_document:
+            for page_num, image in enumerate(service.images):
+                width, height, _, _, samples = render_page_samples(pdf_document.load_page(page_num),
+                                                                   self.window_size, EXACT_RES_FACTOR)
+                self.assertEqual(image.get_size(), (width, height))
+                self.assertEqual(pygame.image.tobytes(image, "RGB"), samples)
+
+    def test_worker_processes_render_the_same_pages(self):
+        service = RenderService(self.pdf_path, self.window_size, workers=2)
+        service.start()
+        self.wait_until_ready(service, timeout=60)
+        service.stop()
+
+        with fitz.open(self.pdf_path) as pdf_document:
+            for page_num, image in enumerate(service.images):
+                samples = render_page_samples(pdf_document.load_page(page_num), self.window_size, EXACT_RES_FACTOR)
+                self.assertEqual(pygame.image.tobytes(image, "RGB"), samples[4])
+
+    def test_a_page_that_fails_to_render_keeps_its_placeholder(self):
+        def render(page, window_size, render_scale):
+            if page.number == 2:
+                raise RuntimeError("damaged page")
+            return render_page_samples(page, window_size, render_scale)
+
+        service = RenderService(self.pdf_path, self.window_size)
+        with patch('pyslides.render_service.render_page_samples', render):
+            service.start()
+            self.wait_until_ready(service)
+            service.stop()
+        self.assertIs(service.images[2], service.placeholder(2))
+        self.assertEqual(service.stats()["rendered"], 5)  # The render thread went on with the other pages
+
+    def test_restart_shows_previous_slide_until_rendered(self):
+        service = RenderService(self.pdf_path, self.window_size)
+        service.images[0] = pygame.Surface(service.placeholder(0).get_size())
+        service.restart((400, 300))
+
+        self.assertEqual(service.images[0].get_size(), service.placeholder(0).get_size())
+        self.assertIsNot(service.images[0], service.placeholder(0))
+        self.assertIsNone(service.next_preview())  # No low-resolution preview needed
+        self.assertFalse(service.is_ready(0))
+
+    def test_sizes_rendered_before_are_served_from_the_render_cache(self):
+        cache = RenderCache(self.pdf_path, os.path.join(self.temp_dir.name, "cache"))
+        service = RenderService(self.pdf_path, self.window_size, render_cache=cache)
+        service.start()
+        self.wait_until_ready(service)
+        while service.store is None:
+            time.sleep(0.01)
+        windowed = [pygame.image.tobytes(image, "RGB") for image in service.images]
+
+        service.restart((400, 300))
+        self.assertIsNone(service.store)
+        service.restart(self.window_size)
+        service.stop()
+        self.assertIsNotNone(service.store)
+        self.assertEqual([pygame.image.tobytes(image, "RGB") for image in service.images], windowed)
+
+    def test_pages_are_written_to_the_render_cache_without_blocking_drawing(self):
+        cache = RenderCache(self.pdf_path, os.path.join(self.temp_dir.name, "cache"))
+        service = RenderService(self.pdf_path, self.window_size, render_cache=cache)
+        write_page, drawing_blocked = service.writer.write_page, []
+
+        def write_page_while_drawing(page_num, pixels):
+            drawing = threading.Thread(target=lambda: service.images[0])
+            drawing.start()  # Reads a slide, as the drawing thread does every frame
+            drawing.join(timeout=1)
+            drawing_blocked.append(drawing.is_alive())
+            write_page(page_num, pixels)
+
+        service.writer.write_page = write_page_while_drawing
+        with fitz.open(self.pdf_path) as pdf_document:
+            samples = render_page_samples(pdf_document.load_page(0), self.window_size, EXACT_RES_FACTOR)
+        service.deliver(0, service.generation, self.window_size, samples)
+        self.assertEqual(drawing_blocked, [False])
+        self.assertTrue(service.is_ready(0))
+        service.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from pyslides.display import draw_frame
+from pyslides.renderer import Renderer
+from pyslides.slide_cache import SlideCache
+from pyslides.state import AppState
+from pyslides.strokes import Stroke
+
+
+class TestRenderer(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.state = AppState()
+        self.state.show_initial_help_popup = False
+        self.images = SlideCache(3, self.load)
+        self.renderer = Renderer(self.images, self.state)
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def load(self, page_num):
+        surface = pygame.Surface((600, 400))
+        surface.fill((200, 50 * page_num, 0))
+        pygame.draw.line(surface, (0, 0, 255), (0, 0), (599, 399), 5)
+        return surface
+
+    def full_frame(self):
+        screen = self.state.screen
+        self.state.screen = pygame.Surface(screen.get_size())
+        draw_frame(self.images, self.state)
+        frame, self.state.screen = self.state.screen, screen
+        return pygame.image.tobytes(frame, "RGB")
+
+    def test_unchanged_frames_are_skipped(self):
+        self.assertTrue(self.renderer.render())
+        self.assertFalse(self.renderer.render())
+        self.state.current_page = 1
+        self.assertTrue(self.renderer.render())
+        self.assertEqual(self.renderer.stats()["frames"], 2)
+
+    def test_moving_the_spotlight_only_updates_old_and_new_spotlight(self):
+        self.state.spotlight_mode = True
+        self.state.spotlight_position = (200, 200)
+        self.renderer.render()
+
+        self.state.spotlight_position = (260, 220)
+        with patch('pygame.display.update') as update:
+            self.renderer.render()
+        radius = self.state.spotlight_radius
+        self.assertEqual(sorted(tuple(rect) for rect in update.call_args[0][0]),
+                         [(100, 100, 2 * radius + 1, 2 * radius + 1), (160, 120, 2 * radius + 1, 2 * radius + 1)])
+
+    def test_partial_redraws_match_a_full_redraw(self):
+        self.renderer.render()
+        self.state.spotlight_mode = True
+        self.renderer.render()
+        self.state.spotlight_position = (300, 500)
+        self.renderer.render()
+        self.state.spotlight_mode = False
+        self.state.pen_annotations = {0: [Stroke.from_points([(0.1, 0.1), (0.15, 0.2), (0.22, 0.18)])]}
+        self.renderer.render()
+        self.state.text_annotations = {0: [((0.3, 0.3, 0.2, 0.07), "note")]}
+        self.renderer.render()
+        self.assertEqual(pygame.image.tobytes(self.state.screen, "RGB"), self.full_frame())
+
+    def test_frames_are_redrawn_when_a_slide_is_replaced(self):
+        self.renderer.render()
+        self.images[0] = self.load(2)
+        self.assertTrue(self.renderer.render())
+        self.assertEqual(pygame.image.tobytes(self.state.screen, "RGB"), self.full_frame())
+
+
+if __name__ == '__main__':
+    unittest.main()
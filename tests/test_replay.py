@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from pyslides.replay import EventRecorder, EventReplayer, FrameStats, VirtualClock, event_from_json, event_to_json
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()  # Replaying restores the keyboard modifiers
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def test_events_keep_their_attributes(self):
+        event = pygame.event.Event(pygame.MOUSEMOTION, pos=(10, 20), rel=(1, -1), buttons=(1, 0, 0), window=None)
+        restored = event_from_json(event_to_json(event))
+        self.assertEqual(restored.type, pygame.MOUSEMOTION)
+        self.assertEqual(restored.pos, (10, 20))
+        self.assertEqual(restored.buttons, (1, 0, 0))
+
+        key = event_from_json(event_to_json(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_t, mod=0, unicode="t")))
+        self.assertEqual((key.key, key.unicode), (pygame.K_t, "t"))
+
+    def test_recording_replays_on_the_virtual_clock(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.jsonl.gz")
+            live = VirtualClock(1000.0)
+            recorder = EventRecorder(path, "deck.pdf", (800, 600), clock=live)
+            live.now = 1000.5
+            recorder.record([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT, mod=0, unicode="")], 0, (5, 6))
+            live.now = 1001.25
+            recorder.record([], 0, (7, 8))
+            recorder.close()
+
+            clock = VirtualClock(10.0)
+            replayer = EventReplayer(path, clock)
+            self.assertEqual(replayer.header["window_size"], [800, 600])
+            mouse_pos, events = replayer.next_batch()
+            self.assertEqual(clock(), 10.5)
+            self.assertEqual(mouse_pos, (5, 6))
+            self.assertEqual(events[0].key, pygame.K_RIGHT)
+            self.assertEqual(replayer.next_batch(), ((7, 8), []))
+            self.assertEqual(clock(), 11.25)
+            self.assertIsNone(replayer.next_batch())
+            replayer.close()
+
+    def test_frame_stats(self):
+        stats = FrameStats(long_frame_time=0.02)
+        for frame_time in [0.001] * 98 + [0.03, 0.05]:
+            stats.add(frame_time)
+        report = stats.report()
+        self.assertEqual(report["frames"], 100)
+        self.assertEqual(report["p50_ms"], 1.0)
+        self.assertEqual(report["max_ms"], 50.0)
+        self.assertEqual(report["long_frames"], 2)
+        self.assertEqual(report["longest"][0]["iteration"], 99)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from pyslides.config.annotations_config import AnnotationsConfig
+from pyslides.resource_stats import collect_stats, format_stats
+from pyslides.slide_cache import SlideCache, surface_bytes
+from pyslides.state import AppState
+from pyslides.strokes import Stroke
+
+
+class TestResourceStats(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.state = AppState()
+        self.state.text_annotations = {0: [((0.1, 0.1, 0.4, 0.15), "note")], 2: []}
+        self.state.pen_annotations = {0: [Stroke.from_points([(0.1, 0.1), (0.2, 0.2)])],
+                                      1: [Stroke.from_points([(0.1, 0.1), (0.2, 0.2), (0.3, 0.1)])] * 2}
+        self.images = SlideCache(3, lambda page_num: pygame.Surface((60, 40)))
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def test_annotations_are_counted_per_page(self):
+        counts = AnnotationsConfig.annotation_counts(self.state.text_annotations, self.state.pen_annotations)
+        self.assertEqual(counts, {0: {"rects": 1, "strokes": 1, "points": 2},
+                                  1: {"rects": 0, "strokes": 2, "points": 6}})  # Empty pages are left out
+
+    def test_memory_held_by_surfaces_is_reported(self):
+        self.images[0]
+        self.state.overlay.prepare((100, 50))
+        stats = collect_stats(self.images, self.state)
+        self.assertEqual(stats["memory"]["slides"], surface_bytes(self.images[0]))
+        self.assertEqual(stats["memory"]["overlay"], surface_bytes(self.state.overlay.layer))
+        self.assertEqual(stats["memory"]["total"], stats["memory"]["slides"] + stats["memory"]["overlay"])
+        self.assertEqual((stats["annotations"]["strokes"], stats["annotations"]["points"]), (3, 8))
+        self.assertIsNone(stats["render_cache"])
+        self.assertIn("  slide 1: 0 text boxes, 2 strokes, 6 points", format_stats(stats))
+
+    def test_annotation_files_are_measured(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pdf_file = os.path.join(directory, "deck.pdf")
+            cwd = os.getcwd()
+            os.chdir(directory)  # Annotation files are kept next to where the presentation is started
+            try:
+                self.assertEqual(AnnotationsConfig.files_size(pdf_file), 0)
+                with open(AnnotationsConfig.journal_file(pdf_file), 'w') as f:
+                    f.write("x" * 10)
+                self.assertEqual(AnnotationsConfig.files_size(pdf_file), 10)
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+import pygame
+
+from pyslides.slide_cache import SlideCache, surface_bytes, to_display_format
+
+
+class TestSlideCache(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+        self.page_size = (40, 30)
+
+    def load(self, page_num):
+        self.loads.append(page_num)
+        surface = pygame.Surface(self.page_size)
+        surface.fill((page_num, 0, 0))
+        return surface
+
+    def test_hits_and_misses_are_counted(self):
+        cache = SlideCache(5, self.load, budget=10 ** 9)
+        cache[0]
+        cache[0]
+        cache[1]
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+        self.assertEqual(self.loads, [0, 1])
+
+    def test_least_recently_used_pages_are_evicted_to_warm_tier(self):
+        page_bytes = surface_bytes(self.load(0))
+        cache = SlideCache(10, self.load, budget=3 * page_bytes, keep_around=0)
+        for page_num in range(5):
+            cache.focus(page_num)
+            cache[page_num]
+
+        stats = cache.stats()
+        self.assertLessEqual(stats["hot_bytes"], 3 * page_bytes)
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(list(cache.warm), [0, 1])
+
+        # A warm page comes back with the same pixels, without going to the loader
+        self.loads.clear()
+        self.assertEqual(cache[0].get_at((0, 0)), pygame.Color(0, 0, 0))
+        self.assertEqual(cache[1].get_at((0, 0)), pygame.Color(1, 0, 0))
+        self.assertEqual(self.loads, [])
+        self.assertEqual(cache.stats()["warm_hits"], 2)
+
+    def test_pages_around_the_current_page_stay_hot(self):
+        page_bytes = surface_bytes(self.load(0))
+        cache = SlideCache(10, self.load, budget=page_bytes, warm_budget=0, keep_around=1)
+        cache.focus(5)
+        for page_num in (4, 5, 6, 0):
+            cache[page_num]
+        self.assertEqual(sorted(cache.hot), [4, 5, 6])
+
+    def test_placeholder_is_not_cached(self):
+        placeholder = pygame.Surface(self.page_size)
+        cache = SlideCache(3, lambda page_num: None, placeholder=lambda page_num: placeholder)
+        self.assertIs(cache[1], placeholder)
+        self.assertEqual(cache.stats()["hot_pages"], 0)
+
+        version = cache.version(1)
+        cache[1] = self.load(1)
+        self.assertNotEqual(cache.version(1), version)
+        self.assertIsNot(cache[1], placeholder)
+
+    def test_slides_are_converted_to_the_display_format_once(self):
+        pygame.display.init()
+        try:
+            screen = pygame.display.set_mode((100, 100))
+            cache = SlideCache(3, lambda page_num: pygame.image.frombuffer(bytearray(40 * 30 * 3), (40, 30), 'RGB'),
+                               prepare=to_display_format)
+            slide = cache[0]
+            self.assertEqual(slide.get_bitsize(), screen.get_bitsize())
+            self.assertEqual(cache.stats()["hot_bytes"], surface_bytes(slide))
+            self.assertIs(cache[0], slide)  # Converted only once
+
+            cache.reformat()
+            self.assertIs(cache[0], slide)  # Already in the display format
+        finally:
+            pygame.display.quit()
+
+
+if __name__ == '__main__':
+    unittest.main()
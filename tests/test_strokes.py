@@ -0,0 +1,44 @@
+import math
+import unittest
+
+import pygame
+
+from pyslides.strokes import Stroke
+
+
+class TestStroke(unittest.TestCase):
+    def test_stroke_behaves_like_a_list_of_points(self):
+        stroke = Stroke.from_points([(1, 2), (3, 4), (5, 6)])
+        self.assertEqual(len(stroke), 3)
+        self.assertEqual(stroke[-1], (5, 6))
+        self.assertEqual(list(stroke), [(1, 2), (3, 4), (5, 6)])
+        self.assertEqual(stroke.points(), [[1, 2], [3, 4], [5, 6]])
+
+        surface = pygame.Surface((10, 10))
+        pygame.draw.lines(surface, (255, 0, 0), False, stroke, 1)
+        self.assertEqual(surface.get_at((3, 4)), pygame.Color(255, 0, 0))
+
+    def test_simplification_stays_within_the_tolerance(self):
+        points = [(x, round(40 + 30 * math.sin(x / 15))) for x in range(300)]
+        simplified = Stroke.from_points(points).simplified(1.0)
+        self.assertLess(len(simplified), len(points) // 5)
+        self.assertEqual((simplified[0], simplified[-1]), (points[0], points[-1]))
+
+        # Every original point lies within the tolerance of the simplified polyline
+        for x, y in points:
+            (x1, y1), (x2, y2) = next((simplified[i], simplified[i + 1]) for i in range(len(simplified) - 1)
+                                      if simplified[i][0] <= x <= simplified[i + 1][0])
+            distance = abs((y2 - y1) * (x - x1) - (x2 - x1) * (y - y1)) / math.hypot(x2 - x1, y2 - y1)
+            self.assertLessEqual(distance, 1.0)
+
+    def test_straight_lines_keep_only_their_end_points(self):
+        stroke = Stroke.from_points([(i, 2 * i) for i in range(50)])
+        self.assertEqual(list(stroke.simplified(0.5)), [(0, 0), (49, 98)])
+
+    def test_transform_scales_and_moves_every_point(self):
+        stroke = Stroke.from_points([(10, 20), (30, 40)])
+        self.assertEqual(list(stroke.transformed(2, 0.5, 5, -3)), [(25, 7), (65, 17)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from pyslides.transition_plan import TransitionConfigError, TransitionPlan, parse_duration
+from pyslides.transitions import EASINGS, SlideTransition
+
+
+class TestTransitionPlan(unittest.TestCase):
+    def test_every_page_gets_parsed_settings(self):
+        plan = TransitionPlan.compile({
+            "General": {"transition": "pull", "transition-duration": "0.5s", "reversal-strategy": "none"},
+            "Slide 2": {"transition": "swipe_left", "easing": "ease_out", "reversal-strategy": "keep_original"},
+        }, 4)
+
+        self.assertEqual(len(plan), 4)
+        self.assertEqual(plan[1], plan.general)
+        self.assertIs(plan[1].draw_frame, SlideTransition.pull_frame)
+        self.assertIsNone(plan[1].reverse)
+        self.assertEqual(plan[2].transition, "swipe_left")
+        self.assertEqual(plan[2].duration, 0.5)  # From the general settings
+        self.assertIs(plan[2].easing, EASINGS["ease_out"])
+        self.assertIs(plan[2].reverse, False)
+        self.assertEqual(plan[7], plan.general)  # Beyond the deck
+
+    def test_durations(self):
+        self.assertEqual(parse_duration("1s"), 1)
+        self.assertEqual(parse_duration(" 0.25s"), 0.25)
+        self.assertEqual(parse_duration(2), 2)
+        for duration in ("fast", "-1s", "nans", None, True, [1]):
+            with self.assertRaises(ValueError):
+                parse_duration(duration)
+
+    def test_every_problem_is_reported_up_front(self):
+        with self.assertRaises(TransitionConfigError) as context:
+            TransitionPlan.compile({
+                "General": {"transition": "fade-in"},
+                "Slide 1": {"transition-duration": "1 second", "easing": "bounce", "reversal": "none"},
+                "Slide 9": {"transition": "pull"},
+                "Slides": {},
+            }, 5)
+        self.assertEqual(context.exception.problems, [
+            "General: unknown transition 'fade-in'",
+            "Slide 1: unknown setting 'reversal'",
+            "Slide 1: unknown transition 'fade-in'",
+            "Slide 1: invalid duration '1 second'",
+            "Slide 1: unknown easing 'bounce'",
+            "Slide 9: beyond the 5 slides of the deck",
+            "unknown section 'Slides'",
+        ])
+
+    def test_malformed_json_is_reported(self):
+        with self.assertRaises(TransitionConfigError) as context:
+            TransitionPlan.compile([{"transition": "pull"}], 3)
+        self.assertEqual(context.exception.problems, ["expected an object of sections, not list"])
+
+        with self.assertRaises(TransitionConfigError) as context:
+            TransitionPlan.compile({
+                "General": {"transition": ["pull"], "easing": None},
+                "Slide 1": "pull",
+                "Slide 2": {"reversal-strategy": {"back": "none"}, "transition-duration": {}},
+            }, 3)
+        self.assertEqual(context.exception.problems, [
+            "General: transition must be a name, not ['pull']",
+            "General: easing must be a name, not None",
+            "Slide 1: expected an object of settings, not str",
+            "Slide 2: reversal-strategy must be a name, not {'back': 'none'}",
+            "Slide 2: invalid duration {}",
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
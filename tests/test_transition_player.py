@@ -0,0 +1,108 @@
+import unittest
+
+import pygame
+
+from pyslides.slide_cache import SlideCache
+from pyslides.state import AppState
+from pyslides.transition_plan import TransitionPlan
+from pyslides.transitions import TransitionPlayer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTransitionPlayer(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        pygame.font.init()
+        self.state = AppState()
+        self.state.transition_plan = TransitionPlan.compile(
+            {"Slide 1": {"transition": "swipe_left", "transition-duration": "1s", "easing": "ease_in"}}, 3)
+        self.images = SlideCache(3, self.load)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def load(self, page_num):
+        surface = pygame.Surface((600, 400))
+        surface.fill((200, 80 * page_num, 0))
+        return surface
+
+    def go_to(self, player, page_num):
+        prev_page = self.state.current_page
+        self.state.current_page = page_num
+        player.start(prev_page, self.images, self.state)
+
+    def test_progress_is_eased_and_ends_on_the_clock(self):
+        player = TransitionPlayer(fps=10, clock=self.clock)
+        self.go_to(player, 1)
+        self.assertTrue(player.active)
+
+        self.clock.now += 0.5
+        self.assertTrue(player.advance(self.images))
+        self.assertAlmostEqual(player.progress, 0.25)  # ease_in at half time
+        player.draw(self.images, self.state)
+
+        self.clock.now += 0.6
+        self.assertTrue(player.advance(self.images))
+        self.assertFalse(player.active)
+        self.assertIsNone(player.time_to_next_frame())
+
+    def test_slides_are_left_opaque_when_a_fade_ends(self):
+        player = TransitionPlayer(fps=10, clock=self.clock)
+        self.go_to(player, 2)  # The general fade_in
+        self.clock.now += 0.5
+        player.advance(self.images)
+        player.draw(self.images, self.state)
+        self.assertEqual(self.images[2].get_alpha(), 127)
+
+        self.clock.now += 0.6
+        player.advance(self.images)
+        self.assertIsNone(self.images[0].get_alpha())
+        self.assertIsNone(self.images[2].get_alpha())
+
+    def test_frames_are_only_produced_at_the_target_rate(self):
+        player = TransitionPlayer(fps=10, clock=self.clock)
+        self.go_to(player, 1)
+        self.assertFalse(player.advance(self.images))  # The first frame is not due yet
+        self.assertAlmostEqual(player.time_to_next_frame(), 0.1)
+
+        self.clock.now += 0.1
+        frame = player.frame
+        self.assertTrue(player.advance(self.images))
+        self.assertFalse(player.advance(self.images))
+        self.assertEqual(player.frame, frame + 1)
+
+    def test_collapse_starts_from_the_frame_on_screen(self):
+        player = TransitionPlayer(clock=self.clock, interrupt='collapse')
+        self.go_to(player, 1)
+        self.clock.now += 0.3
+        player.advance(self.images)
+        player.draw(self.images, self.state)
+
+        self.go_to(player, 2)
+        self.assertTrue(player.active)
+        self.assertEqual(player.transition["next_page"], 2)
+        self.assertEqual(player.transition["prev_image"].get_size(), self.state.window_size)
+        self.assertEqual(player.stats(), {"started": 2, "interrupted": 1})
+
+    def test_skip_finishes_the_running_transition(self):
+        player = TransitionPlayer(clock=self.clock, interrupt='skip')
+        self.go_to(player, 1)
+        self.go_to(player, 2)
+        self.assertEqual(player.transition["prev_page"], 1)
+        self.assertIsNone(player.transition["prev_image"])
+        self.assertIsNone(self.images[1].get_alpha())  # Left fully opaque
+
+        player.finish(self.images)
+        self.assertFalse(player.active)
+
+
+if __name__ == '__main__':
+    unittest.main()
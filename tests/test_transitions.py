@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock
 import pygame
 
 from pyslides import constant
+from pyslides.transition_plan import TransitionPlan
 from pyslides.transitions import SlideTransition
 
 
@@ -88,6 +89,14 @@ class TestSlideTransition(unittest.TestCase):
         self.assertEqual(self.prev_image.get_alpha(), 255)
         self.assertEqual(self.next_image.get_alpha(), 255)
 
+    @patch('pyslides.transitions.SlideTransition.play')
+    def test_partial_sliding_back_plays_the_general_transition(self, mock_play):
+        general = TransitionPlan.compile({"General": {"transition": "pull", "transition-duration": "0.3s"}}, 2).general
+        SlideTransition.choose_transition(self.prev_image, self.next_image, self.state.window_size, self.screen,
+                                          constant.PARTIAL_SLIDE_TRANSITION, 1, reverse=True, general=general)
+        mock_play.assert_called_once_with(SlideTransition.pull_frame, self.prev_image, self.next_image,
+                                          self.state.window_size, self.screen, 0.3)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+import fitz
+import pygame
+
+from pyslides.pdf_processor import EXACT_RES_FACTOR, page_zoom_factor, samples_to_surface
+from pyslides.zoom_engine import ZoomEngine
+
+
+class TestZoomEngine(unittest.TestCase):
+    def setUp(self):
+        # Create a small PDF with some text to zoom into
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.temp_dir.name, "deck.pdf")
+        document = fitz.open()
+        page = document.new_page(width=720, height=540)
+        page.insert_text((72, 72), "Zoom into this slide", fontsize=36)
+        page.draw_rect(fitz.Rect(100, 200, 600, 500), color=(1, 0, 0), fill=(0, 0, 1))
+        document.save(self.pdf_path)
+        document.close()
+        self.window_size = (400, 300)
+        self.image = pygame.Surface((400, 300))
+        self.screen = pygame.Surface(self.window_size)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_zoomed_view_matches_full_page_render(self):
+        engine = ZoomEngine(self.pdf_path, tile_size=64, frame_budget=float("inf"))
+        zoom_level, zoom_pos = 2.5, (150, 120)
+        engine.draw(self.screen, self.image, 0, zoom_level, zoom_pos, self.window_size)
+
+        with fitz.open(self.pdf_path) as pdf_document:
+            page = pdf_document.load_page(0)
+            zoom_factor = round(page_zoom_factor(page.rect, self.window_size, EXACT_RES_FACTOR) * zoom_level, 6)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom_factor, zoom_factor))
+            full_page = samples_to_surface(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+        view = ZoomEngine.viewport(self.image.get_size(), zoom_level, zoom_pos, self.window_size)
+        expected = full_page.subsurface(view)
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), pygame.image.tobytes(expected, "RGB"))
+
+    def test_zoomed_page_narrower_than_the_window_is_centred(self):
+        window_size, image = (800, 300), pygame.Surface((400, 300))  # Fills the height, not the width
+        screen = pygame.Surface(window_size)
+        engine = ZoomEngine(self.pdf_path, tile_size=64, frame_budget=float("inf"))
+        zoom_level, zoom_pos = 1.5, (100, 200)
+        engine.draw(screen, image, 0, zoom_level, zoom_pos, window_size)
+
+        with fitz.open(self.pdf_path) as pdf_document:
+            page = pdf_document.load_page(0)
+            zoom_factor = round(page_zoom_factor(page.rect, window_size, EXACT_RES_FACTOR) * zoom_level, 6)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom_factor, zoom_factor))
+            full_page = samples_to_surface(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+        view = ZoomEngine.viewport(image.get_size(), zoom_level, zoom_pos, window_size)
+        self.assertLess(view.left, 0)
+        expected = pygame.Surface(window_size)
+        expected.blit(full_page, (-view.left, -view.top))
+        self.assertEqual(pygame.image.tobytes(screen, "RGB"), pygame.image.tobytes(expected, "RGB"))
+
+    def test_panning_only_renders_new_tiles(self):
+        engine = ZoomEngine(self.pdf_path, tile_size=100, frame_budget=float("inf"))
+        engine.draw(self.screen, self.image, 0, 2, (100, 75), self.window_size)
+        rendered = engine.stats()["misses"]
+        engine.draw(self.screen, self.image, 0, 2, (100, 75), self.window_size)
+        self.assertEqual(engine.stats()["misses"], rendered)
+        self.assertEqual(engine.stats()["hits"], rendered)
+
+        engine.draw(self.screen, self.image, 0, 2, (150, 75), self.window_size)  # Pan right by one tile
+        self.assertEqual(engine.stats()["misses"], rendered + 3)
+
+    def test_tile_cache_stays_within_budget(self):
+        engine = ZoomEngine(self.pdf_path, tile_size=64, budget=10 * 64 * 64 * 3, frame_budget=float("inf"))
+        engine.draw(self.screen, self.image, 0, 4, (200, 150), self.window_size)
+        self.assertLessEqual(engine.stats()["tile_bytes"], engine.budget)
+        self.assertLessEqual(engine.stats()["tiles"], 10)
+
+    def test_missing_tiles_are_rendered_over_later_frames(self):
+        engine = ZoomEngine(self.pdf_path, tile_size=64, frame_budget=0)
+        engine.draw(self.screen, self.image, 0, 2, (200, 150), self.window_size)
+        self.assertEqual(engine.stats()["misses"], 1)  # At least one tile per frame
+        engine.draw(self.screen, self.image, 0, 2, (200, 150), self.window_size)
+        self.assertEqual(engine.stats()["misses"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()